@@ -13,16 +13,39 @@ class Settings(BaseSettings):
     # Server
     host: str = "127.0.0.1"
     port: int = 8000
+    # Log level for retrieval-layer loggers (DEBUG shows per-request routing detail)
+    log_level: str = "INFO"
     
     # Retrieval settings
     max_anchors: int = 5
     min_similarity_threshold: float = 0.65
     max_similarity_threshold: float = 0.85
     max_suggestions: int = 3
+    # Score fusion for weighted routing: "rrf", "dbsf", or "weighted_sum"
+    fusion_policy: str = "rrf"
+    # Weighted routing confidence: avg top score above [0] is MEDIUM, above [1] is HIGH
+    weighted_confidence_thresholds: list[float] = [1.0, 1.5]
+    # Graph results older than this (seconds) are served but refreshed in the background
+    graph_cache_soft_ttl: float = 60.0
+    # Graph results older than this (seconds) are discarded and recomputed inline
+    graph_cache_hard_ttl: float = 600.0
+    # Seconds to reuse identical Supermemory search results (cleared when a memory is added; 0 disables reuse)
+    supermemory_cache_ttl: float = 300.0
+    
+    # Max concurrent Exa SDK calls (each runs in a worker thread)
+    exa_max_concurrency: int = 8
+    # Seconds to reuse identical Exa search results (0 disables reuse)
+    exa_cache_ttl: float = 300.0
+    # Exa circuit breaker: open after this many consecutive failures...
+    exa_breaker_fail_max: int = 5
+    # ...and allow a trial call again after this many seconds
+    exa_breaker_reset_timeout: float = 30.0
     
     # OpenAI
     openai_model: str = "gpt-4.1"
     openai_embedding_model: str = "text-embedding-3-small"
+    # Embedding width requested from the API (text-embedding-3 models shorten natively)
+    openai_embedding_dimensions: int = 512
     
     # Context Judge settings
     # Model for context classification (use mini for speed, full for accuracy)
@@ -35,6 +58,16 @@ class Settings(BaseSettings):
     orthogonal_enabled: bool = True
     # Noise injection: σ for Gaussian perturbation (0.15 = ~15-25% off original direction)
     orthogonal_noise_scale: float = 0.15
+    # Model for the LLM noisy-query fallback (short rephrasing: a small, fast model)
+    noise_query_model: str = "gpt-4o-mini"
+    # Vocabulary terms appended to a query by embedding-space noise injection
+    orthogonal_noise_terms: int = 3
+    # Optional noise vocabulary file, one term per line (empty = built-in list)
+    noise_vocabulary_path: str = ""
+    # Noise vocabulary embeddings are persisted here (suffixed per model and vocabulary)
+    noise_vocabulary_cache_path: str = "cache/noise_vocabulary.npy"
+    # Look up noise vocabulary terms in a faiss HNSW index (approximate, sub-linear; needs faiss)
+    noise_vocabulary_hnsw: bool = False
     # Enable archetype-based cross-domain search
     orthogonal_archetype_enabled: bool = True
     # Target domains for cross-domain vibe search (empty = all domains)
@@ -44,6 +77,18 @@ class Settings(BaseSettings):
     ]
     # Temperature for vibe extraction (higher = more creative connections)
     orthogonal_vibe_temperature: float = 0.8
+    # Seconds to reuse an extracted vibe for the same content (0 disables reuse)
+    vibe_cache_ttl: float = 300.0
+    # Max concurrent Exa searches across orthogonal strategies (avoids rate-limit storms)
+    max_orthogonal_concurrency: int = 6
+    # Max concurrent LLM completions across orthogonal strategies (~RPM limit / avg latency)
+    max_llm_concurrency: int = 4
+    # Pick target domains by a stable hash of the content (cache-friendly) instead of at random
+    deterministic_domains: bool = True
+    # Seconds to reuse a noisy-query variant per (query, noise scale)
+    orthogonal_noisy_query_ttl: float = 3600.0
+    # Seconds to reuse a full strategy fan-out for the same context, query and memories
+    orthogonal_result_cache_ttl: float = 300.0
     
     # Vector Math: Principal Component Subtraction (Technique 1)
     # Subtraction intensity: 0=no effect, 1=full removal of dominant components
@@ -52,6 +97,10 @@ class Settings(BaseSettings):
     pca_min_memories: int = 5
     # Number of dominant components to subtract for serendipity
     pca_num_components: int = 2
+    # Seconds to reuse a serendipity vector computed for the same memory set
+    pca_cache_ttl: float = 600.0
+    # Reuse the last serendipity vector while at most this fraction of memories changed
+    pca_cache_max_churn: float = 0.1
     
     # Vector Math: Antonym Steering (Technique 2)
     # Inversion strength: 0=pure taste, 1=strong contrast away from current context
@@ -66,6 +115,10 @@ class Settings(BaseSettings):
     bridge_domains: list[str] = [
         "restaurant", "movie", "music", "book", "architecture"
     ]
+    # Token budget for the content embedded by bridge vector search
+    bridge_content_max_tokens: int = 512
+    # Domain centroids are persisted here (suffixed per model and anchor set) for warm starts
+    bridge_centroids_path: str = "cache/bridge_centroids.npy"
     
     # Reranking settings
     # Number of broad results to fetch before mathematical reranking
@@ -1,3 +1,6 @@
+import logging
+import logging.handlers
+import queue
 import time
 import uuid
 from datetime import datetime
@@ -12,16 +15,18 @@ from models import (
     SaveToMemoryRequest,
     FeedbackRequest
 )
-from retrieval.exa_search import ExaSearchClient
-from retrieval.supermemory import SupermemoryClient
+from retrieval.exa_search import ExaSearchClient, get_exa_client
+from retrieval.supermemory import SupermemoryClient, get_supermemory_client
 from retrieval.scoring import RetrievalScorer
-from retrieval.cascade_router import CascadeRouter, RetrievalPath, ConfidenceLevel
-from retrieval.judge_logger import JudgeLogger
+from retrieval.cascade_router import CascadeRouter, RetrievalPath, ConfidenceLevel, build_search_query
+from retrieval.judge_logger import JudgeLogger, get_judge_logger
 from synthesis.openai_client import OpenAISynthesizer
 from synthesis.context_judge import ContextJudge
 from config import get_settings
 
 
+logger = logging.getLogger(__name__)
+
 # Global instances
 exa_client: ExaSearchClient = None
 supermemory_client: SupermemoryClient = None
@@ -38,29 +43,58 @@ async def lifespan(app: FastAPI):
     global exa_client, supermemory_client, synthesizer, scorer, cascade_router
     global context_judge, judge_logger
     
-    exa_client = ExaSearchClient()
-    supermemory_client = SupermemoryClient()
+    # App loggers enqueue records; a listener thread does the actual I/O
+    # so logging never blocks the event loop
+    # (handlers are removed on shutdown so a restarted lifespan doesn't stack them)
+    log_queue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    app_loggers = [logging.getLogger(name) for name in ("retrieval", "synthesis", __name__)]
+    for app_logger in app_loggers:
+        app_logger.addHandler(queue_handler)
+        app_logger.setLevel(get_settings().log_level)
+        app_logger.propagate = False
+    log_listener.start()
+    
+    # Process-wide clients: one connection pool per service, shared with the router
+    exa_client = get_exa_client()
+    supermemory_client = get_supermemory_client()
     synthesizer = OpenAISynthesizer()
     scorer = RetrievalScorer()
-    cascade_router = CascadeRouter(synthesizer=synthesizer)
+    cascade_router = CascadeRouter(
+        synthesizer=synthesizer,
+        supermemory_client=supermemory_client,
+        exa_client=exa_client
+    )
     context_judge = ContextJudge()
-    judge_logger = JudgeLogger()
+    judge_logger = get_judge_logger()
     
-    print("🧠 Minnets backend started")
-    print("   Using CascadeRouter with LLM Context Judge")
-    print("   🧠 Context Judge: LLM-based cognitive state analysis")
-    print("   📊 Allocation-based routing (not binary gating)")
-    print("   🎲 Orthogonal Search: noise injection, archetype bridge, cross-domain vibe")
-    print("   Graph Pivot: Echo chamber filter + neighbor pivoting")
-    print("   Using Exa.ai for web search (with redundancy filtering)")
-    print("   Using Supermemory for knowledge base")
-    print("   Using OpenAI for synthesis + vibe extraction")
-    print("   📝 Logging decisions for future training")
+    logger.info("🧠 Minnets backend started")
+    logger.info("   Using CascadeRouter with LLM Context Judge")
+    logger.info("   🧠 Context Judge: LLM-based cognitive state analysis")
+    logger.info("   📊 Allocation-based routing (not binary gating)")
+    logger.info("   🎲 Orthogonal Search: noise injection, archetype bridge, cross-domain vibe")
+    logger.info("   Graph Pivot: Echo chamber filter + neighbor pivoting")
+    logger.info("   Using Exa.ai for web search (with redundancy filtering)")
+    logger.info("   Using Supermemory for knowledge base")
+    logger.info("   Using OpenAI for synthesis + vibe extraction")
+    logger.info("   📝 Logging decisions for future training")
     yield
     
+    await judge_logger.close()
     await cascade_router.close()
     await supermemory_client.close()
-    print("Minnets backend stopped")
+    await exa_client.close()
+    # The process-wide instances are closed now: a later lifespan in this
+    # process (reload, tests) must build fresh ones
+    get_judge_logger.cache_clear()
+    get_supermemory_client.cache_clear()
+    get_exa_client.cache_clear()
+    logger.info("Minnets backend stopped")
+    log_listener.stop()
+    for app_logger in app_loggers:
+        app_logger.removeHandler(queue_handler)
+        app_logger.propagate = True
 
 
 app = FastAPI(
@@ -104,8 +138,8 @@ async def analyze_context(request: AnalyzeRequest) -> AnalyzeResponse:
     start_time = time.time()
     request_id = str(uuid.uuid4())[:8]  # Short ID for logging
     
-    print(f"\n📥 [{request_id}] Analyzing context from: {request.app_name}")
-    print(f"   Context length: {len(request.context)} chars")
+    logger.info("📥 [%s] Analyzing context from: %s", request_id, request.app_name)
+    logger.info("   Context length: %s chars", len(request.context))
     
     context = request.context
     
@@ -117,7 +151,7 @@ async def analyze_context(request: AnalyzeRequest) -> AnalyzeResponse:
             current_url = url_line.replace("CURRENT_URL:", "").strip()
             
             if current_url and not current_url.startswith("chrome://") and not current_url.startswith("about:"):
-                print(f"   🌐 Fetching content from URL: {current_url}")
+                logger.info("   🌐 Fetching content from URL: %s", current_url)
                 
                 # Use Exa to get the content of this specific URL
                 url_content = await exa_client.get_contents([current_url])
@@ -125,15 +159,15 @@ async def analyze_context(request: AnalyzeRequest) -> AnalyzeResponse:
                 if url_content and len(url_content) > 0:
                     fetched = url_content[0]
                     context = f"Page Title: {fetched.title}\nURL: {current_url}\n\nContent:\n{fetched.text[:8000]}"
-                    print(f"   ✓ Fetched {len(fetched.text)} chars from URL")
+                    logger.info("   ✓ Fetched %s chars from URL", len(fetched.text))
                 else:
-                    print(f"   ⚠️ Could not fetch URL content, using original context")
+                    logger.warning("   ⚠️ Could not fetch URL content, using original context")
         except Exception as e:
-            print(f"   ⚠️ Error fetching URL: {e}")
+            logger.warning("   ⚠️ Error fetching URL: %s", e)
     
     try:
         # Step 0: Context Judge - Analyze cognitive state
-        print("   🧠 Running Context Judge...")
+        logger.info("   🧠 Running Context Judge...")
         weights = await context_judge.analyze(
             context=context,
             app_name=request.app_name,
@@ -141,24 +175,24 @@ async def analyze_context(request: AnalyzeRequest) -> AnalyzeResponse:
         )
         
         # Step 1: Extract TANGENTIAL concepts (NOT the main subject)
-        print("   Extracting tangential concepts...")
+        logger.info("   Extracting tangential concepts...")
         concepts = await synthesizer.extract_concepts(
             context, 
             request.app_name
         )
         
         if not concepts:
-            print("   No concepts extracted")
+            logger.info("   No concepts extracted")
             return AnalyzeResponse(
                 suggestions=[],
                 processing_time_ms=int((time.time() - start_time) * 1000)
             )
         
-        print(f"   🔗 Will search for: {concepts}")
+        logger.info("   🔗 Will search for: %s", concepts)
         
         # Step 2: Build search query from tangential concepts
-        search_query = " ".join(concepts[:3])
-        print(f"   🔍 Searching for: '{search_query}'")
+        search_query = build_search_query(concepts)
+        logger.info("   🔍 Searching for: '%s'", search_query)
         
         # Step 3: Weighted routing based on Context Judge
         cascade_result = await cascade_router.route_weighted(
@@ -167,10 +201,10 @@ async def analyze_context(request: AnalyzeRequest) -> AnalyzeResponse:
             weights=weights
         )
         
-        print(f"   Path: {cascade_result.path.value}, Confidence: {cascade_result.confidence.value}")
+        logger.info("   Path: %s, Confidence: %s", cascade_result.path.value, cascade_result.confidence.value)
         
         if not cascade_result.items:
-            print("   No results found")
+            logger.info("   No results found")
             return AnalyzeResponse(
                 suggestions=[],
                 processing_time_ms=int((time.time() - start_time) * 1000),
@@ -181,7 +215,7 @@ async def analyze_context(request: AnalyzeRequest) -> AnalyzeResponse:
             )
         
         # Step 4: Synthesize suggestions (emphasizing what's DIFFERENT)
-        print("   Synthesizing suggestions (emphasizing novelty)...")
+        logger.info("   Synthesizing suggestions (emphasizing novelty)...")
         suggestions = []
         
         # Score items for synthesis (cascade_result.items already ranked)
@@ -197,8 +231,8 @@ async def analyze_context(request: AnalyzeRequest) -> AnalyzeResponse:
             suggestions.append(suggestion)
         
         processing_time = int((time.time() - start_time) * 1000)
-        print(f"   ✅ Generated {len(suggestions)} suggestions in {processing_time}ms")
-        print(f"   Retrieval: {cascade_result.path.value} ({cascade_result.confidence.value} confidence)")
+        logger.info("   ✅ Generated %s suggestions in %sms", len(suggestions), processing_time)
+        logger.info("   Retrieval: %s (%s confidence)", cascade_result.path.value, cascade_result.confidence.value)
         
         # Step 5: Log decision for training
         await judge_logger.log_decision(
@@ -221,9 +255,7 @@ async def analyze_context(request: AnalyzeRequest) -> AnalyzeResponse:
         )
         
     except Exception as e:
-        print(f"   ❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("   ❌ Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -233,13 +265,13 @@ async def trigger_web_search(query: str):
     Explicit web search endpoint.
     Called when user clicks "Search Web" button (when should_offer_web is true).
     """
-    print(f"\n🌐 User triggered web search: '{query}'")
+    logger.info("🌐 User triggered web search: '%s'", query)
     
     start_time = time.time()
     
     try:
         web_results = await cascade_router.trigger_web_search(query)
-        print(f"   Found {len(web_results)} web results")
+        logger.info("   Found %s web results", len(web_results))
         
         # Score and synthesize
         scored_items = scorer.filter_and_rank(web_results, max_results=3)
@@ -255,7 +287,7 @@ async def trigger_web_search(query: str):
             suggestions.append(suggestion)
         
         processing_time = int((time.time() - start_time) * 1000)
-        print(f"   ✅ Generated {len(suggestions)} web suggestions in {processing_time}ms")
+        logger.info("   ✅ Generated %s web suggestions in %sms", len(suggestions), processing_time)
         
         return AnalyzeResponse(
             suggestions=suggestions,
@@ -267,7 +299,7 @@ async def trigger_web_search(query: str):
         )
         
     except Exception as e:
-        print(f"   ❌ Error: {e}")
+        logger.exception("   ❌ Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -284,7 +316,7 @@ async def log_feedback(request: FeedbackRequest):
     2. Train personalized models per user
     3. Fine-tune the Context Judge prompts
     """
-    print(f"\n📝 Feedback: {request.feedback_type.value} on insight {request.insight_id}")
+    logger.info("📝 Feedback: %s on insight %s", request.feedback_type.value, request.insight_id)
     
     try:
         await judge_logger.log_feedback(
@@ -304,7 +336,7 @@ async def log_feedback(request: FeedbackRequest):
         }
         
     except Exception as e:
-        print(f"   ⚠️ Feedback logging error: {e}")
+        logger.warning("   ⚠️ Feedback logging error: %s", e)
         # Don't fail the request if logging fails
         return {
             "status": "error",
@@ -315,7 +347,7 @@ async def log_feedback(request: FeedbackRequest):
 @app.post("/test-exa")
 async def test_exa(query: str = "transformer architecture machine learning"):
     """Test endpoint to verify Exa search is working."""
-    print(f"\n🔍 Testing Exa search: '{query}'")
+    logger.info("🔍 Testing Exa search: '%s'", query)
     
     try:
         results = await exa_client.search(query, num_results=3)
@@ -350,7 +382,7 @@ async def test_tangential_extraction(context: str = ""):
         league titles and Champions League trophies with Barcelona, Bayern Munich, 
         and Manchester City."""
     
-    print(f"\n🧪 Testing tangential extraction...")
+    logger.info("🧪 Testing tangential extraction...")
     
     try:
         concepts = await synthesizer.extract_concepts(context, "Test")
@@ -359,7 +391,7 @@ async def test_tangential_extraction(context: str = ""):
         return {
             "main_subject_to_avoid": main_subject,
             "tangential_concepts_to_search": concepts,
-            "search_query": " ".join(concepts[:3]) if concepts else ""
+            "search_query": build_search_query(concepts or [])
         }
     except Exception as e:
         return {"error": str(e)}
@@ -396,24 +428,24 @@ async def test_orthogonal_search(context: str = ""):
         greater meditative value. Similarly, peeling bark, rust, and other marks 
         of aging become valued."""
     
-    print(f"\n🎲 Testing orthogonal search...")
+    logger.info("🎲 Testing orthogonal search...")
     start_time = time.time()
     
     try:
         # Step 1: Extract vibe profile
-        print("   Extracting vibe profile...")
+        logger.info("   Extracting vibe profile...")
         vibe = await synthesizer.extract_vibe(context, "Test")
         
         # Step 2: Extract tangential concepts for standard search
         concepts = await synthesizer.extract_concepts(context, "Test")
-        search_query = " ".join(concepts[:3]) if concepts else "aesthetics philosophy"
+        search_query = build_search_query(concepts or [], fallback_query="aesthetics philosophy")
         
         # Step 3: Run standard search
-        print(f"   Standard search: '{search_query}'")
+        logger.info("   Standard search: '%s'", search_query)
         standard_results = await exa_client.search(search_query, num_results=3)
         
         # Step 4: Run orthogonal search (all strategies)
-        print("   Running orthogonal search strategies...")
+        logger.info("   Running orthogonal search strategies...")
         orthogonal_result = await cascade_router.route_orthogonal_only(
             context=context,
             query=search_query
@@ -469,8 +501,7 @@ async def test_orthogonal_search(context: str = ""):
         }
         
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Orthogonal test error: %s", e)
         return {"error": str(e)}
 
 
@@ -495,7 +526,7 @@ async def test_vibe_extraction(context: str = ""):
         are characterized by fluid passing, constant movement, and dominating 
         possession."""
     
-    print(f"\n🎭 Testing vibe extraction...")
+    logger.info("🎭 Testing vibe extraction...")
     
     try:
         vibe = await synthesizer.extract_vibe(context, "Test")
@@ -532,7 +563,7 @@ async def test_context_judge(
         Josep "Pep" Guardiola Sala is a Spanish professional football manager 
         and former player who is the manager of Manchester City."""
     
-    print(f"\n🧠 Testing Context Judge...")
+    logger.info("🧠 Testing Context Judge...")
     
     try:
         weights = await context_judge.analyze(
@@ -561,8 +592,7 @@ async def test_context_judge(
         }
         
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Context judge test error: %s", e)
         return {"error": str(e)}
 
 
@@ -577,7 +607,7 @@ async def save_to_memory(request: SaveToMemoryRequest):
     source_url = request.source_url
     context = request.context
     
-    print(f"\n💾 Saving to Supermemory: {title}")
+    logger.info("💾 Saving to Supermemory: %s", title)
     
     try:
         # Format the content for storage
@@ -605,21 +635,23 @@ async def save_to_memory(request: SaveToMemoryRequest):
         )
         
         if memory_id:
-            print(f"   ✅ Saved with ID: {memory_id}")
+            logger.info("   ✅ Saved with ID: %s", memory_id)
+            if cascade_router:
+                cascade_router.invalidate_memory_caches()
             return {
                 "status": "saved",
                 "memory_id": memory_id,
                 "title": title
             }
         else:
-            print("   ❌ Failed to save")
+            logger.warning("   ❌ Failed to save")
             return {
                 "status": "error",
                 "message": "Failed to save to Supermemory"
             }
             
     except Exception as e:
-        print(f"   ❌ Error: {e}")
+        logger.exception("   ❌ Error: %s", e)
         return {
             "status": "error", 
             "message": str(e)
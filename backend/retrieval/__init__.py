@@ -1,10 +1,10 @@
 from retrieval.supermemory import SupermemoryClient
 from retrieval.exa_search import ExaSearchClient
 from retrieval.scoring import RetrievalScorer
-from retrieval.cascade_router import CascadeRouter, RetrievalPath, ConfidenceLevel
+from retrieval.cascade_router import CascadeRouter, RetrievalPath, ConfidenceLevel, build_search_query
 from retrieval.orthogonal_search import OrthogonalSearcher, OrthogonalResult
 from retrieval.vector_math import OrthogonalVectorMath
-from retrieval.judge_logger import JudgeLogger
+from retrieval.judge_logger import JudgeLogger, get_judge_logger
 
 __all__ = [
     "SupermemoryClient",
@@ -13,9 +13,11 @@ __all__ = [
     "CascadeRouter",
     "RetrievalPath",
     "ConfidenceLevel",
+    "build_search_query",
     "OrthogonalSearcher",
     "OrthogonalResult",
     "OrthogonalVectorMath",
-    "JudgeLogger"
+    "JudgeLogger",
+    "get_judge_logger"
 ]
 
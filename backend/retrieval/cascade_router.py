@@ -21,55 +21,103 @@ Cascade Fallback (Steps 2-3):
 """
 
 import asyncio
-from typing import Optional, Union
+import bisect
+import hashlib
+import heapq
+import logging
+import time
+from collections import Counter
+from typing import AsyncIterator, Optional, Union
 from enum import Enum
 
+import numpy as np
+
 from models import Memory, SearchResult, VibeProfile, StrategyWeights
-from retrieval.supermemory import SupermemoryClient
-from retrieval.exa_search import ExaSearchClient
+from retrieval.supermemory import (
+    SupermemoryClient,
+    SupermemoryUnavailable,
+    get_supermemory_client,
+    supermemory_request_scope
+)
+from retrieval.exa_search import ExaSearchClient, get_exa_client
 from retrieval.scoring import RetrievalScorer
+from cache import TTLCache
 from retrieval.orthogonal_search import OrthogonalSearcher, OrthogonalResult
-from synthesis.openai_client import OpenAISynthesizer
+from synthesis.openai_client import OpenAISynthesizer, truncate_tokens
 from config import get_settings
 
 
+logger = logging.getLogger(__name__)
+
+
+# Reciprocal Rank Fusion smoothing constant (Cormack et al.)
+RRF_K = 60
+
+# Relationships the graph pivot follows from an anchor to its neighbors
+_PIVOT_RELATIONSHIPS = frozenset({"derives", "extends", "contrast"})
+
+
+def _fingerprint(key: str) -> int:
+    """64-bit content fingerprint for dedupe (memory content, or URL for web results)."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+
+
 class ScoredCandidate:
     """
     Wrapper for retrieval candidates with provenance tracking.
     Tracks source (web/local) and strategy (orthogonal/vector) for weighted ranking.
     """
+    # Created once per candidate on the weighted hot path: no per-instance __dict__
+    __slots__ = ("item", "source", "strategy", "raw_score", "rank", "adjusted_score")
+    
     def __init__(
         self,
         item: Union[Memory, SearchResult],
         source: str,  # "web" or "supermemory"
         strategy: str,  # "orthogonal", "vector", "graph"
-        raw_score: float = 0.0
+        raw_score: float = 0.0,
+        rank: int = 1  # 1-indexed position within its strategy's result list
     ):
         self.item = item
         self.source = source
         self.strategy = strategy
         self.raw_score = raw_score
+        self.rank = rank
         self.adjusted_score = raw_score
     
-    def apply_weight_boost(self, weights: StrategyWeights):
-        """Apply weight-based boosting to the score."""
-        score = self.raw_score
-        
-        # Boost by SOURCE match
+    def strategy_weight(self, weights: StrategyWeights) -> float:
+        """Source × intent weight for this candidate's provenance."""
+        # Weight by SOURCE match
         if self.source == "web":
-            score *= (1 + weights.source_web)
+            weight = 1 + weights.source_web
         elif self.source == "supermemory":
-            score *= (1 + weights.source_local)
+            weight = 1 + weights.source_local
+        else:
+            weight = 1.0
         
-        # Boost by INTENT match
+        # Weight by INTENT match
         if self.strategy == "orthogonal":
-            # If user wants serendipity, boost these items heavily
-            score *= (1 + weights.serendipity * 2.0)
+            # If user wants serendipity, weight these items heavily
+            weight *= 1 + weights.serendipity * 2.0
         else:
-            # Vector/graph results get relevance boost
-            score *= (1 + weights.relevance)
+            # Vector/graph results get relevance weight
+            weight *= 1 + weights.relevance
         
-        self.adjusted_score = score
+        return weight
+    
+    def apply_rrf(self, weights: StrategyWeights, k: int = RRF_K):
+        """
+        Score by weighted Reciprocal Rank Fusion.
+        
+        Raw scores from Exa and Supermemory live on different scales, so only
+        the candidate's rank within its own list is used:
+        
+            score = w_source × w_intent × (k + 1) / (k + rank)
+        
+        The (k + 1) factor normalizes rank 1 to the bare weight, keeping scores
+        on the same scale as the confidence thresholds.
+        """
+        self.adjusted_score = self.strategy_weight(weights) * (k + 1) / (k + self.rank)
         return self
 
 
@@ -97,6 +145,64 @@ class ConfidenceLevel(str, Enum):
     LOW = "low"        # < 0.65 - you don't know this
 
 
+# Hot-path aliases: a module global is one LOAD_GLOBAL, an enum member is an
+# attribute lookup on the Enum class every time a result is built
+_HIGH = ConfidenceLevel.HIGH
+_MEDIUM = ConfidenceLevel.MEDIUM
+_LOW = ConfidenceLevel.LOW
+_PATH_WEIGHTED = RetrievalPath.WEIGHTED
+
+# Confidence for weighted routing, indexed by how many thresholds the score exceeds
+_WEIGHTED_LEVELS = (_LOW, _MEDIUM, _HIGH)
+
+
+class FusionPolicy(str, Enum):
+    """How route_weighted combines scores from different strategies."""
+    RRF = "rrf"                    # Reciprocal Rank Fusion (rank-based)
+    DBSF = "dbsf"                  # Distribution-Based Score Fusion (per-list normalized scores)
+    WEIGHTED_SUM = "weighted_sum"  # Raw backend scores × strategy weight
+
+
+def _fusion_scores(
+    policy: FusionPolicy,
+    strategy_weights: np.ndarray,
+    ranks: np.ndarray,
+    raw_scores: np.ndarray,
+    list_ids: np.ndarray
+) -> np.ndarray:
+    """
+    Per-candidate fused scores under the given policy.
+    
+    Args:
+        policy: Fusion policy to apply
+        strategy_weights: Source × intent weight per candidate
+        ranks: 1-indexed rank of each candidate within its result list
+        raw_scores: Backend score per candidate
+        list_ids: Index of the result list each candidate came from
+    """
+    if policy == FusionPolicy.RRF:
+        # Rank 1 scores exactly its weight (see ScoredCandidate.apply_rrf)
+        return strategy_weights * (RRF_K + 1) / (RRF_K + ranks)
+    
+    if policy == FusionPolicy.DBSF:
+        # Map each list's μ ± 3σ onto [0, 1] so every backend gets the same range
+        normalized = np.full_like(raw_scores, 0.5)
+        for list_id in np.unique(list_ids):
+            mask = list_ids == list_id
+            scores = raw_scores[mask]
+            sigma = scores.std()
+            if sigma > 0:
+                normalized[mask] = np.clip((scores - scores.mean()) / (3 * sigma) + 0.5, 0.0, 1.0)
+        return strategy_weights * normalized
+    
+    return strategy_weights * raw_scores
+
+
+def build_search_query(concepts: list[str], fallback_query: str = "") -> str:
+    """Search query from the top 3 tangential concepts (fallback_query when there are none)."""
+    return " ".join(concepts[:3]) or fallback_query
+
+
 class CascadeResult:
     """Result from the cascade router."""
     def __init__(
@@ -144,9 +250,15 @@ class CascadeRouter:
     Step 3: Web Search - When local knowledge is insufficient
     """
     
-    def __init__(self, synthesizer: OpenAISynthesizer = None):
-        self.supermemory = SupermemoryClient()
-        self.exa = ExaSearchClient()
+    def __init__(
+        self,
+        synthesizer: OpenAISynthesizer = None,
+        supermemory_client: SupermemoryClient = None,
+        exa_client: ExaSearchClient = None
+    ):
+        # Default to the process-wide clients so every router shares one connection pool
+        self.supermemory = supermemory_client or get_supermemory_client()
+        self.exa = exa_client or get_exa_client()
         self.scorer = RetrievalScorer()
         self.settings = get_settings()
         self.synthesizer = synthesizer or OpenAISynthesizer()
@@ -154,6 +266,17 @@ class CascadeRouter:
             exa_client=self.exa,
             synthesizer=self.synthesizer
         )
+        
+        # Graph results: query -> (computed_at, result). Served until the hard TTL;
+        # past the soft TTL a hit also schedules a background refresh.
+        self._graph_cache = TTLCache(maxsize=1024, ttl=self.settings.graph_cache_hard_ttl)
+        self._graph_locks: dict[str, asyncio.Lock] = {}
+        # Vector results: query -> (memories, confidence), short-lived
+        self._vector_cache = TTLCache(maxsize=256, ttl=60.0)
+        self._background_tasks: set[asyncio.Task] = set()
+        
+        # (fetched_at, memories) for the user's recent memories; cleared on writes
+        self._recent_memories_cache: Optional[tuple[float, list[Memory]]] = None
     
     async def route(
         self, 
@@ -165,6 +288,34 @@ class CascadeRouter:
         """
         Main routing logic. Returns results from the appropriate path.
         
+        Args:
+            query: Search query (usually tangential concepts)
+            context: Full screen context
+            force_web: Force web search even if KB has results
+            enable_orthogonal: Enable orthogonal/serendipitous search
+        """
+        result = None
+        with supermemory_request_scope():
+            async for result in self.route_stream(query, context, force_web, enable_orthogonal):
+                pass
+        return result
+    
+    async def route_stream(
+        self, 
+        query: str, 
+        context: str,
+        force_web: bool = False,
+        enable_orthogonal: bool = False
+    ) -> AsyncIterator[CascadeResult]:
+        """
+        Incremental form of route(): yields a CascadeResult as each stage lands.
+        
+        Each yielded result supersedes the previous one; the last one is what
+        route() returns. Lets clients paint orthogonal/graph/vector results
+        before slower web results arrive. Iterate inside
+        supermemory_request_scope() so the graph and vector stages share
+        one Supermemory search.
+        
         Args:
             query: Search query (usually tangential concepts)
             context: Full screen context
@@ -177,92 +328,194 @@ class CascadeRouter:
             orthogonal_result = await self._check_orthogonal(context, query)
             if orthogonal_result and orthogonal_result.items:
                 # Orthogonal search found serendipitous results
+                yield CascadeResult(
+                    items=orthogonal_result.items,
+                    path=RetrievalPath.ORTHOGONAL,
+                    confidence=_MEDIUM,  # Orthogonal is inherently exploratory
+                    graph_insight=False,
+                    orthogonal_metadata=orthogonal_result.metadata,
+                    vibe_profile=orthogonal_result.vibe
+                )
+                
                 # Optionally combine with graph results for richer context
                 graph_result = await self._check_graph(query)
                 
                 if graph_result:
                     # Combine orthogonal + graph for maximum serendipity
                     combined = orthogonal_result.items[:2] + graph_result[:2]
-                    return CascadeResult(
+                    yield CascadeResult(
                         items=combined,
                         path=RetrievalPath.ORTHOGONAL_PLUS_GRAPH,
-                        confidence=ConfidenceLevel.HIGH,
+                        confidence=_HIGH,
                         graph_insight=True,
                         orthogonal_metadata=orthogonal_result.metadata,
                         vibe_profile=orthogonal_result.vibe
                     )
+                return
+        
+        # Step 2 runs speculatively alongside Step 1, so a graph miss costs
+        # max(graph, vector) rather than graph + vector. A forced web search
+        # is independent of both, so it starts now too.
+        web_task = asyncio.create_task(self.exa.search(query, num_results=5)) if force_web else None
+        try:
+            vector_task = asyncio.create_task(self._check_vector(query))
+            try:
+                # Step 1: Graph Check (Serendipity)
+                graph_result = await self._check_graph(query)
                 
-                return CascadeResult(
-                    items=orthogonal_result.items,
-                    path=RetrievalPath.ORTHOGONAL,
-                    confidence=ConfidenceLevel.MEDIUM,  # Orthogonal is inherently exploratory
+                if graph_result:
+                    # Graph insight found - this is the highest value signal
+                    yield CascadeResult(
+                        items=graph_result,
+                        path=RetrievalPath.GRAPH,
+                        confidence=_HIGH,
+                        graph_insight=True
+                    )
+                    
+                    # Near the threshold boundary, vector recall also carries signal:
+                    # blend it in rather than discarding it
+                    try:
+                        vector_result, confidence = await vector_task
+                    except Exception as e:
+                        logger.warning("⚠️ Speculative vector check failed: %s", e)
+                        vector_result, confidence = [], _LOW
+                    
+                    if confidence == _MEDIUM:
+                        graph_result = self._fuse_confidence(
+                            graph_result,
+                            vector_result,
+                            theta=self._vector_theta(vector_result)
+                        )
+                        yield CascadeResult(
+                            items=graph_result,
+                            path=RetrievalPath.GRAPH,
+                            confidence=_HIGH,
+                            graph_insight=True
+                        )
+                    
+                    # Optionally supplement with web for even richer context
+                    if force_web:
+                        web_results = (await web_task)[:2]
+                        yield CascadeResult(
+                            items=graph_result + web_results,
+                            path=RetrievalPath.GRAPH_PLUS_WEB,
+                            confidence=_HIGH,
+                            graph_insight=True
+                        )
+                    return
+                
+                # Step 2: Vector Check (Recall)
+                vector_result, confidence = await vector_task
+            finally:
+                # Don't leak the speculative search if the graph check fails
+                # or the consumer stops iterating early
+                if not vector_task.done():
+                    vector_task.cancel()
+            
+            if confidence == _HIGH:
+                # Definitely in your notes
+                yield CascadeResult(
+                    items=vector_result,
+                    path=RetrievalPath.VECTOR,
+                    confidence=_HIGH,
+                    graph_insight=False
+                )
+                return
+            
+            elif confidence == _MEDIUM:
+                # Might be in your notes - offer web search button
+                yield CascadeResult(
+                    items=vector_result,
+                    path=RetrievalPath.VECTOR,
+                    confidence=_MEDIUM,
                     graph_insight=False,
-                    orthogonal_metadata=orthogonal_result.metadata,
-                    vibe_profile=orthogonal_result.vibe
+                    should_offer_web=True
                 )
-        
-        # Step 1: Graph Check (Serendipity)
-        graph_result = await self._check_graph(query)
-        
-        if graph_result:
-            # Graph insight found - this is the highest value signal
-            # Optionally supplement with web for even richer context
-            if force_web:
-                web_results = await self.exa.search(query, num_results=2)
-                return CascadeResult(
-                    items=graph_result + web_results,
-                    path=RetrievalPath.GRAPH_PLUS_WEB,
-                    confidence=ConfidenceLevel.HIGH,
-                    graph_insight=True
+                return
+            
+            # Step 3: Low confidence - trigger web search
+            # Show whatever we found locally while the web search runs
+            if vector_result:
+                yield CascadeResult(
+                    items=vector_result,
+                    path=RetrievalPath.VECTOR,
+                    confidence=_LOW,
+                    graph_insight=False
                 )
             
-            return CascadeResult(
-                items=graph_result,
-                path=RetrievalPath.GRAPH,
-                confidence=ConfidenceLevel.HIGH,
-                graph_insight=True
+            web_results = await web_task if web_task else await self.exa.search(query, num_results=5)
+            
+            # Combine with any vector results we did find
+            if vector_result:
+                yield CascadeResult(
+                    items=vector_result + web_results,
+                    path=RetrievalPath.VECTOR_PLUS_WEB,
+                    confidence=_LOW,
+                    graph_insight=False
+                )
+                return
+            
+            yield CascadeResult(
+                items=web_results,
+                path=RetrievalPath.WEB,
+                confidence=_LOW,
+                graph_insight=False
             )
+        finally:
+            # Drop the forced web search if a memory path answered without it
+            if web_task and not web_task.done():
+                web_task.cancel()
+    
+    def _vector_theta(self, memories: list[Memory]) -> float:
+        """
+        Fusion weight for the vector path: where the top-3 average similarity
+        sits between the min and max thresholds, clamped to [0, 1].
+        """
+        if not memories:
+            return 0.0
         
-        # Step 2: Vector Check (Recall)
-        vector_result, confidence = await self._check_vector(query)
+        lo = self.settings.min_similarity_threshold
+        hi = self.settings.max_similarity_threshold
+        top_similarities = [m.similarity for m in memories[:3]]
+        avg_similarity = sum(top_similarities) / len(top_similarities)
+        return min(1.0, max(0.0, (avg_similarity - lo) / (hi - lo)))
+    
+    def _fuse_confidence(
+        self,
+        graph_list: list[Memory],
+        vector_list: list[Memory],
+        theta: float,
+        missing_rank: int = 1000
+    ) -> list[Memory]:
+        """
+        Confidence-weighted rank fusion of graph and vector results.
         
-        if confidence == ConfidenceLevel.HIGH:
-            # Definitely in your notes
-            return CascadeResult(
-                items=vector_result,
-                path=RetrievalPath.VECTOR,
-                confidence=ConfidenceLevel.HIGH,
-                graph_insight=False
-            )
+        score = (1 - θ) / rank_graph + θ / rank_vector
         
-        elif confidence == ConfidenceLevel.MEDIUM:
-            # Might be in your notes - offer web search button
-            return CascadeResult(
-                items=vector_result,
-                path=RetrievalPath.VECTOR,
-                confidence=ConfidenceLevel.MEDIUM,
-                graph_insight=False,
-                should_offer_web=True
-            )
+        Args:
+            graph_list: Graph pivot results, best first
+            vector_list: Vector search results, best first
+            theta: Vector path weight (0 = graph only, 1 = vector only)
+            missing_rank: Rank assigned to items absent from a list
+            
+        Returns:
+            Top max_suggestions fused memories
+        """
+        graph_ranks = {m.id: rank for rank, m in enumerate(graph_list, start=1)}
+        vector_ranks = {m.id: rank for rank, m in enumerate(vector_list, start=1)}
         
-        # Step 3: Low confidence - trigger web search
-        web_results = await self.exa.search(query, num_results=5)
+        # Prefer the graph copy of an item returned by both paths
+        by_id = {m.id: m for m in vector_list}
+        by_id.update({m.id: m for m in graph_list})
         
-        # Combine with any vector results we did find
-        if vector_result:
-            return CascadeResult(
-                items=vector_result + web_results,
-                path=RetrievalPath.VECTOR_PLUS_WEB,
-                confidence=ConfidenceLevel.LOW,
-                graph_insight=False
+        def score(memory_id: str) -> float:
+            return (
+                (1 - theta) / graph_ranks.get(memory_id, missing_rank)
+                + theta / vector_ranks.get(memory_id, missing_rank)
             )
         
-        return CascadeResult(
-            items=web_results,
-            path=RetrievalPath.WEB,
-            confidence=ConfidenceLevel.LOW,
-            graph_insight=False
-        )
+        top_ids = heapq.nlargest(self.settings.max_suggestions, by_id, key=score)
+        return [by_id[memory_id] for memory_id in top_ids]
     
     async def route_weighted(
         self,
@@ -284,6 +537,16 @@ class CascadeRouter:
         Returns:
             CascadeResult with items from multiple strategies, ranked by adjusted score
         """
+        with supermemory_request_scope():
+            return await self._route_weighted(query, context, weights)
+    
+    async def _route_weighted(
+        self,
+        query: str,
+        context: str,
+        weights: StrategyWeights
+    ) -> CascadeResult:
+        """route_weighted body (runs inside a Supermemory request scope)."""
         tasks = []
         task_metadata = []  # Track (source, strategy) for each task
         
@@ -295,8 +558,8 @@ class CascadeRouter:
         limit_web = max(1, int(base_fetch_count * weights.source_web)) if weights.source_web > 0.1 else 0
         limit_local = max(1, int(base_fetch_count * weights.source_local)) if weights.source_local > 0.1 else 0
         
-        print(f"   📊 Budget allocation: web={limit_web}, local={limit_local}")
-        print(f"      Weights: serendipity={weights.serendipity:.2f}, relevance={weights.relevance:.2f}")
+        logger.debug("📊 Budget allocation: web=%d, local=%d", limit_web, limit_local)
+        logger.debug("   Weights: serendipity=%.2f, relevance=%.2f", weights.serendipity, weights.relevance)
         
         # --- 2. DISPATCH STRATEGIES ---
         
@@ -327,97 +590,121 @@ class CascadeRouter:
         
         # --- 3. EXECUTE PARALLEL ---
         if not tasks:
-            print("   ⚠️ No strategies dispatched (all weights too low)")
+            logger.debug("⚠️ No strategies dispatched (all weights too low)")
             return CascadeResult(
                 items=[],
-                path=RetrievalPath.WEIGHTED,
-                confidence=ConfidenceLevel.LOW
+                path=_PATH_WEIGHTED,
+                confidence=_LOW
             )
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # --- 4. COLLECT & TAG CANDIDATES ---
+        # Each list's source is known from task_metadata, so type dispatch
+        # happens once per list; only mixed (orthogonal) lists go per item
         candidates: list[ScoredCandidate] = []
+        fingerprints: list[int] = []  # Parallel to candidates
+        list_ids: list[int] = []  # Parallel to candidates
         
         for i, result in enumerate(results):
             if isinstance(result, Exception):
-                print(f"   ⚠️ Strategy {task_metadata[i]} failed: {result}")
+                logger.warning("⚠️ Strategy %s failed: %s", task_metadata[i], result)
                 continue
             
             source, strategy = task_metadata[i]
             
-            for item in result:
-                # Get raw score
-                if isinstance(item, Memory):
-                    raw_score = item.similarity
-                elif isinstance(item, SearchResult):
-                    raw_score = item.score
-                else:
-                    raw_score = 0.5  # Default
-                
-                candidate = ScoredCandidate(
+            if source == "supermemory":
+                sources = [source] * len(result)
+                raw_scores = [m.similarity for m in result]
+                keys = [m.content for m in result]
+            elif source == "web":
+                sources = [source] * len(result)
+                raw_scores = [r.score for r in result]
+                keys = [r.url for r in result]
+            else:
+                sources = ["supermemory" if isinstance(item, Memory) else "web" for item in result]
+                raw_scores = [
+                    item.similarity if src == "supermemory" else item.score
+                    for item, src in zip(result, sources)
+                ]
+                keys = [
+                    item.content if src == "supermemory" else item.url
+                    for item, src in zip(result, sources)
+                ]
+            
+            for rank, (item, item_source, raw_score, key) in enumerate(
+                zip(result, sources, raw_scores, keys), start=1
+            ):
+                candidates.append(ScoredCandidate(
                     item=item,
-                    source=source if source != "mixed" else ("web" if isinstance(item, SearchResult) else "supermemory"),
+                    source=item_source,
                     strategy=strategy,
-                    raw_score=raw_score
-                )
-                candidates.append(candidate)
+                    raw_score=raw_score,
+                    rank=rank
+                ))
+                fingerprints.append(_fingerprint(key))
+                list_ids.append(i)
         
         if not candidates:
-            print("   ⚠️ No candidates from any strategy")
+            logger.debug("⚠️ No candidates from any strategy")
             return CascadeResult(
                 items=[],
-                path=RetrievalPath.WEIGHTED,
-                confidence=ConfidenceLevel.LOW
+                path=_PATH_WEIGHTED,
+                confidence=_LOW
             )
         
         # --- 5. WEIGHTED RANKING (the secret sauce) ---
-        # Apply weight-based boosting
-        for candidate in candidates:
-            candidate.apply_weight_boost(weights)
-        
-        # Sort by adjusted score
-        candidates.sort(key=lambda x: x.adjusted_score, reverse=True)
-        
-        # Deduplicate by content (keep highest scored version)
-        seen_content = set()
-        unique_candidates = []
-        for candidate in candidates:
-            # Create content fingerprint
-            if isinstance(candidate.item, Memory):
-                content_key = candidate.item.content[:100]
+        # Score fusion across strategies, computed over all candidates at once.
+        # Default is RRF: rank-based, so scale-invariant across backends.
+        n = len(candidates)
+        adjusted = _fusion_scores(
+            FusionPolicy(self.settings.fusion_policy),
+            strategy_weights=np.fromiter((c.strategy_weight(weights) for c in candidates), dtype=np.float64, count=n),
+            ranks=np.fromiter((c.rank for c in candidates), dtype=np.float64, count=n),
+            raw_scores=np.fromiter((c.raw_score for c in candidates), dtype=np.float64, count=n),
+            list_ids=np.array(list_ids)
+        )
+        for candidate, score in zip(candidates, adjusted.tolist()):
+            candidate.adjusted_score = score
+        
+        # Fuse duplicates by content: an item returned by several strategies
+        # sums its contributions (kept under its best-scored provenance)
+        fused: dict[int, ScoredCandidate] = {}
+        for candidate, content_key in zip(candidates, fingerprints):
+            existing = fused.get(content_key)
+            if existing is None:
+                fused[content_key] = candidate
+            elif candidate.adjusted_score > existing.adjusted_score:
+                candidate.adjusted_score += existing.adjusted_score
+                fused[content_key] = candidate
             else:
-                content_key = candidate.item.url
-            
-            if content_key not in seen_content:
-                seen_content.add(content_key)
-                unique_candidates.append(candidate)
+                existing.adjusted_score += candidate.adjusted_score
+        
+        # Rank in C: argsort over a contiguous score array (stable, so ties keep arrival order)
+        unique_candidates = list(fused.values())
+        scores = np.fromiter((c.adjusted_score for c in unique_candidates), dtype=np.float64, count=len(unique_candidates))
+        order = np.argsort(-scores, kind="stable")
+        unique_candidates = [unique_candidates[i] for i in order]
         
         # Take top N
-        top_candidates = unique_candidates[:self.settings.max_suggestions]
+        top_n = self.settings.max_suggestions
+        top_candidates = unique_candidates[:top_n]
         
-        # Calculate confidence based on top scores
+        # Calculate confidence based on top scores: strictly above a threshold
+        # moves up a level (bisect_left keeps ties in the lower level)
         if top_candidates:
-            avg_adjusted = sum(c.adjusted_score for c in top_candidates) / len(top_candidates)
-            if avg_adjusted > 1.5:
-                confidence = ConfidenceLevel.HIGH
-            elif avg_adjusted > 1.0:
-                confidence = ConfidenceLevel.MEDIUM
-            else:
-                confidence = ConfidenceLevel.LOW
+            avg_adjusted = float(scores[order[:top_n]].mean())
+            confidence = _WEIGHTED_LEVELS[bisect.bisect_left(self.settings.weighted_confidence_thresholds, avg_adjusted)]
         else:
-            confidence = ConfidenceLevel.LOW
+            confidence = _LOW
         
         # Log strategy distribution
-        strategies_used = {}
-        for c in top_candidates:
-            key = f"{c.source}:{c.strategy}"
-            strategies_used[key] = strategies_used.get(key, 0) + 1
-        print(f"   ✅ Weighted routing: {len(top_candidates)} results from {strategies_used}")
+        strategies_used = dict(Counter(f"{c.source}:{c.strategy}" for c in top_candidates))
+        logger.debug("✅ Weighted routing: %d results from %s", len(top_candidates), strategies_used)
         
         return CascadeResult(
             items=[c.item for c in top_candidates],
-            path=RetrievalPath.WEIGHTED,
+            path=_PATH_WEIGHTED,
             confidence=confidence,
             orthogonal_metadata={
                 "weights": weights.model_dump(),
@@ -448,9 +735,9 @@ class CascadeRouter:
             # Optionally fetch user memories for vector math strategies
             user_memories = None
             if include_vector_math:
-                user_memories = await self.supermemory.search("", limit=20)
+                user_memories = await self._get_recent_memories()
             
-            results = await self.orthogonal.search_all_strategies(
+            strategies = self.orthogonal.iter_strategies(
                 context=context,
                 original_query=query,
                 num_results_per_strategy=max(1, limit // 3),
@@ -458,26 +745,26 @@ class CascadeRouter:
                 user_memories=user_memories
             )
             
-            if not results:
-                return []
-            
-            # Combine and take top results
-            combined, _ = self.orthogonal.combine_results(results, max_total=limit)
+            # Take strategies as they finish; once there are enough candidates
+            # to pick `limit` from, stop waiting on the slower ones
+            combined, _ = await self.orthogonal.combine_results_streaming(
+                strategies,
+                max_total=limit,
+                min_items=limit * 2
+            )
             return combined
             
         except Exception as e:
-            print(f"   ⚠️ Orthogonal fetch error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("⚠️ Orthogonal fetch error: %s", e)
             return []
     
     async def _fetch_local(self, query: str, limit: int) -> list[Memory]:
         """Fetch results from Supermemory (local knowledge base)."""
         try:
-            memories = await self.supermemory.search(query, limit=limit)
+            memories = await self.supermemory.search_cached(query, max_limit=limit)
             return memories or []
         except Exception as e:
-            print(f"   ⚠️ Local fetch error: {e}")
+            logger.warning("⚠️ Local fetch error: %s", e)
             return []
     
     async def _fetch_web(self, query: str, limit: int) -> list[SearchResult]:
@@ -486,10 +773,114 @@ class CascadeRouter:
             results = await self.exa.search(query, num_results=limit)
             return results or []
         except Exception as e:
-            print(f"   ⚠️ Web fetch error: {e}")
+            logger.warning("⚠️ Web fetch error: %s", e)
             return []
 
+    async def _get_recent_memories(self, ttl: float = 60.0) -> list[Memory]:
+        """
+        The user's 20 most recent memories, cached for `ttl` seconds.
+        
+        Used as the taste profile for vector math; it only changes when the
+        user saves something, so writes call invalidate_recent_memories().
+        """
+        cached = self._recent_memories_cache
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return list(cached[1])
+        
+        try:
+            # No query to rerank against
+            memories = await self.supermemory.search("", limit=20, rerank=False, raise_on_error=True)
+        except SupermemoryUnavailable:
+            return []  # Not cached: retry on the next call
+        self._recent_memories_cache = (time.monotonic(), memories)
+        return list(memories)
+    
+    def invalidate_recent_memories(self):
+        """Drop cached recent memories (call after writing to Supermemory)."""
+        self._recent_memories_cache = None
+    
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Cache key for a query: case- and whitespace-insensitive."""
+        return " ".join(query.lower().split())
+    
+    def invalidate_memory_caches(self):
+        """Drop every cache derived from Supermemory (call after writes)."""
+        self.invalidate_recent_memories()
+        self._graph_cache.clear()
+        self._vector_cache.clear()
+    
     async def _check_graph(self, query: str) -> Optional[list[Memory]]:
+        """
+        Graph Pivot check with bounded staleness.
+        
+        Cached results (keyed on the normalized query) are returned immediately;
+        once older than the soft TTL a background refresh is scheduled. Misses
+        (or entries past the hard TTL) are computed inline, one computation per
+        query at a time.
+        """
+        key = self._normalize_query(query)
+        entry = self._graph_cache.get(key)
+        if entry is not None:
+            computed_at, result = entry
+            if time.monotonic() - computed_at > self.settings.graph_cache_soft_ttl:
+                self._schedule_graph_refresh(query, key)
+            return result
+        
+        lock = self._graph_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                # Another caller may have filled the cache while we waited
+                entry = self._graph_cache.get(key)
+                if entry is not None:
+                    return entry[1]
+                
+                try:
+                    result, complete = await self._compute_graph(query)
+                except SupermemoryUnavailable as e:
+                    # An outage isn't "no graph insight": answer empty, don't cache
+                    logger.warning("⚠️ Graph check failed: %s", e)
+                    return None
+                if complete:
+                    self._graph_cache.set(key, (time.monotonic(), result))
+                else:
+                    logger.warning("⚠️ Graph check missing some neighbors; not caching")
+                return result
+        finally:
+            if not lock.locked():
+                self._graph_locks.pop(key, None)
+    
+    def _schedule_graph_refresh(self, query: str, key: str):
+        """Refresh a stale graph entry in the background (at most one per key)."""
+        lock = self._graph_locks.get(key)
+        if lock is not None and lock.locked():
+            return  # Refresh or fill already in flight
+        
+        task = asyncio.create_task(self._refresh_graph(query, key))
+        # Keep a reference so the task isn't garbage-collected mid-flight
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _refresh_graph(self, query: str, key: str):
+        """Recompute the graph result for query and overwrite the cache entry."""
+        lock = self._graph_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                entry = self._graph_cache.get(key)
+                if entry is not None and time.monotonic() - entry[0] <= self.settings.graph_cache_soft_ttl:
+                    return  # Already refreshed
+                
+                result, complete = await self._compute_graph(query)
+                if complete:
+                    # A partial result doesn't replace the stale (complete) one
+                    self._graph_cache.set(key, (time.monotonic(), result))
+        except Exception as e:
+            logger.warning("⚠️ Graph refresh failed: %s", e)
+        finally:
+            if not lock.locked():
+                self._graph_locks.pop(key, None)
+    
+    async def _compute_graph(self, query: str) -> tuple[Optional[list[Memory]], bool]:
         """
         Graph Pivot strategy: Don't show what matches the screen.
         Find anchors, filter echo chamber, pivot to graph neighbors.
@@ -506,104 +897,114 @@ class CascadeRouter:
         - derives: Inferred connections from patterns
         - extends: New info adds to existing knowledge
         - contrast: Opposing or alternative viewpoints
+        
+        Returns:
+            (result, complete): complete is False when some neighbor lookups
+            failed and result was built from the rest (don't cache it)
         """
+        # Bind hot settings to locals once (avoids repeated attribute lookups per item)
+        hi = self.settings.max_similarity_threshold
+        lo = self.settings.min_similarity_threshold
+        max_n = self.settings.max_suggestions
+        
         # Find anchors with relationships
-        anchors = await self.supermemory.search(
-            query, 
-            limit=self.settings.max_anchors,
-            include_related=True
-        )
+        anchors = await self.supermemory.search_cached(query, max_limit=self.settings.max_anchors)
         
         if not anchors:
-            return None
+            return None, True
+        
+        # Categorize anchors by similarity in one pass (too-distant anchors are dropped)
+        echo_chamber_anchors: list[Memory] = []
+        sweet_spot_anchors: list[Memory] = []
+        for a in anchors:
+            similarity = a.similarity
+            if similarity >= hi:
+                echo_chamber_anchors.append(a)
+            elif similarity >= lo:
+                sweet_spot_anchors.append(a)
+        
+        # Graph Pivot: pivot from echo chamber anchors (top 3) to their neighbors -
+        # too similar to show directly, but their connections are valuable - and
+        # expand sweet spot anchors that have graph connections. One fan-out.
+        pivot_anchors = echo_chamber_anchors[:3] + [a for a in sweet_spot_anchors if a.relationships]
+        related_by_anchor = await self.supermemory.get_related_batch(
+            ids=[a.id for a in pivot_anchors],
+            relationship_types=_PIVOT_RELATIONSHIPS,
+            # Anchors came back from search with content: no need to refetch them
+            anchor_contents={a.id: a.content for a in pivot_anchors}
+        )
         
-        # Categorize anchors by similarity
-        echo_chamber_anchors = [
-            a for a in anchors 
-            if a.similarity >= self.settings.max_similarity_threshold
-        ]
-        sweet_spot_anchors = [
-            a for a in anchors 
-            if self.settings.min_similarity_threshold <= a.similarity < self.settings.max_similarity_threshold
-        ]
-        
-        # Graph Pivot: Get neighbors from echo chamber anchors
-        # These are too similar to show directly, but their connections are valuable
-        neighbors: list[Memory] = []
+        complete = len(related_by_anchor) == len({a.id for a in pivot_anchors})
         
-        if echo_chamber_anchors:
-            # Pivot to graph neighbors for echo chamber items
-            neighbor_tasks = [
-                self.supermemory.get_related(
-                    anchor.id,
-                    relationship_types=["derives", "extends", "contrast"]
-                )
-                for anchor in echo_chamber_anchors[:3]  # Limit to top 3
-            ]
-            
-            neighbor_results = await asyncio.gather(*neighbor_tasks)
-            for result in neighbor_results:
-                neighbors.extend(result)
-        
-        # Also check sweet spot anchors for graph relationships
-        for anchor in sweet_spot_anchors:
-            if anchor.relationships:
-                # This anchor has graph connections - get related memories
-                related = await self.supermemory.get_related(
-                    anchor.id,
-                    relationship_types=["derives", "extends", "contrast"]
-                )
-                neighbors.extend(related)
+        neighbors: list[Memory] = []
+        for related in related_by_anchor.values():
+            neighbors.extend(related)
         
         # Combine: sweet spot anchors + graph neighbors (NOT echo chamber anchors)
         all_candidates = sweet_spot_anchors + neighbors
         
         if not all_candidates:
-            return None
+            return None, complete
         
-        # Deduplicate by ID
-        seen_ids = set()
-        unique_candidates = []
-        for candidate in all_candidates:
-            if candidate.id not in seen_ids:
-                seen_ids.add(candidate.id)
-                unique_candidates.append(candidate)
+        # Deduplicate by ID, keeping the first occurrence (anchors carry search similarity)
+        first_by_id = {c.id: c for c in reversed(all_candidates)}
+        unique_candidates = [first_by_id[i] for i in dict.fromkeys(c.id for c in all_candidates)]
         
         if not unique_candidates:
-            return None
+            return None, complete
         
         # Apply MMR doughnut scoring
-        scored = self.scorer.filter_and_rank(
-            unique_candidates, 
-            max_results=self.settings.max_suggestions
-        )
+        scored = self.scorer.filter_and_rank(unique_candidates, max_results=max_n, query=query)
         
-        return [item for item, _, _, _ in scored] if scored else None
+        return ([item for item, _, _, _ in scored] if scored else None), complete
     
     async def _check_vector(self, query: str) -> tuple[list[Memory], ConfidenceLevel]:
+        """
+        Direct vector similarity search, memoized on the normalized query.
+        Returns memories and confidence level.
+        """
+        key = self._normalize_query(query)
+        cached = self._vector_cache.get(key)
+        if cached is not None:
+            memories, confidence = cached
+            return list(memories), confidence
+        
+        try:
+            memories, confidence = await self._compute_vector(query)
+        except SupermemoryUnavailable as e:
+            # An outage isn't "no memories": answer empty, don't cache
+            logger.warning("⚠️ Vector check failed: %s", e)
+            return [], _LOW
+        self._vector_cache.set(key, (tuple(memories), confidence))
+        return memories, confidence
+    
+    async def _compute_vector(self, query: str) -> tuple[list[Memory], ConfidenceLevel]:
         """
         Direct vector similarity search.
         Returns memories and confidence level.
         """
-        memories = await self.supermemory.search(query, limit=5)
+        hi = self.settings.max_similarity_threshold
+        lo = self.settings.min_similarity_threshold
+        
+        memories = await self.supermemory.search_cached(query, max_limit=5)
         
         if not memories:
-            return [], ConfidenceLevel.LOW
+            return [], _LOW
         
         # Calculate average similarity of top results
         top_similarities = [m.similarity for m in memories[:3]]
         avg_similarity = sum(top_similarities) / len(top_similarities)
         
         # Determine confidence level
-        if avg_similarity > 0.85:
-            confidence = ConfidenceLevel.HIGH
-        elif avg_similarity >= 0.65:
-            confidence = ConfidenceLevel.MEDIUM
+        if avg_similarity > hi:
+            confidence = _HIGH
+        elif avg_similarity >= lo:
+            confidence = _MEDIUM
         else:
-            confidence = ConfidenceLevel.LOW
+            confidence = _LOW
         
         # Apply scoring (including MMR doughnut)
-        scored = self.scorer.filter_and_rank(memories, max_results=3)
+        scored = self.scorer.filter_and_rank(memories, max_results=3, query=query)
         result = [item for item, _, _, _ in scored]
         
         return result, confidence
@@ -654,8 +1055,8 @@ class CascadeRouter:
                     vibe = r.vibe_profile
                     break
             
-            print(f"   🎲 Orthogonal search found {len(combined)} results")
-            print(f"      Strategies: {metadata.get('strategies_used', [])}")
+            logger.debug("🎲 Orthogonal search found %d results", len(combined))
+            logger.debug("   Strategies: %s", metadata.get('strategies_used', []))
             
             return OrthogonalCombinedResult(
                 items=combined,
@@ -664,7 +1065,7 @@ class CascadeRouter:
             )
             
         except Exception as e:
-            print(f"   ⚠️ Orthogonal search error: {e}")
+            logger.warning("⚠️ Orthogonal search error: %s", e)
             return None
     
     async def route_orthogonal_only(
@@ -682,7 +1083,7 @@ class CascadeRouter:
             return CascadeResult(
                 items=result.items,
                 path=RetrievalPath.ORTHOGONAL,
-                confidence=ConfidenceLevel.MEDIUM,
+                confidence=_MEDIUM,
                 orthogonal_metadata=result.metadata,
                 vibe_profile=result.vibe
             )
@@ -692,7 +1093,7 @@ class CascadeRouter:
         return CascadeResult(
             items=web_results,
             path=RetrievalPath.WEB,
-            confidence=ConfidenceLevel.LOW
+            confidence=_LOW
         )
     
     # =========================================================================
@@ -723,16 +1124,16 @@ class CascadeRouter:
         """
         # Fetch user memories if not provided
         if user_memories is None:
-            user_memories = await self.supermemory.search("", limit=20)
+            user_memories = await self._get_recent_memories()
         
         if not user_memories:
-            print("   ⚠️ Vector math: No user memories available")
+            logger.debug("⚠️ Vector math: No user memories available")
             # Fallback to standard web search
             web_results = await self.exa.search(query, num_results=5)
             return CascadeResult(
                 items=web_results,
                 path=RetrievalPath.WEB,
-                confidence=ConfidenceLevel.LOW
+                confidence=_LOW
             )
         
         try:
@@ -744,12 +1145,12 @@ class CascadeRouter:
             )
             
             if not results:
-                print("   ⚠️ Vector math: No results from any strategy")
+                logger.debug("⚠️ Vector math: No results from any strategy")
                 web_results = await self.exa.search(query, num_results=5)
                 return CascadeResult(
                     items=web_results,
                     path=RetrievalPath.WEB,
-                    confidence=ConfidenceLevel.LOW
+                    confidence=_LOW
                 )
             
             # Combine results from all strategies
@@ -776,28 +1177,26 @@ class CascadeRouter:
                 if r.target_vibe:
                     orthogonal_metadata["target_vibes"].append(r.target_vibe)
             
-            print(f"   🧮 Vector math found {len(combined)} results")
-            print(f"      Strategies: {orthogonal_metadata['strategies_used']}")
+            logger.debug("🧮 Vector math found %d results", len(combined))
+            logger.debug("   Strategies: %s", orthogonal_metadata['strategies_used'])
             
             return CascadeResult(
                 items=combined,
                 path=RetrievalPath.VECTOR_MATH,
-                confidence=ConfidenceLevel.MEDIUM,  # Vector math is exploratory
+                confidence=_MEDIUM,  # Vector math is exploratory
                 orthogonal_metadata=orthogonal_metadata,
                 vibe_profile=vibe
             )
             
         except Exception as e:
-            print(f"   ⚠️ Vector math routing error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("⚠️ Vector math routing error: %s", e)
             
             # Fallback to web search
             web_results = await self.exa.search(query, num_results=5)
             return CascadeResult(
                 items=web_results,
                 path=RetrievalPath.WEB,
-                confidence=ConfidenceLevel.LOW
+                confidence=_LOW
             )
     
     async def route_vector_math_pca(
@@ -821,11 +1220,15 @@ class CascadeRouter:
             return CascadeResult(
                 items=[],
                 path=RetrievalPath.VECTOR_MATH_PCA,
-                confidence=ConfidenceLevel.LOW,
+                confidence=_LOW,
                 orthogonal_metadata={"error": f"Need at least {self.settings.pca_min_memories} memories"}
             )
         
-        vibe = await self.synthesizer.extract_vibe(context)
+        # Embed memories while the vibe is extracted (embeddings are cached)
+        vibe, _ = await asyncio.gather(
+            self.synthesizer.extract_vibe(context),
+            self.orthogonal.vector_math.prefetch_embeddings(memories=user_memories)
+        )
         
         result = await self.orthogonal.search_principal_component(
             user_memories=user_memories,
@@ -836,7 +1239,7 @@ class CascadeRouter:
         return CascadeResult(
             items=result.items,
             path=RetrievalPath.VECTOR_MATH_PCA,
-            confidence=ConfidenceLevel.MEDIUM if result.items else ConfidenceLevel.LOW,
+            confidence=_MEDIUM if result.items else _LOW,
             orthogonal_metadata={
                 "strategy": "pca",
                 "subtracted_tags": result.subtracted_tags,
@@ -864,7 +1267,14 @@ class CascadeRouter:
         Returns:
             CascadeResult with contrast-steered items
         """
-        vibe = await self.synthesizer.extract_vibe(context)
+        # Embed taste and context while the vibe is extracted (embeddings are cached)
+        vibe, _ = await asyncio.gather(
+            self.synthesizer.extract_vibe(context),
+            self.orthogonal.vector_math.prefetch_embeddings(
+                memories=user_memories,
+                texts=[context[:4000]]
+            )
+        )
         
         result = await self.orthogonal.search_antonym_steering(
             current_context=context,
@@ -877,7 +1287,7 @@ class CascadeRouter:
         return CascadeResult(
             items=result.items,
             path=RetrievalPath.VECTOR_MATH_ANTONYM,
-            confidence=ConfidenceLevel.MEDIUM if result.items else ConfidenceLevel.LOW,
+            confidence=_MEDIUM if result.items else _LOW,
             orthogonal_metadata={
                 "strategy": "antonym",
                 "target_vibe": result.target_vibe,
@@ -905,10 +1315,32 @@ class CascadeRouter:
         Returns:
             CascadeResult with cross-domain transformed items
         """
-        vibe = await self.synthesizer.extract_vibe(context)
+        # Nothing to transform (or a same-domain no-op bridge): skip the vibe LLM call
+        if (
+            not context
+            or len(context.strip()) < 20
+            or source_domain.strip().lower() == target_domain.strip().lower()
+        ):
+            return CascadeResult(
+                items=[],
+                path=RetrievalPath.VECTOR_MATH_BRIDGE,
+                confidence=_LOW,
+                orthogonal_metadata={"skipped": "trivial_bridge"}
+            )
+        
+        content = truncate_tokens(context, self.settings.bridge_content_max_tokens)
+        
+        # Embed the content and build bridge vectors while the vibe is extracted
+        vibe, _ = await asyncio.gather(
+            self.synthesizer.extract_vibe(context),
+            self.orthogonal.vector_math.prefetch_embeddings(
+                texts=[content],
+                bridges=True
+            )
+        )
         
         result = await self.orthogonal.search_bridge_vector(
-            content=context[:2000],
+            content=content,
             source_domain=source_domain,
             target_domain=target_domain,
             vibe=vibe,
@@ -918,7 +1350,7 @@ class CascadeRouter:
         return CascadeResult(
             items=result.items,
             path=RetrievalPath.VECTOR_MATH_BRIDGE,
-            confidence=ConfidenceLevel.MEDIUM if result.items else ConfidenceLevel.LOW,
+            confidence=_MEDIUM if result.items else _LOW,
             orthogonal_metadata={
                 "strategy": "bridge",
                 "source_domain": source_domain,
@@ -929,8 +1361,15 @@ class CascadeRouter:
         )
     
     async def close(self):
-        """Clean up resources."""
-        await self.supermemory.close()
+        """
+        Clean up resources.
+        
+        The Supermemory and Exa clients are shared by reference and left
+        open; their owner closes them.
+        """
+        for task in list(self._background_tasks):
+            task.cancel()
+        await self.orthogonal.aclose()
 
 
 class OrthogonalCombinedResult:
@@ -0,0 +1,80 @@
+"""
+Circuit breaker for external search APIs.
+
+After `fail_max` consecutive failures the breaker opens and calls are
+rejected immediately instead of waiting out client timeouts. Once
+`reset_timeout` seconds have passed a single trial call is let through
+(half-open): success closes the breaker, failure re-opens it. A trial that
+is abandoned (cancelled) re-opens it without restarting the timeout, so the
+next call becomes the new trial.
+"""
+
+import time
+from enum import Enum
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling through an open breaker."""
+
+
+class BreakerState(str, Enum):
+    """Circuit breaker state."""
+    CLOSED = "closed"        # Normal operation
+    OPEN = "open"            # Failing fast
+    HALF_OPEN = "half_open"  # Trial call in flight
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Usage:
+        if not breaker.allow():
+            return []  # Fail fast
+        try:
+            result = call()
+        except asyncio.CancelledError:
+            breaker.record_cancelled()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 30.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    def allow(self) -> bool:
+        """Whether a call may proceed right now."""
+        if self.state == BreakerState.CLOSED:
+            return True
+
+        if self.state == BreakerState.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            # Let one trial call through
+            self.state = BreakerState.HALF_OPEN
+            return True
+
+        return False
+
+    def record_success(self):
+        """A call succeeded: close the breaker."""
+        self.state = BreakerState.CLOSED
+        self._failures = 0
+
+    def record_failure(self):
+        """A call failed: open the breaker once failures reach fail_max (or the trial failed)."""
+        self._failures += 1
+        if self.state == BreakerState.HALF_OPEN or self._failures >= self.fail_max:
+            self.state = BreakerState.OPEN
+            self._opened_at = time.monotonic()
+    
+    def record_cancelled(self):
+        """A call was abandoned before it finished: a half-open trial gives way to the next call."""
+        if self.state == BreakerState.HALF_OPEN:
+            # _opened_at is unchanged, so the reset timeout has already elapsed
+            self.state = BreakerState.OPEN
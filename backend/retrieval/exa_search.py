@@ -1,16 +1,128 @@
-from exa_py import Exa
+import asyncio
+import logging
+from functools import lru_cache
+
 from typing import Optional
+from urllib.parse import urlparse
+
+import httpx
 
 from models import SearchResult
+from cache import TTLCache
+from retrieval.circuit_breaker import CircuitBreaker, CircuitOpenError
 from config import get_settings
 
+logger = logging.getLogger(__name__)
+
+EXA_API_URL = "https://api.exa.ai"
+
+
+# Pooled Exa REST clients by API key
+_HTTP_CLIENTS: dict[str, httpx.AsyncClient] = {}
+
+
+def _get_http_client(api_key: str) -> httpx.AsyncClient:
+    """Shared keep-alive connection pool for an API key (recreated once closed)."""
+    client = _HTTP_CLIENTS.get(api_key)
+    if client is None or client.is_closed:
+        client = _HTTP_CLIENTS[api_key] = httpx.AsyncClient(
+            base_url=EXA_API_URL,
+            http2=True,  # Parallel strategy searches multiplex over one connection
+            headers={"x-api-key": api_key},
+            limits=httpx.Limits(
+                max_connections=32,
+                max_keepalive_connections=32,
+                keepalive_expiry=60.0
+            ),
+            timeout=30.0
+        )
+    return client
+
+
+@lru_cache(maxsize=2048)
+def _extract_domain(url: str) -> str:
+    """Network location of a URL (memoized: pages are re-queried while browsing)."""
+    return urlparse(url).netloc
+
 
 class ExaSearchClient:
     """Client for Exa.ai neural web search."""
     
+    # URLs per /contents request; larger lists are fetched concurrently
+    CONTENTS_CHUNK_SIZE = 10
+    
     def __init__(self):
         settings = get_settings()
-        self.client = Exa(api_key=settings.exa_api_key)
+        # Async REST client, shared per API key so every instance reuses warm connections
+        self.http_client = _get_http_client(settings.exa_api_key)
+        # Fail fast during Exa outages instead of paying the client timeout per call
+        self.breaker = CircuitBreaker(
+            fail_max=settings.exa_breaker_fail_max,
+            reset_timeout=settings.exa_breaker_reset_timeout
+        )
+        # Cap in-flight requests to respect Exa rate limits
+        self._sem = asyncio.Semaphore(settings.exa_max_concurrency)
+        # Recent search results by normalized inputs (failed searches are not cached)
+        self._search_cache = TTLCache(maxsize=1024, ttl=settings.exa_cache_ttl)
+    
+    async def _call_exa(self, endpoint: str, payload: dict) -> list[dict]:
+        """
+        POST to an Exa REST endpoint through the circuit breaker and the
+        concurrency limit.
+        
+        Raises CircuitOpenError without calling Exa while the breaker is open.
+        Client errors (4xx other than 429) mean Exa answered a bad request,
+        so they don't count as breaker failures.
+        
+        Returns:
+            The response's result objects
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("circuit open, skipping call")
+        
+        try:
+            async with self._sem:
+                response = await self.http_client.post(endpoint, json=payload)
+                response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            if 400 <= status < 500 and status != 429:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            # An abandoned half-open trial must not leave the breaker stuck
+            self.breaker.record_cancelled()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        
+        self.breaker.record_success()
+        return response.json().get("results", [])
+    
+    @staticmethod
+    def _search_payload(
+        query: str,
+        num_results: int,
+        use_autoprompt: bool,
+        exclude_domains: Optional[list[str]]
+    ) -> dict:
+        """Request body for /search (fetches extra results for filtering)."""
+        payload = {
+            "query": query,
+            "type": "neural",
+            "numResults": num_results + 3,
+            "contents": {"text": {"maxCharacters": 2000}},
+            "useAutoprompt": use_autoprompt
+        }
+        
+        # Add domain exclusions if provided
+        if exclude_domains:
+            payload["excludeDomains"] = exclude_domains
+        
+        return payload
     
     async def search(
         self, 
@@ -33,46 +145,87 @@ class ExaSearchClient:
         Returns:
             List of search results with content
         """
+        cache_key = self._search_key(query, num_results, use_autoprompt, exclude_domains, exclude_text)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            # Copy on read so callers can't mutate the cached results
+            return [result.model_copy() for result in cached]
+        
         try:
-            # Build search parameters
-            search_params = {
-                "type": "neural",
-                "num_results": num_results + 3,  # Fetch extra for filtering
-                "text": {"max_characters": 2000},
-                "use_autoprompt": use_autoprompt
-            }
-            
-            # Add domain exclusions if provided
-            if exclude_domains:
-                search_params["exclude_domains"] = exclude_domains
-            
-            # Note: exa_py is sync, we run it in the event loop
-            response = self.client.search_and_contents(
-                query,
-                **search_params
+            items = await self._call_exa(
+                "/search",
+                self._search_payload(query, num_results, use_autoprompt, exclude_domains)
             )
             
-            results = []
-            for item in response.results:
-                result = SearchResult(
-                    title=item.title or "",
-                    url=item.url,
-                    text=item.text or "",
-                    score=item.score if hasattr(item, 'score') else 0.8,
-                    published_date=item.published_date if hasattr(item, 'published_date') else None
-                )
-                results.append(result)
+            results = [self._to_search_result(item) for item in items]
             
             # Filter out results that are primarily about the excluded text
             if exclude_text and results:
                 results = self._filter_redundant_results(results, exclude_text)
             
-            return results[:num_results]
+            results = results[:num_results]
+            self._search_cache.set(cache_key, tuple(result.model_copy() for result in results))
+            return results
             
         except Exception as e:
-            print(f"Exa search error: {e}")
+            logger.warning("Exa search error: %s", e)
             return []
     
+    async def multi_search(self, queries: list[dict]) -> list[list[SearchResult]]:
+        """
+        Run several searches as one batch.
+        
+        Exa has no multi-query endpoint, so the batch fans out concurrently
+        over the shared connection pool; identical requests are sent once.
+        
+        Args:
+            queries: search() keyword arguments, one dict per search
+            
+        Returns:
+            Results for each query, in input order
+        """
+        unique: dict[tuple, dict] = {}
+        keys = []
+        for params in queries:
+            key = self._search_key(**params)
+            unique.setdefault(key, params)
+            keys.append(key)
+        
+        responses = await asyncio.gather(*(self.search(**params) for params in unique.values()))
+        by_key = dict(zip(unique, responses))
+        
+        return [list(by_key[key]) for key in keys]
+    
+    @staticmethod
+    def _search_key(
+        query: str,
+        num_results: int = 5,
+        use_autoprompt: bool = True,
+        exclude_domains: list[str] = None,
+        exclude_text: str = None
+    ) -> tuple:
+        """Hashable identity of a search() call (result cache and batch dedup key)."""
+        return (
+            query,
+            num_results,
+            use_autoprompt,
+            tuple(sorted(exclude_domains)) if exclude_domains else (),
+            exclude_text
+        )
+    
+    @staticmethod
+    def _to_search_result(item: dict, score: Optional[float] = None) -> SearchResult:
+        """Convert an Exa API result object into a SearchResult."""
+        if score is None:
+            score = item.get("score")
+        return SearchResult(
+            title=item.get("title") or "",
+            url=item["url"],
+            text=item.get("text") or "",
+            score=score if score is not None else 0.8,
+            published_date=item.get("publishedDate")
+        )
+    
     def _filter_redundant_results(
         self, 
         results: list[SearchResult], 
@@ -85,32 +238,26 @@ class ExaSearchClient:
         Uses simple heuristics - if the title or text heavily features
         the excluded subject, filter it out.
         """
-        exclude_lower = exclude_text.lower()
-        exclude_words = set(exclude_lower.split())
+        exclude_cf = exclude_text.casefold()
+        exclude_words = frozenset(exclude_cf.split())
+        min_overlap = min(2, len(exclude_words))
         
         filtered = []
         for result in results:
-            title_lower = result.title.lower()
-            text_preview = result.text[:500].lower()
-            
-            # Check if the title is primarily about the excluded subject
-            title_match = exclude_lower in title_lower
-            
-            # Check if multiple words from excluded text appear in title
-            title_words = set(title_lower.split())
-            word_overlap = len(exclude_words & title_words)
-            high_word_overlap = word_overlap >= min(2, len(exclude_words))
+            title_cf = result.title.casefold()
             
-            # Check if the text starts with the excluded subject (likely a Wikipedia-style page)
-            text_starts_with = text_preview.startswith(exclude_lower)
-            
-            # Filter if it seems to be primarily about the same thing
-            is_redundant = (title_match or (high_word_overlap and text_starts_with))
+            # Title primarily about the excluded subject, or multiple excluded
+            # words in the title and text that starts with the subject
+            # (likely a Wikipedia-style page)
+            is_redundant = exclude_cf in title_cf or (
+                len(exclude_words.intersection(title_cf.split())) >= min_overlap
+                and result.text[:500].casefold().startswith(exclude_cf)
+            )
             
             if not is_redundant:
                 filtered.append(result)
             else:
-                print(f"   🚫 Filtered redundant result: {result.title[:50]}")
+                logger.debug("   🚫 Filtered redundant result: %s", result.title[:50])
         
         return filtered
     
@@ -136,9 +283,9 @@ class ExaSearchClient:
         # This helps find articles ABOUT the concepts, not just mentioning them
         enhanced_query = f"{query}"
         
-        print(f"   🔍 Searching for connections: '{enhanced_query}'")
+        logger.debug("   🔍 Searching for connections: '%s'", enhanced_query)
         if main_subject:
-            print(f"   🚫 Excluding results about: '{main_subject}'")
+            logger.debug("   🚫 Excluding results about: '%s'", main_subject)
         
         # Exclude common domains that might have duplicate content
         exclude_domains = []
@@ -169,38 +316,26 @@ class ExaSearchClient:
             exclude_same_domain: Whether to exclude results from same domain
         """
         try:
-            params = {
-                "num_results": num_results,
-                "text": {"max_characters": 2000}
+            payload = {
+                "url": url,
+                "numResults": num_results,
+                "contents": {"text": {"maxCharacters": 2000}}
             }
             
             if exclude_same_domain:
                 # Extract domain from URL and exclude it
-                from urllib.parse import urlparse
-                domain = urlparse(url).netloc
+                domain = _extract_domain(url)
                 if domain:
-                    params["exclude_domains"] = [domain]
+                    payload["excludeDomains"] = [domain]
             
-            response = self.client.find_similar_and_contents(
-                url,
-                **params
-            )
+            items = await self._call_exa("/findSimilar", payload)
             
-            results = []
-            for item in response.results:
-                result = SearchResult(
-                    title=item.title or "",
-                    url=item.url,
-                    text=item.text or "",
-                    score=item.score if hasattr(item, 'score') else 0.8,
-                    published_date=item.published_date if hasattr(item, 'published_date') else None
-                )
-                results.append(result)
+            results = [self._to_search_result(item) for item in items]
             
             return results
             
         except Exception as e:
-            print(f"Exa find_similar error: {e}")
+            logger.warning("Exa find_similar error: %s", e)
             return []
     
     async def get_contents(
@@ -210,26 +345,45 @@ class ExaSearchClient:
         """
         Fetch the content of specific URLs.
         Useful when we have a URL from the browser and need its content.
+        
+        Large URL lists are fetched in concurrent chunks; a failed chunk is
+        skipped and the rest are returned in input order.
         """
-        try:
-            response = self.client.get_contents(
-                urls,
-                text={"max_characters": 8000}
-            )
-            
-            results = []
-            for item in response.results:
-                result = SearchResult(
-                    title=item.title or "",
-                    url=item.url,
-                    text=item.text or "",
-                    score=1.0,  # Direct fetch, so full relevance
-                    published_date=item.published_date if hasattr(item, 'published_date') else None
-                )
-                results.append(result)
-            
-            return results
-            
-        except Exception as e:
-            print(f"Exa get_contents error: {e}")
-            return []
+        chunks = [
+            urls[i:i + self.CONTENTS_CHUNK_SIZE]
+            for i in range(0, len(urls), self.CONTENTS_CHUNK_SIZE)
+        ]
+        responses = await asyncio.gather(
+            *(self._call_exa("/contents", {"ids": chunk, "text": {"maxCharacters": 8000}}) for chunk in chunks),
+            return_exceptions=True
+        )
+        
+        results = []
+        for response in responses:
+            if isinstance(response, BaseException):
+                logger.warning("Exa get_contents error: %s", response)
+                continue
+            # Direct fetch, so full relevance
+            results.extend(self._to_search_result(item, score=1.0) for item in response)
+        
+        return results
+    
+    async def aclose(self):
+        """Close the (shared) HTTP connection pool; later clients open a new one."""
+        await self.http_client.aclose()
+    
+    async def close(self):
+        """Alias of aclose()."""
+        await self.aclose()
+    
+    async def __aenter__(self) -> "ExaSearchClient":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+@lru_cache
+def get_exa_client() -> ExaSearchClient:
+    """Process-wide ExaSearchClient shared by every caller."""
+    return ExaSearchClient()
@@ -2,25 +2,86 @@
 Judge Logger: Training data collection for context routing.
 
 Logs every judge decision and user feedback for future model training.
-Uses async file I/O to avoid blocking the main thread.
+Entries are queued and written in batches by a background task using async
+file I/O, so logging never blocks the request path.
 
 Log format (JSONL):
 {"type": "decision", "request_id": "abc", "timestamp": 1234567890.0, "app_name": "Safari", ...}
 {"type": "feedback", "request_id": "abc", "insight_id": "xyz", "signal": "click", ...}
+
+When pyarrow is installed, compact() moves the JSONL log into a columnar
+Parquet file next to it (<stem>_YYYYMMDD-HHMMSS.parquet); the readers
+stream compacted files first, then the live JSONL log.
 """
 
-import json
+import asyncio
+import itertools
+import threading
 import time
 import os
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import aiofiles
+import orjson
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pa_dataset
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional (only needed for Parquet compaction)
+    pa = None
 
 from models import StrategyWeights
 from config import get_settings
 
 
+# Fields of each entry type, in log order (Parquet rows carry every column)
+_ENTRY_FIELDS = {
+    "decision": (
+        "type", "timestamp", "request_id", "app_name", "window_title",
+        "weights", "insight_ids", "context_len", "retrieval_path"
+    ),
+    "feedback": (
+        "type", "timestamp", "request_id", "insight_id", "signal",
+        "dwell_time_ms", "position", "metadata"
+    ),
+}
+
+# Low-cardinality string columns, dictionary-encoded in Parquet
+_DICTIONARY_COLUMNS = ["type", "app_name", "retrieval_path", "signal"]
+
+
+def _parquet_schema():
+    """Explicit Parquet schema for compacted judge logs (requires pyarrow)."""
+    return pa.schema([
+        ("type", pa.string()),
+        ("timestamp", pa.float64()),
+        ("request_id", pa.string()),
+        # Decision fields
+        ("app_name", pa.string()),
+        ("window_title", pa.string()),
+        ("weights", pa.struct([
+            ("serendipity", pa.float64()),
+            ("relevance", pa.float64()),
+            ("source_web", pa.float64()),
+            ("source_local", pa.float64()),
+            ("reasoning", pa.string()),
+        ])),
+        ("insight_ids", pa.list_(pa.string())),
+        ("context_len", pa.int64()),
+        ("retrieval_path", pa.string()),
+        # Feedback fields
+        ("insight_id", pa.string()),
+        ("signal", pa.string()),
+        ("dwell_time_ms", pa.int64()),
+        ("position", pa.int64()),
+        ("metadata", pa.string()),  # Free-form, stored as JSON
+    ])
+
+
 class JudgeLogger:
     """
     Async logger for training data collection.
@@ -29,18 +90,41 @@ class JudgeLogger:
     1. Decisions: Context -> StrategyWeights mapping (input -> label)
     2. Feedback: User response to insights (for reward signal)
     
-    Data is stored in JSONL format for easy streaming/loading.
+    Data is stored in JSONL format for easy streaming/loading, and can be
+    compacted into Parquet for columnar training scans.
     """
     
+    # Entries buffered before new ones are dropped, and max entries per write
+    QUEUE_SIZE = 10_000
+    BATCH_SIZE = 256
+    
+    # Log directories already created by any instance
+    _ensured_dirs: set[str] = set()
+    _dirs_lock = threading.Lock()
+    
     def __init__(self, filepath: str = None):
         settings = get_settings()
         self.filepath = filepath or settings.judge_log_path
         self._ensure_directory()
+        # Entries are queued and appended in batches by a single writer task,
+        # started on first use (needs a running event loop)
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        # Append handle kept open across batches
+        self._file = None
+        # Held by the writer from its inode check through the write, and by
+        # compact() around the rename, so no batch lands in a renamed log
+        self._write_lock = asyncio.Lock()
+        self.dropped = 0
     
     def _ensure_directory(self):
-        """Create the training_data directory if it doesn't exist."""
-        directory = Path(self.filepath).parent
-        directory.mkdir(parents=True, exist_ok=True)
+        """Create the training_data directory if it doesn't exist (once per process)."""
+        directory = str(Path(self.filepath).parent)
+        with JudgeLogger._dirs_lock:
+            if directory in JudgeLogger._ensured_dirs:
+                return
+            Path(directory).mkdir(parents=True, exist_ok=True)
+            JudgeLogger._ensured_dirs.add(directory)
     
     async def log_decision(
         self,
@@ -112,62 +196,217 @@ class JudgeLogger:
         await self._write_entry(entry)
     
     async def _write_entry(self, entry: dict):
-        """Write a single entry to the log file."""
+        """Queue a single entry for the background writer."""
+        if self._writer_task is None:
+            self._queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+            self._writer_task = asyncio.create_task(self._writer_loop())
+        
         try:
-            async with aiofiles.open(self.filepath, mode='a') as f:
-                await f.write(json.dumps(entry) + "\n")
-        except Exception as e:
-            # Don't fail the main request if logging fails
-            print(f"   ⚠️ JudgeLogger write error: {e}")
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            # Don't block the main request if the writer falls behind
+            self.dropped += 1
     
-    def read_training_data(self, limit: int = None) -> list[dict]:
-        """
-        Read training data synchronously (for analysis/training scripts).
+    async def _writer_loop(self):
+        """Append queued entries to the log file, one write per batch."""
+        while True:
+            entries = [await self._queue.get()]
+            while not self._queue.empty() and len(entries) < self.BATCH_SIZE:
+                entries.append(self._queue.get_nowait())
+            
+            try:
+                async with self._write_lock:
+                    if not self._file_is_current():
+                        await self._open_file()
+                    await self._file.write(b"".join(orjson.dumps(entry) + b"\n" for entry in entries))
+                    await self._file.flush()
+            except Exception as e:
+                # Don't fail the main request if logging fails
+                print(f"   ⚠️ JudgeLogger write error: {e}")
+            finally:
+                for _ in entries:
+                    self._queue.task_done()
+    
+    def _file_is_current(self) -> bool:
+        """Whether the open handle still points at the log path (compact() renames it)."""
+        if self._file is None:
+            return False
+        try:
+            return os.stat(self.filepath).st_ino == os.fstat(self._file.fileno()).st_ino
+        except OSError:
+            return False
+    
+    async def _open_file(self):
+        """(Re)open the long-lived append handle on the log path."""
+        if self._file is not None:
+            await self._file.close()
+        self._file = await aiofiles.open(self.filepath, mode='ab')
+    
+    async def flush(self):
+        """Wait until every queued entry has been written."""
+        if self._queue is not None:
+            await self._queue.join()
+    
+    async def close(self):
+        """Flush pending entries, stop the writer task and close the log file."""
+        if self._writer_task is None:
+            return
         
-        Returns list of all logged entries.
+        await self.flush()
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        self._writer_task = None
+        self._queue = None
+        
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
+    
+    def iter_training_data(self, limit: int = None) -> Iterator[dict]:
         """
-        entries = []
+        Stream training data entries one at a time (for analysis/training scripts).
         
+        Compacted Parquet files are read first (batch by batch), then the
+        live JSONL log, whose lines are parsed lazily with orjson so large
+        logs are never fully loaded into memory. Malformed lines are skipped.
+        """
+        entries = itertools.chain(self._iter_parquet(), self._iter_jsonl())
+        if limit:
+            entries = itertools.islice(entries, limit)
+        yield from entries
+    
+    def _iter_jsonl(self) -> Iterator[dict]:
+        """Stream entries from the live JSONL log."""
         if not os.path.exists(self.filepath):
-            return entries
+            return
         
-        with open(self.filepath, 'r') as f:
-            for i, line in enumerate(f):
-                if limit and i >= limit:
-                    break
+        with open(self.filepath, 'rb') as f:
+            for line in f:
                 try:
-                    entries.append(json.loads(line.strip()))
-                except json.JSONDecodeError:
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError:
                     continue
+    
+    def _parquet_paths(self) -> list[Path]:
+        """Compacted Parquet files for this log, oldest first."""
+        path = Path(self.filepath)
+        return sorted(path.parent.glob(f"{path.stem}_*.parquet"))
+    
+    def _iter_parquet(self) -> Iterator[dict]:
+        """Stream entries from compacted Parquet files (none without pyarrow)."""
+        if pa is None:
+            return
+        
+        paths = self._parquet_paths()
+        if not paths:
+            return
         
-        return entries
+        dataset = pa_dataset.dataset([str(p) for p in paths], schema=_parquet_schema())
+        for batch in dataset.to_batches():
+            for row in batch.to_pylist():
+                entry = {field: row[field] for field in _ENTRY_FIELDS.get(row["type"], row)}
+                if entry.get("metadata") is not None:
+                    entry["metadata"] = orjson.loads(entry["metadata"])
+                yield entry
     
-    def get_decision_feedback_pairs(self) -> list[tuple[dict, list[dict]]]:
+    async def compact(self) -> Optional[str]:
         """
-        Join decisions with their corresponding feedback.
+        Move the JSONL log into a new Parquet file (for training scripts).
         
-        Returns list of (decision, [feedback, feedback, ...]) tuples.
-        Useful for training: context -> weights -> did user like results?
+        Queued entries are flushed first. The log is then renamed under the
+        writer's lock before it is read, so entries logged meanwhile start a
+        fresh JSONL file instead of being lost. Requires pyarrow.
+        
+        Returns:
+            Path of the written Parquet file, or None if there was nothing to compact
+        """
+        if pa is None:
+            print("   ⚠️ JudgeLogger compaction requires pyarrow")
+            return None
+        
+        await self.flush()
+        
+        path = Path(self.filepath)
+        pending = path.with_suffix(path.suffix + ".compacting")
+        async with self._write_lock:
+            if not os.path.exists(self.filepath):
+                return None
+            os.replace(path, pending)
+        
+        return await asyncio.to_thread(self._write_parquet, pending)
+    
+    def _write_parquet(self, pending: Path) -> Optional[str]:
+        """Convert a renamed JSONL log into a new Parquet file, then delete it."""
+        path = Path(self.filepath)
+        schema = _parquet_schema()
+        rows = []
+        with open(pending, 'rb') as f:
+            for line in f:
+                try:
+                    entry = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                if entry.get("metadata") is not None:
+                    entry["metadata"] = orjson.dumps(entry["metadata"]).decode()
+                rows.append(entry)
+        
+        if not rows:
+            pending.unlink()
+            return None
+        
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        target = path.with_name(f"{path.stem}_{stamp}.parquet")
+        suffix = 1
+        while target.exists():  # Compacted twice within a second
+            target = path.with_name(f"{path.stem}_{stamp}_{suffix}.parquet")
+            suffix += 1
+        table = pa.Table.from_pylist(rows, schema=schema)
+        pq.write_table(table, target, use_dictionary=_DICTIONARY_COLUMNS, compression="zstd")
+        pending.unlink()
+        
+        return str(target)
+    
+    def read_training_data(self, limit: int = None) -> list[dict]:
+        """
+        Read training data synchronously (for analysis/training scripts).
+        
+        Returns list of all logged entries.
+        """
+        return list(self.iter_training_data(limit))
+    
+    def iter_pairs(self) -> Iterator[tuple[dict, list[dict]]]:
         """
-        entries = self.read_training_data()
+        Join decisions with their corresponding feedback in one pass over the log.
         
-        # Group by request_id
+        Yields (decision, [feedback, feedback, ...]) tuples.
+        """
         decisions = {}
-        feedback = {}
+        feedback = defaultdict(list)
         
-        for entry in entries:
+        for entry in self.iter_training_data():
             request_id = entry.get("request_id")
             if entry["type"] == "decision":
                 decisions[request_id] = entry
             elif entry["type"] == "feedback":
-                if request_id not in feedback:
-                    feedback[request_id] = []
                 feedback[request_id].append(entry)
         
-        # Join
-        pairs = []
         for request_id, decision in decisions.items():
-            fb = feedback.get(request_id, [])
-            pairs.append((decision, fb))
+            yield decision, feedback.get(request_id, [])
+    
+    def get_decision_feedback_pairs(self) -> list[tuple[dict, list[dict]]]:
+        """
+        Join decisions with their corresponding feedback.
         
-        return pairs
+        Returns list of (decision, [feedback, feedback, ...]) tuples.
+        Useful for training: context -> weights -> did user like results?
+        """
+        return list(self.iter_pairs())
+
+
+@lru_cache
+def get_judge_logger() -> JudgeLogger:
+    """Process-wide JudgeLogger, so every caller shares one file handle and writer."""
+    return JudgeLogger()
@@ -25,18 +25,44 @@ Example:
 """
 
 import asyncio
+import hashlib
+import logging
 import random
-from typing import Optional
+from itertools import chain, islice, zip_longest
+
+import numpy as np
+from typing import AsyncIterator, Optional
 from dataclasses import dataclass, field
 
 from models import VibeProfile, SearchResult, Memory
-from retrieval.exa_search import ExaSearchClient
+from retrieval.exa_search import ExaSearchClient, get_exa_client
 from retrieval.vector_math import OrthogonalVectorMath
-from synthesis.openai_client import OpenAISynthesizer
+from cache import TTLCache
+from synthesis.openai_client import OpenAISynthesizer, truncate_tokens
 from config import get_settings
 
+logger = logging.getLogger(__name__)
+
+
+# Padding for strategies with fewer items in combine_results
+_EXHAUSTED = object()
+
+# Noisy query deviation tiers, by noise scale (< 0.15, < 0.25, else)
+_NOISE_DEVIATIONS = (
+    "slightly rephrase with a different angle, keeping the core topic",
+    "shift to a related but distinct concept that shares underlying principles",
+    "make an unexpected lateral leap to a tangentially connected idea",
+)
+
+# Full system prompt per tier for the LLM noisy-query fallback
+_NOISE_SYSTEM_PROMPTS = tuple(
+    "Modify this search query to land in a RELATED but DIFFERENT semantic cluster. "
+    f"{deviation}. Return ONLY 5-15 searchable words, no explanation."
+    for deviation in _NOISE_DEVIATIONS
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class OrthogonalResult:
     """Result from orthogonal search with provenance information."""
     items: list[SearchResult]
@@ -76,7 +102,7 @@ class OrthogonalSearcher:
     
     def __init__(self, exa_client: ExaSearchClient = None, synthesizer: OpenAISynthesizer = None):
         self.settings = get_settings()
-        self.exa = exa_client or ExaSearchClient()
+        self.exa = exa_client or get_exa_client()
         self.synthesizer = synthesizer or OpenAISynthesizer()
         
         # Vector math engine for true embedding arithmetic
@@ -84,9 +110,111 @@ class OrthogonalSearcher:
         
         # Noise injection parameters
         self.noise_scale = self.settings.orthogonal_noise_scale
+        self._rng = np.random.default_rng()
         
         # Target domains for cross-domain search
         self.target_domains = self.settings.orthogonal_target_domains
+        # Target domains other than a (casefolded) source domain, memoized per
+        # source (bounded: source domains come from LLM output)
+        self._domains_excluding = TTLCache(maxsize=256, ttl=3600.0)
+        # Instance RNG for random picks (numpy's self._rng draws the noise vectors)
+        self._random = random.Random()
+        
+        # Bounds concurrent Exa calls when strategies fan out in parallel
+        self._exa_sem = asyncio.Semaphore(self.settings.max_orthogonal_concurrency)
+        # Searches requested in the same event loop tick, dispatched as one multi_search
+        self._pending_searches: list[tuple[dict, asyncio.Future]] = []
+        self._dispatch_tasks: set[asyncio.Task] = set()
+        # Bounds concurrent LLM completions across strategies (avoids 429 retry storms)
+        self._llm_sem = asyncio.Semaphore(self.settings.max_llm_concurrency)
+        
+        # Noisy query variants (tuples) by _noise_key; futures, so concurrent
+        # identical requests share one generation (failed or cancelled ones
+        # are dropped)
+        self._noisy_queries = TTLCache(maxsize=2048, ttl=self.settings.orthogonal_noisy_query_ttl)
+        # PCA serendipity vectors by memory-set digest: (memory ids, q_vector, subtracted tags)
+        self._pca_cache = TTLCache(maxsize=64, ttl=self.settings.pca_cache_ttl)
+        self._pca_last_key: Optional[bytes] = None
+        # Strategy fan-out results by _result_key (empty fan-outs are not cached)
+        self._result_cache = TTLCache(maxsize=512, ttl=self.settings.orthogonal_result_cache_ttl)
+        # Fan-outs currently running, by _result_key: identical concurrent calls share one
+        self._inflight: dict[tuple, asyncio.Task] = {}
+    
+    def _pick_domain(self, options: list[str], seed: str) -> str:
+        """
+        Pick a target domain from options.
+        
+        With deterministic_domains, the pick is a stable hash of the seed, so
+        repeat requests for the same content hit the noisy-query, Exa and
+        embedding caches; otherwise it is random.
+        """
+        if not self.settings.deterministic_domains:
+            return self._random.choice(options)
+        digest = hashlib.blake2b(seed.encode(), digest_size=8).digest()
+        return options[int.from_bytes(digest, "big") % len(options)]
+    
+    def _available_domains(self, source_domain: str) -> list[str]:
+        """Target domains other than source_domain (case-insensitive)."""
+        key = source_domain.casefold()
+        available = self._domains_excluding.get(key)
+        if available is None:
+            available = [d for d in self.target_domains if d.casefold() != key]
+            self._domains_excluding.set(key, available)
+        return available
+    
+    async def aclose(self):
+        """
+        Cancel in-flight fan-outs and search batches.
+        
+        The Exa client is shared by reference and left open; its owner closes it.
+        """
+        for task in list(self._inflight.values()):
+            task.cancel()
+        for task in list(self._dispatch_tasks):
+            task.cancel()
+        for _, future in self._pending_searches:
+            future.cancel()
+        self._pending_searches = []
+    
+    async def _search_exa(self, **kwargs) -> list[SearchResult]:
+        """
+        Queue an Exa search for the next multi_search batch.
+        
+        Strategies running in parallel that reach their search step together
+        share one dispatch (and one request per distinct query).
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending_searches.append((kwargs, future))
+        if len(self._pending_searches) == 1:
+            loop.call_soon(self._flush_searches)
+        return await future
+    
+    def _flush_searches(self):
+        """Dispatch every queued search as one batch."""
+        batch, self._pending_searches = self._pending_searches, []
+        task = asyncio.create_task(self._dispatch_searches(batch))
+        self._dispatch_tasks.add(task)
+        task.add_done_callback(self._dispatch_tasks.discard)
+    
+    async def _dispatch_searches(self, batch: list[tuple[dict, asyncio.Future]]):
+        """Run a batch through multi_search (gated by the strategy semaphore)."""
+        try:
+            async with self._exa_sem:
+                responses = await self.exa.multi_search([params for params, _ in batch])
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), results in zip(batch, responses):
+            if not future.done():
+                future.set_result(results)
     
     async def search_with_noise(
         self, 
@@ -101,12 +229,12 @@ class OrthogonalSearcher:
         
         In practice, since we can't directly manipulate Exa's embeddings, we:
         1. Get the embedding of the original query
-        2. Add Gaussian noise to the embedding
-        3. Find the nearest "word" to the perturbed embedding (via nearest neighbor in our vocab)
-        4. Use that as a modified query
+        2. Add Gaussian noise to the embedding, antithetically (q + ε and q - ε)
+        3. Find the nearest "words" to each perturbed embedding (via nearest neighbor in our vocab)
+        4. Append them to the query, shifting it slightly off its original direction
+        5. Search both variants concurrently and interleave the results (deduplicated by URL)
         
-        For simplicity, we use a linguistic approximation: add semantically adjacent
-        words/concepts to the query that shift it slightly off its original direction.
+        If embeddings are unavailable, an LLM rephrases the query instead.
         
         Args:
             query: Original search query
@@ -118,23 +246,26 @@ class OrthogonalSearcher:
         """
         scale = noise_scale or self.noise_scale
         
-        # Strategy: Generate "noisy" query variants by asking LLM to 
-        # suggest semantically adjacent but different phrasings
-        noisy_query = await self._generate_noisy_query(query, scale)
+        noisy_queries = await self._generate_noisy_queries(query, scale)
         
-        print(f"   🎲 Noise-injected query: '{noisy_query}'")
+        logger.debug("   🎲 Noise-injected queries: %s", noisy_queries)
         
-        # Search with the noisy query
-        results = await self.exa.search(
-            query=noisy_query,
-            num_results=num_results,
-            use_autoprompt=True
-        )
+        # Search every variant (queued together, so they share one dispatch)
+        result_lists = await asyncio.gather(*(
+            self._search_exa(query=variant, num_results=num_results, use_autoprompt=True)
+            for variant in noisy_queries
+        ))
+        
+        # Interleave so each side of the neighborhood is represented; first URL wins
+        merged = {}
+        for item in chain.from_iterable(zip_longest(*result_lists, fillvalue=_EXHAUSTED)):
+            if item is not _EXHAUSTED:
+                merged.setdefault(item.url, item)
         
         return OrthogonalResult(
-            items=results,
+            items=list(islice(merged.values(), num_results)),
             strategy="noise_injection",
-            query_used=noisy_query
+            query_used=" | ".join(noisy_queries)
         )
     
     async def search_via_archetype(
@@ -165,7 +296,8 @@ class OrthogonalSearcher:
         """
         # Extract vibe if not provided
         if vibe is None:
-            vibe = await self.synthesizer.extract_vibe(context)
+            async with self._llm_sem:
+                vibe = await self.synthesizer.extract_vibe(context)
         
         if not vibe.archetype:
             # Fallback if vibe extraction failed
@@ -178,17 +310,18 @@ class OrthogonalSearcher:
         
         # Pick a target domain different from the source
         if target_domain is None:
-            available_domains = [
-                d for d in self.target_domains 
-                if d.lower() != vibe.source_domain.lower()
-            ]
-            target_domain = random.choice(available_domains) if available_domains else "experiences"
+            available_domains = self._available_domains(vibe.source_domain)
+            target_domain = (
+                self._pick_domain(available_domains, f"{vibe.archetype}|{context[:2000]}")
+                if available_domains else "experiences"
+            )
         
         # Generate a query that bridges the archetype to the new domain
-        bridge_query = await self.synthesizer.generate_archetype_query(vibe, target_domain)
+        async with self._llm_sem:
+            bridge_query = await self.synthesizer.generate_archetype_query(vibe, target_domain)
         
         # Search in the new domain
-        results = await self.exa.search(
+        results = await self._search_exa(
             query=bridge_query,
             num_results=num_results,
             use_autoprompt=True
@@ -231,12 +364,12 @@ class OrthogonalSearcher:
             )
         
         # Pick a random cross-domain interest to search for
-        interest = random.choice(vibe.cross_domain_interests)
+        interest = self._random.choice(vibe.cross_domain_interests)
         
-        print(f"   🌍 Cross-domain search: '{interest}'")
+        logger.debug("   🌍 Cross-domain search: '%s'", interest)
         
         # Search for this specific interest
-        results = await self.exa.search(
+        results = await self._search_exa(
             query=interest,
             num_results=num_results,
             use_autoprompt=True
@@ -283,7 +416,10 @@ class OrthogonalSearcher:
             OrthogonalResult with mathematically serendipitous items
         """
         if len(user_memories) < self.settings.pca_min_memories:
-            print(f"   ⚠️ PCA: Need at least {self.settings.pca_min_memories} memories, got {len(user_memories)}")
+            logger.debug(
+                "   ⚠️ PCA: Need at least %d memories, got %d",
+                self.settings.pca_min_memories, len(user_memories)
+            )
             return OrthogonalResult(
                 items=[],
                 strategy="pca",
@@ -292,21 +428,19 @@ class OrthogonalSearcher:
             )
         
         # 1. Calculate serendipity vector + get subtracted component names
-        q_vector, subtracted_tags = await self.vector_math.principal_component_search(
-            user_memories, 
-            return_subtracted=True
-        )
+        q_vector, subtracted_tags = await self._principal_components(user_memories)
         
-        print(f"   🧮 PCA subtracted: {subtracted_tags}")
+        logger.debug("   🧮 PCA subtracted: %s", subtracted_tags)
         
         # 2. Translate vector -> guiding keywords for Exa
-        guide_keywords = await self.synthesizer.describe_vector_vibe(vibe, subtracted_tags)
+        async with self._llm_sem:
+            guide_keywords = await self.synthesizer.describe_vector_vibe(vibe, subtracted_tags)
         
         # 3. Fetch BROAD results with flavored query
         broad_query = f"{guide_keywords} experience hidden gem"
-        print(f"   🔍 PCA broad query: '{broad_query}'")
+        logger.debug("   🔍 PCA broad query: '%s'", broad_query)
         
-        raw_results = await self.exa.search(
+        raw_results = await self._search_exa(
             query=broad_query,
             num_results=self.settings.rerank_pool_size,
             use_autoprompt=True
@@ -328,7 +462,7 @@ class OrthogonalSearcher:
             top_k=num_results
         )
         
-        print(f"   ✨ PCA reranked {len(raw_results)} -> {len(reranked)} results")
+        logger.debug("   ✨ PCA reranked %d -> %d results", len(raw_results), len(reranked))
         
         return OrthogonalResult(
             items=reranked,
@@ -338,6 +472,34 @@ class OrthogonalSearcher:
             subtracted_tags=subtracted_tags
         )
     
+    async def _principal_components(self, user_memories: list[Memory]) -> tuple[np.ndarray, list[str]]:
+        """
+        Serendipity vector and subtracted tags for a memory set, cached.
+        
+        The SVD is skipped for a memory set seen recently, or when at most
+        pca_cache_max_churn of the memories differ from the last one computed
+        (the dominant components barely move for small changes).
+        """
+        ids = frozenset(m.id for m in user_memories)
+        key = hashlib.blake2b("\0".join(sorted(ids)).encode(), digest_size=16).digest()
+        
+        entry = self._pca_cache.get(key)
+        if entry is None and self._pca_last_key is not None:
+            last = self._pca_cache.get(self._pca_last_key)
+            if last is not None and len(last[0] ^ ids) <= self.settings.pca_cache_max_churn * len(ids):
+                entry = last
+        
+        if entry is None:
+            q_vector, subtracted_tags = await self.vector_math.principal_component_search(
+                user_memories,
+                return_subtracted=True
+            )
+            entry = (ids, q_vector, subtracted_tags)
+            self._pca_cache.set(key, entry)
+            self._pca_last_key = key
+        
+        return entry[1], list(entry[2])
+    
     async def search_antonym_steering(
         self,
         current_context: str,
@@ -374,13 +536,13 @@ class OrthogonalSearcher:
             target_vibe=target_vibe
         )
         
-        print(f"   🧭 Antonym steering towards: '{used_target_vibe}'")
+        logger.debug("   🧭 Antonym steering towards: '%s'", used_target_vibe)
         
         # 2. Build a flavored query using the target vibe
         broad_query = f"{used_target_vibe} experience unique authentic"
         
         # 3. Fetch broad results
-        raw_results = await self.exa.search(
+        raw_results = await self._search_exa(
             query=broad_query,
             num_results=self.settings.rerank_pool_size,
             use_autoprompt=True
@@ -402,7 +564,7 @@ class OrthogonalSearcher:
             top_k=num_results
         )
         
-        print(f"   ✨ Antonym reranked {len(raw_results)} -> {len(reranked)} results")
+        logger.debug("   ✨ Antonym reranked %d -> %d results", len(raw_results), len(reranked))
         
         return OrthogonalResult(
             items=reranked,
@@ -445,7 +607,7 @@ class OrthogonalSearcher:
             target_domain
         )
         
-        print(f"   🌉 Bridge: {source_domain} -> {target_domain}")
+        logger.debug("   🌉 Bridge: %s -> %s", source_domain, target_domain)
         
         # 2. Build a flavored query for target domain
         # Use vibe signatures to flavor the query
@@ -453,7 +615,7 @@ class OrthogonalSearcher:
         broad_query = f"{target_domain} {vibe_keywords} hidden gem"
         
         # 3. Fetch broad results
-        raw_results = await self.exa.search(
+        raw_results = await self._search_exa(
             query=broad_query,
             num_results=self.settings.rerank_pool_size,
             use_autoprompt=True
@@ -475,7 +637,7 @@ class OrthogonalSearcher:
             top_k=num_results
         )
         
-        print(f"   ✨ Bridge reranked {len(raw_results)} -> {len(reranked)} results")
+        logger.debug("   ✨ Bridge reranked %d -> %d results", len(raw_results), len(reranked))
         
         return OrthogonalResult(
             items=reranked,
@@ -489,13 +651,28 @@ class OrthogonalSearcher:
     # COMBINED STRATEGIES
     # =========================================================================
     
+    @staticmethod
+    def _result_key(
+        kind: str,
+        context: str,
+        original_query: str,
+        user_memories: Optional[list[Memory]],
+        *params
+    ) -> tuple:
+        """Cache key for a strategy fan-out: digests of the context and memory ids, plus the call parameters."""
+        context_digest = hashlib.blake2b(context.encode(), digest_size=16).digest()
+        memory_ids = ",".join(sorted(m.id for m in user_memories or ()))
+        memory_digest = hashlib.blake2b(memory_ids.encode(), digest_size=16).digest()
+        return (kind, context_digest, memory_digest, original_query, *params)
+    
     async def search_all_strategies(
         self, 
         context: str,
         original_query: str,
         num_results_per_strategy: int = 2,
         include_vector_math: bool = False,
-        user_memories: list[Memory] = None
+        user_memories: list[Memory] = None,
+        refresh: bool = False
     ) -> list[OrthogonalResult]:
         """
         Run all orthogonal search strategies in parallel.
@@ -512,32 +689,174 @@ class OrthogonalSearcher:
             num_results_per_strategy: Results per strategy
             include_vector_math: Whether to include vector math strategies
             user_memories: User's memories (required for vector math strategies)
+            refresh: Recompute even if a recent identical fan-out is cached
             
         Returns:
             List of OrthogonalResults from each strategy
         """
-        # First, extract the vibe (shared across strategies)
-        vibe = await self.synthesizer.extract_vibe(context)
+        cache_key = self._result_key(
+            "all", context, original_query, user_memories,
+            num_results_per_strategy, include_vector_math
+        )
         
-        # Build list of tasks
-        tasks = [
-            self.search_with_noise(
-                original_query, 
-                num_results=num_results_per_strategy
-            ),
-            self.search_via_archetype(
+        async def run() -> list[OrthogonalResult]:
+            tasks = await self.start_all_strategies(
                 context,
-                vibe=vibe,
-                num_results=num_results_per_strategy
-            ),
-            self.search_cross_domain(
-                vibe,
-                num_results=num_results_per_strategy
+                original_query,
+                num_results_per_strategy=num_results_per_strategy,
+                include_vector_math=include_vector_math,
+                user_memories=user_memories
+            )
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            
+            # Filter out any failed strategies
+            valid_results = []
+            for r in results:
+                if isinstance(r, OrthogonalResult):
+                    valid_results.append(r)
+                else:
+                    logger.warning("   ⚠️ Strategy failed: %s", r)
+            return valid_results
+        
+        return await self._shared_fanout(cache_key, run, refresh)
+    
+    async def _shared_fanout(self, key: tuple, run, refresh: bool = False) -> list[OrthogonalResult]:
+        """
+        Result of the strategy fan-out run(), shared between identical calls.
+        
+        A recent result for key is reused unless refresh is set; otherwise
+        concurrent identical calls all await one run, whose non-empty result
+        is cached when it completes.
+        """
+        if not refresh:
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                return list(cached)
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.create_task(run())
+            
+            def finish(done: asyncio.Task):
+                self._inflight.pop(key, None)
+                if not done.cancelled() and done.exception() is None and done.result():
+                    self._result_cache.set(key, tuple(done.result()))
+            
+            task.add_done_callback(finish)
+        
+        # Shielded: a caller that gives up doesn't cancel the run for the others
+        return list(await asyncio.shield(task))
+    
+    async def iter_strategies(
+        self,
+        context: str,
+        original_query: str,
+        num_results_per_strategy: int = 2,
+        include_vector_math: bool = False,
+        user_memories: list[Memory] = None,
+        timeout: float = None
+    ) -> AsyncIterator[OrthogonalResult]:
+        """
+        Streaming form of search_all_strategies: yield each strategy's result
+        as soon as it finishes.
+        
+        Failed strategies are skipped. Closing the generator early (or hitting
+        the timeout, a soft deadline in seconds) cancels the strategies still
+        running.
+        """
+        tasks = await self.start_all_strategies(
+            context,
+            original_query,
+            num_results_per_strategy=num_results_per_strategy,
+            include_vector_math=include_vector_math,
+            user_memories=user_memories
+        )
+        
+        try:
+            for next_done in asyncio.as_completed(tasks, timeout=timeout):
+                try:
+                    result = await next_done
+                except asyncio.TimeoutError:
+                    logger.info("   ⏱️ Orthogonal strategies past %ss deadline, using what finished", timeout)
+                    return
+                except Exception as e:
+                    logger.warning("   ⚠️ Strategy failed: %s", e)
+                    continue
+                
+                yield result
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def start_all_strategies(
+        self, 
+        context: str,
+        original_query: str,
+        num_results_per_strategy: int = 2,
+        include_vector_math: bool = False,
+        user_memories: list[Memory] = None
+    ) -> list[asyncio.Task]:
+        """
+        Extract the vibe, then launch every strategy as its own task (noise
+        injection, which doesn't use the vibe, starts right away).
+        
+        Same arguments as search_all_strategies. Callers consume the tasks as
+        they complete (e.g. with asyncio.as_completed) and are responsible for
+        cancelling any they stop waiting on.
+        
+        Returns:
+            One task per strategy, each resolving to an OrthogonalResult
+        """
+        # Noise injection doesn't need the vibe: start it while the vibe is extracted
+        noise_task = asyncio.create_task(
+            self.search_with_noise(original_query, num_results=num_results_per_strategy)
+        )
+        
+        run_vector_math = (
+            include_vector_math
+            and user_memories
+            and len(user_memories) >= self.settings.pca_min_memories
+        )
+        
+        # Extract the vibe (shared across strategies); embed the vector math
+        # inputs meanwhile (embeddings are cached)
+        try:
+            async with self._llm_sem:
+                vibe, _ = await asyncio.gather(
+                    self.synthesizer.extract_vibe(context),
+                    self.vector_math.prefetch_embeddings(
+                        memories=user_memories,
+                        texts=[context[:4000]]
+                    ) if run_vector_math else asyncio.sleep(0)
+                )
+        except BaseException:
+            noise_task.cancel()
+            raise
+        
+        # Build list of tasks
+        tasks = []
+        
+        # The vibe strategies return nothing without an archetype / interests
+        # (e.g. extraction failed), so only schedule the ones that can search
+        if vibe.archetype:
+            tasks.append(
+                self.search_via_archetype(
+                    context,
+                    vibe=vibe,
+                    num_results=num_results_per_strategy
+                )
+            )
+        if vibe.cross_domain_interests:
+            tasks.append(
+                self.search_cross_domain(
+                    vibe,
+                    num_results=num_results_per_strategy
+                )
             )
-        ]
         
         # Add vector math strategies if requested and we have memories
-        if include_vector_math and user_memories and len(user_memories) >= self.settings.pca_min_memories:
+        if run_vector_math:
             tasks.append(
                 self.search_principal_component(
                     user_memories,
@@ -555,10 +874,13 @@ class OrthogonalSearcher:
             )
             # Pick a random target domain for bridge search
             source_domain = vibe.source_domain or "content"
-            target_domain = random.choice([d for d in self.settings.bridge_domains if d != source_domain])
+            target_domain = self._pick_domain(
+                [d for d in self.settings.bridge_domains if d != source_domain],
+                f"{source_domain}|{context[:2000]}"
+            )
             tasks.append(
                 self.search_bridge_vector(
-                    context[:2000],
+                    truncate_tokens(context, self.settings.bridge_content_max_tokens),
                     source_domain,
                     target_domain,
                     vibe=vibe,
@@ -566,23 +888,14 @@ class OrthogonalSearcher:
                 )
             )
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Filter out any failed strategies
-        valid_results = []
-        for r in results:
-            if isinstance(r, OrthogonalResult):
-                valid_results.append(r)
-            else:
-                print(f"   ⚠️ Strategy failed: {r}")
-        
-        return valid_results
+        return [noise_task] + [asyncio.create_task(task) for task in tasks]
     
     async def search_vector_math_only(
         self,
         context: str,
         user_memories: list[Memory],
-        num_results_per_strategy: int = 3
+        num_results_per_strategy: int = 3,
+        refresh: bool = False
     ) -> list[OrthogonalResult]:
         """
         Run ONLY the vector math strategies (PCA, antonym, bridge).
@@ -594,104 +907,185 @@ class OrthogonalSearcher:
             context: User's screen context
             user_memories: User's saved memories from Supermemory
             num_results_per_strategy: Results per strategy
+            refresh: Recompute even if a recent identical fan-out is cached
             
         Returns:
             List of OrthogonalResults from vector math strategies
         """
-        # Extract vibe for context
-        vibe = await self.synthesizer.extract_vibe(context)
-        
-        tasks = []
+        cache_key = self._result_key("vector_math", context, "", user_memories, num_results_per_strategy)
         
-        # PCA - requires minimum memories
-        if len(user_memories) >= self.settings.pca_min_memories:
+        async def run() -> list[OrthogonalResult]:
+            # Extract vibe for context
+            async with self._llm_sem:
+                vibe = await self.synthesizer.extract_vibe(context)
+            
+            tasks = []
+            
+            # PCA - requires minimum memories
+            if len(user_memories) >= self.settings.pca_min_memories:
+                tasks.append(
+                    self.search_principal_component(
+                        user_memories,
+                        vibe=vibe,
+                        num_results=num_results_per_strategy
+                    )
+                )
+            
+            # Antonym steering
             tasks.append(
-                self.search_principal_component(
+                self.search_antonym_steering(
+                    context,
                     user_memories,
                     vibe=vibe,
                     num_results=num_results_per_strategy
                 )
             )
-        
-        # Antonym steering
-        tasks.append(
-            self.search_antonym_steering(
-                context,
-                user_memories,
-                vibe=vibe,
-                num_results=num_results_per_strategy
-            )
-        )
-        
-        # Bridge vector - pick a target domain
-        source_domain = vibe.source_domain or "content"
-        available_domains = [d for d in self.settings.bridge_domains if d != source_domain]
-        if available_domains:
-            target_domain = random.choice(available_domains)
-            tasks.append(
-                self.search_bridge_vector(
-                    context[:2000],
-                    source_domain,
-                    target_domain,
-                    vibe=vibe,
-                    num_results=num_results_per_strategy
+            
+            # Bridge vector - pick a target domain
+            source_domain = vibe.source_domain or "content"
+            available_domains = [d for d in self.settings.bridge_domains if d != source_domain]
+            if available_domains:
+                target_domain = self._pick_domain(available_domains, f"{source_domain}|{context[:2000]}")
+                tasks.append(
+                    self.search_bridge_vector(
+                        truncate_tokens(context, self.settings.bridge_content_max_tokens),
+                        source_domain,
+                        target_domain,
+                        vibe=vibe,
+                        num_results=num_results_per_strategy
+                    )
                 )
-            )
-        
-        if not tasks:
-            return []
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Filter out failed strategies
-        valid_results = []
-        for r in results:
-            if isinstance(r, OrthogonalResult):
-                valid_results.append(r)
-            else:
-                print(f"   ⚠️ Vector math strategy failed: {r}")
+            
+            if not tasks:
+                return []
+            
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            
+            # Filter out failed strategies
+            valid_results = []
+            for r in results:
+                if isinstance(r, OrthogonalResult):
+                    valid_results.append(r)
+                else:
+                    logger.warning("   ⚠️ Vector math strategy failed: %s", r)
+            
+            return valid_results
         
-        return valid_results
+        return await self._shared_fanout(cache_key, run, refresh)
     
-    async def _generate_noisy_query(self, query: str, noise_scale: float) -> str:
+    async def _generate_noisy_queries(self, query: str, noise_scale: float) -> tuple[str, ...]:
         """
-        Generate a semantically "noisy" variant of the query.
+        Generate semantically "noisy" variants of the query.
         
-        Since we can't directly manipulate Exa's embeddings, we use an LLM
-        to generate a query that is semantically adjacent but slightly different.
+        The query is extended with the vocabulary terms nearest to its
+        antithetic Gaussian perturbations (q ± ε, one variant each); if
+        embeddings are unavailable, an LLM generates a single semantically
+        adjacent but slightly different query.
         
         The noise_scale controls how far we deviate:
         - 0.1: Very close (same topic, different angle)
         - 0.2: Moderate (related concept, different framing)
         - 0.3: Far (tangentially related, unexpected connection)
+        
+        Variants are memoized per (normalized query, noise scale to 2 places).
         """
-        # Map noise scale to a qualitative deviation level
-        if noise_scale < 0.15:
-            deviation = "slightly rephrase with a different angle, keeping the core topic"
-        elif noise_scale < 0.25:
-            deviation = "shift to a related but distinct concept that shares underlying principles"
-        else:
-            deviation = "make an unexpected lateral leap to a tangentially connected idea"
+        key = self._noise_key(query, noise_scale)
+        
+        future = self._noisy_queries.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._request_noisy_queries(query, noise_scale, key))
+            self._noisy_queries.set(key, future)
+            future.add_done_callback(lambda done: self._forget_failed_noisy_query(key, done))
+        
+        # Shielded: a cancelled caller must not cancel the call others are awaiting
+        return await asyncio.shield(future)
+    
+    def _forget_failed_noisy_query(self, key: tuple[str, float], future: asyncio.Future):
+        """Drop a cancelled or failed generation so the next request retries."""
+        if future.cancelled() or future.exception() is not None:
+            if self._noisy_queries.get(key) is future:
+                self._noisy_queries.pop(key)
+    
+    @staticmethod
+    def _noise_key(query: str, noise_scale: float) -> tuple[str, float]:
+        """Memo key for a noisy query variant."""
+        return query.lower().strip(), round(noise_scale, 2)
+    
+    @staticmethod
+    def _noise_tier(noise_scale: float) -> int:
+        """Map noise scale to a qualitative deviation level (index into _NOISE_DEVIATIONS / _NOISE_SYSTEM_PROMPTS)."""
+        return 0 if noise_scale < 0.15 else 1 if noise_scale < 0.25 else 2
+    
+    async def _request_noisy_queries(
+        self,
+        query: str,
+        noise_scale: float,
+        key: tuple[str, float]
+    ) -> tuple[str, ...]:
+        """Noise injection behind _generate_noisy_queries; failures are not memoized."""
+        term_sets = await self.vector_math.perturbed_terms(
+            query,
+            noise_scale,
+            k=self.settings.orthogonal_noise_terms,
+            rng=self._rng,
+            antithetic=True
+        )
+        variants = tuple(dict.fromkeys(f"{query} {' '.join(terms)}" for terms in term_sets if terms))
+        if variants:
+            return variants
         
-        system_prompt = f"""Modify this search query to land in a RELATED but DIFFERENT semantic cluster. {deviation}. Return ONLY 5-15 searchable words, no explanation."""
+        # Embeddings unavailable: ask the LLM for an adjacent phrasing
+        system_prompt = _NOISE_SYSTEM_PROMPTS[self._noise_tier(noise_scale)]
 
         try:
-            response = await self.synthesizer.client.chat.completions.create(
-                model=self.synthesizer.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Original query: {query}"}
-                ],
-                temperature=0.8 + (noise_scale * 0.5),  # Higher temp for more noise
-                max_tokens=30
-            )
+            async with self._llm_sem:
+                response = await self.synthesizer.client.chat.completions.create(
+                    model=self.settings.noise_query_model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": f"Original query: {query}"}
+                    ],
+                    temperature=0.8 + (noise_scale * 0.5),  # Higher temp for more noise
+                    max_tokens=30,
+                    stop=["\n"]  # One line of words; cut any trailing explanation
+                )
             
-            return response.choices[0].message.content.strip().strip('"')
+            return (response.choices[0].message.content.strip().strip('"'),)
             
         except Exception as e:
-            print(f"Noisy query generation error: {e}")
+            logger.warning("Noisy query generation error: %s", e)
+            self._noisy_queries.pop(key)
             # Fallback: just return original query
-            return query
+            return (query,)
+    
+    async def combine_results_streaming(
+        self,
+        results: AsyncIterator[OrthogonalResult],
+        max_total: int = 6,
+        min_items: int = None
+    ) -> tuple[list[SearchResult], dict]:
+        """
+        combine_results over a stream of strategy results (e.g. iter_strategies).
+        
+        Stops pulling once min_items candidates (default max_total) have
+        arrived and closes the stream, cancelling the slower strategies.
+        
+        Returns:
+            Tuple of (combined results, metadata about sources)
+        """
+        min_items = min_items or max_total
+        collected = []
+        num_items = 0
+        try:
+            async for result in results:
+                collected.append(result)
+                num_items += len(result.items)
+                if num_items >= min_items:
+                    break
+        finally:
+            await results.aclose()
+        
+        return self.combine_results(collected, max_total=max_total)
     
     def combine_results(
         self, 
@@ -706,37 +1100,26 @@ class OrthogonalSearcher:
         Returns:
             Tuple of (combined results, metadata about sources)
         """
-        combined = []
         metadata = {
-            "strategies_used": [],
-            "queries_used": [],
-            "vibe_profiles": []
+            "strategies_used": [result.strategy for result in orthogonal_results],
+            "queries_used": [result.query_used for result in orthogonal_results],
+            "vibe_profiles": [
+                {
+                    "emotional_signatures": vibe.emotional_signatures,
+                    "archetype": (vibe.archetype or "")[:100],
+                    "source_domain": vibe.source_domain
+                }
+                for vibe in (result.vibe_profile for result in orthogonal_results)
+                if vibe
+            ]
         }
         
-        # Interleave results from each strategy
-        max_per_strategy = (max_total // len(orthogonal_results)) + 1 if orthogonal_results else 0
-        
-        for result in orthogonal_results:
-            metadata["strategies_used"].append(result.strategy)
-            metadata["queries_used"].append(result.query_used)
-            if result.vibe_profile:
-                metadata["vibe_profiles"].append({
-                    "emotional_signatures": result.vibe_profile.emotional_signatures,
-                    "archetype": result.vibe_profile.archetype[:100] if result.vibe_profile.archetype else "",
-                    "source_domain": result.vibe_profile.source_domain
-                })
-        
-        # Round-robin interleaving
-        indices = [0] * len(orthogonal_results)
-        while len(combined) < max_total:
-            added_any = False
-            for i, result in enumerate(orthogonal_results):
-                if indices[i] < len(result.items) and len(combined) < max_total:
-                    combined.append(result.items[indices[i]])
-                    indices[i] += 1
-                    added_any = True
-            if not added_any:
-                break
+        # Round-robin interleaving: one row per rank, padded where a strategy runs out
+        rows = zip_longest(*(result.items for result in orthogonal_results), fillvalue=_EXHAUSTED)
+        combined = list(islice(
+            (item for item in chain.from_iterable(rows) if item is not _EXHAUSTED),
+            max_total
+        ))
         
         return combined, metadata
 
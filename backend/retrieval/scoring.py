@@ -1,8 +1,12 @@
-import math
-from datetime import datetime, timezone
-from typing import Union
+import hashlib
+import time
+from typing import Hashable, Optional, Sequence, Union
+
+import numpy as np
 
 from models import Memory, SearchResult
+from cache import TTLCache
+from retrieval.scoring_kernels import doughnut_scores, temporal_boost, web_position_similarity
 
 
 class RetrievalScorer:
@@ -17,6 +21,10 @@ class RetrievalScorer:
     Temporal Novelty:
     - Older memories get boosted (forgotten = more valuable to resurface)
     - Score_final = Score_vector × (1 + log(DaysSinceLastRead))
+    
+    Score Cache:
+    - When filter_and_rank is given the query, per-candidate scores are cached
+      by (query hash, candidate key) so repeated queries skip rescoring.
     """
     
     def __init__(
@@ -24,58 +32,88 @@ class RetrievalScorer:
         min_similarity: float = 0.65,
         max_similarity: float = 0.85,
         echo_penalty: float = 0.5,
-        sweet_spot_bonus: float = 1.2
+        sweet_spot_bonus: float = 1.2,
+        cache_size: int = 50_000,
+        cache_ttl: float = 900.0
     ):
         self.min_similarity = min_similarity
         self.max_similarity = max_similarity
         self.echo_penalty = echo_penalty
         self.sweet_spot_bonus = sweet_spot_bonus
+        self._score_cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
     
     def apply_mmr_scoring(
         self, 
-        items: list[Union[Memory, SearchResult]]
+        items: list[Union[Memory, SearchResult]],
+        positions: Optional[Sequence[int]] = None
     ) -> list[tuple[Union[Memory, SearchResult], float, float, float]]:
         """
         Apply MMR Doughnut scoring to a list of items.
         
+        Args:
+            items: Memories and/or web results to score
+            positions: Original list position of each item (defaults to its
+                index); web results are scored by position.
+        
         Returns list of tuples: (item, final_score, relevance_score, novelty_score)
         """
-        scored_items = []
+        if not items:
+            return []
         
-        for i, item in enumerate(items):
-            # Get similarity score
-            if isinstance(item, Memory):
-                sim = item.similarity
-            else:
-                # For web results, use position-based scoring
-                # First result is most relevant, decrease from there
-                # Put them in the "sweet spot" range (0.65-0.85)
-                sim = 0.85 - (i * 0.05)  # 0.85, 0.80, 0.75, 0.70, 0.65
-                sim = max(0.65, sim)
-            
-            # Apply doughnut scoring
-            if sim > self.max_similarity:
-                # Echo chamber - penalize heavily
-                relevance_score = sim * self.echo_penalty
-                novelty_score = 0.2  # Low novelty
-            elif self.min_similarity <= sim <= self.max_similarity:
-                # Sweet spot - bonus
-                relevance_score = sim * self.sweet_spot_bonus
-                # Novelty is inverse of similarity in sweet spot
-                novelty_score = 1.0 - (sim - self.min_similarity) / (self.max_similarity - self.min_similarity)
-                novelty_score = max(0.5, min(1.0, novelty_score))  # Clamp between 0.5-1.0
-            else:
-                # Too distant - still include but lower score
-                relevance_score = sim * 0.8
-                novelty_score = 0.8  # High novelty since it's distant
-            
-            # Normalize relevance to 0-1 range
-            relevance_score = min(1.0, relevance_score)
-            
-            # Always include web results (don't filter by zero score)
-            scored_items.append((item, relevance_score, relevance_score, novelty_score))
-        
-        return scored_items
+        relevance, novelty = self._mmr_arrays(items, positions)
+        
+        # Always include web results (don't filter by zero score)
+        return [
+            (item, rel, rel, nov)
+            for item, rel, nov in zip(items, relevance.tolist(), novelty.tolist())
+        ]
+    
+    @staticmethod
+    def _memory_indices(items: Sequence[Union[Memory, SearchResult]]) -> np.ndarray:
+        """Indices of the memories among items (everything else is a web result)."""
+        return np.fromiter(
+            (i for i, item in enumerate(items) if isinstance(item, Memory)),
+            dtype=np.int64
+        )
+    
+    def _mmr_arrays(
+        self,
+        items: Sequence[Union[Memory, SearchResult]],
+        positions: Optional[Sequence[int]] = None,
+        memory_idx: Optional[np.ndarray] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (relevance, novelty) arrays for non-empty items (see apply_mmr_scoring).
+        
+        memory_idx is _memory_indices(items), when the caller already has it.
+        """
+        if memory_idx is None:
+            memory_idx = self._memory_indices(items)
+        
+        # Gather similarities into one array so scoring runs as a single kernel:
+        # memories and web results are filled in separately by index.
+        # Web results use position-based scoring (0.85, 0.80, ... floored at 0.65)
+        # which keeps them in the "sweet spot" range.
+        n = len(items)
+        sims = np.empty(n)
+        sims[memory_idx] = np.fromiter(
+            (items[i].similarity for i in memory_idx.tolist()),
+            dtype=np.float64, count=len(memory_idx)
+        )
+        if len(memory_idx) < n:
+            is_web = np.ones(n, dtype=bool)
+            is_web[memory_idx] = False
+            web_idx = np.flatnonzero(is_web)
+            web_positions = web_idx if positions is None else np.fromiter(positions, dtype=np.int64, count=n)[web_idx]
+            sims[web_idx] = web_position_similarity(web_positions)
+        
+        return doughnut_scores(
+            sims,
+            self.min_similarity,
+            self.max_similarity,
+            self.echo_penalty,
+            self.sweet_spot_bonus
+        )
     
     def apply_temporal_boost(
         self, 
@@ -88,45 +126,152 @@ class RetrievalScorer:
         
         Returns items with boosted scores.
         """
-        now = datetime.now(timezone.utc)
-        boosted_items = []
-        
-        for item, score, relevance, novelty in scored_items:
-            if isinstance(item, Memory) and item.last_accessed:
-                days_since = (now - item.last_accessed).days
-                temporal_multiplier = 1 + math.log(max(days_since, 1))
-                
-                # Boost the novelty score based on age
-                boosted_novelty = min(1.0, novelty * (1 + math.log(max(days_since, 1)) / 10))
-                
-                # Combined score
-                boosted_score = score * temporal_multiplier
-                boosted_items.append((item, boosted_score, relevance, boosted_novelty))
-            else:
-                # Web results don't get temporal boost
-                boosted_items.append((item, score, relevance, novelty))
+        if not scored_items:
+            return []
         
-        return boosted_items
+        n = len(scored_items)
+        items = [item for item, _, _, _ in scored_items]
+        scores = np.fromiter((score for _, score, _, _ in scored_items), dtype=np.float64, count=n)
+        novelty = np.fromiter((nov for _, _, _, nov in scored_items), dtype=np.float64, count=n)
+        
+        boosted_scores, boosted_novelty = self._boost_arrays(items, scores, novelty)
+        
+        return [
+            (item, score, relevance, nov)
+            for (item, _, relevance, _), score, nov in zip(scored_items, boosted_scores.tolist(), boosted_novelty.tolist())
+        ]
+    
+    @classmethod
+    def _boost_arrays(
+        cls,
+        items: Sequence[Union[Memory, SearchResult]],
+        scores: np.ndarray,
+        novelty: np.ndarray,
+        memory_idx: Optional[np.ndarray] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Temporally boosted (scores, novelty) arrays (see apply_temporal_boost).
+        
+        memory_idx is _memory_indices(items), when the caller already has it.
+        """
+        if memory_idx is None:
+            memory_idx = cls._memory_indices(items)
+        now_ts = time.time()
+        n = len(items)
+        
+        # Web results (and memories never read) don't get temporal boost
+        dated = memory_idx[np.fromiter(
+            (items[i].last_accessed is not None for i in memory_idx.tolist()),
+            dtype=bool, count=len(memory_idx)
+        )]
+        if not len(dated):
+            return scores, novelty
+        has_date = np.zeros(n, dtype=bool)
+        has_date[dated] = True
+        
+        # Whole days since last access for the dated memories only, from epoch
+        # seconds (no timedelta per item)
+        last_accessed_ts = np.fromiter(
+            (items[i].last_accessed.timestamp() for i in dated.tolist()),
+            dtype=np.float64, count=len(dated)
+        )
+        days_since = np.zeros(n)
+        days_since[dated] = np.floor((now_ts - last_accessed_ts) / 86400.0)
+        
+        return temporal_boost(scores, novelty, days_since, has_date)
     
     def filter_and_rank(
         self,
         items: list[Union[Memory, SearchResult]],
-        max_results: int = 3
+        max_results: int = 3,
+        query: Optional[str] = None
     ) -> list[tuple[Union[Memory, SearchResult], float, float, float]]:
         """
         Full scoring pipeline: MMR + temporal boost + ranking.
         
+        Scores stay in arrays until the top results are chosen; tuples are
+        only built for those.
+        
+        Args:
+            items: Candidates to score
+            max_results: Number of results to return
+            query: Query the candidates were retrieved for. When given,
+                per-candidate scores are served from / stored in the score cache.
+        
         Returns top results sorted by score.
         """
-        # Apply MMR scoring
-        scored = self.apply_mmr_scoring(items)
+        if not items or max_results <= 0:
+            return []
         
-        # Apply temporal boost for memories
-        boosted = self.apply_temporal_boost(scored)
+        if query is None:
+            scores, relevance, novelty = self._score_arrays(items)
+        else:
+            scores, relevance, novelty = self._score_cached(items, query)
         
-        # Filter out zero scores and sort by final score
-        valid_items = [(item, score, rel, nov) for item, score, rel, nov in boosted if score > 0]
-        sorted_items = sorted(valid_items, key=lambda x: x[1], reverse=True)
+        top = self._top_indices(scores, max_results)
+        return [
+            (items[i], score, rel, nov)
+            for i, score, rel, nov in zip(
+                top.tolist(), scores[top].tolist(), relevance[top].tolist(), novelty[top].tolist()
+            )
+        ]
+    
+    @staticmethod
+    def _top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Indices of the k highest positive scores, best first.
         
-        return sorted_items[:max_results]
-
+        Ties keep input order (same as a stable descending sort).
+        """
+        positive = np.flatnonzero(scores > 0)
+        if len(positive) > k:
+            # Everything scoring at least the k-th largest value (ties included)
+            kth = np.partition(scores[positive], len(positive) - k)[len(positive) - k]
+            positive = positive[scores[positive] >= kth]
+        order = np.argsort(-scores[positive], kind="stable")
+        return positive[order[:k]]
+    
+    def _score_arrays(
+        self,
+        items: Sequence[Union[Memory, SearchResult]],
+        positions: Optional[Sequence[int]] = None
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(final score, relevance, novelty) arrays: MMR scoring followed by temporal boost."""
+        # Split memories from web results once for both passes
+        memory_idx = self._memory_indices(items)
+        relevance, novelty = self._mmr_arrays(items, positions, memory_idx)
+        scores, novelty = self._boost_arrays(items, relevance, novelty, memory_idx)
+        return scores, relevance, novelty
+    
+    def _score_cached(
+        self,
+        items: list[Union[Memory, SearchResult]],
+        query: str
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Score arrays for items, reusing cached (score, relevance, novelty) per candidate."""
+        query_hash = hashlib.blake2b(query.encode(), digest_size=8).digest()
+        keys = [(query_hash, self._candidate_key(item, i)) for i, item in enumerate(items)]
+        
+        scored = np.empty((3, len(items)))
+        misses = []
+        for i, key in enumerate(keys):
+            hit = self._score_cache.get(key)
+            if hit is None:
+                misses.append(i)
+            else:
+                scored[:, i] = hit
+        
+        if misses:
+            fresh = np.stack(self._score_arrays([items[i] for i in misses], positions=misses))
+            scored[:, misses] = fresh
+            for i, entry in zip(misses, fresh.T.tolist()):
+                self._score_cache.set(keys[i], tuple(entry))
+        
+        return scored[0], scored[1], scored[2]
+    
+    @staticmethod
+    def _candidate_key(item: Union[Memory, SearchResult], position: int) -> Hashable:
+        """Stable cache key for a candidate (web results are scored by position)."""
+        if isinstance(item, Memory):
+            return item.id
+        return (item.url, position)
@@ -1,10 +1,57 @@
-from typing import Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, partial
+from typing import Any, Callable, Iterable, Iterator, Optional
 from datetime import datetime
 
+import httpx
+
 from models import Memory
+from cache import TTLCache
 from config import get_settings
 
 
+# Worker threads for the blocking SDK calls (one in-flight Supermemory request each)
+SDK_MAX_WORKERS = 16
+
+# Relationship types get_related follows by default
+DEFAULT_RELATIONSHIP_TYPES = frozenset({"derives", "extends", "updates"})
+
+# Per-request memo for search_cached: query -> (limit fetched, task resolving to results)
+_request_searches: ContextVar[Optional[dict]] = ContextVar("supermemory_request_searches", default=None)
+
+
+class SupermemoryUnavailable(Exception):
+    """A Supermemory search failed (as opposed to finding nothing)."""
+
+
+def _dict_field(obj: dict, key: str, default=None):
+    """Field accessor for dict-shaped SDK results."""
+    return obj.get(key, default)
+
+
+def _attr_field(obj, key: str, default=None):
+    """Field accessor for object-shaped SDK results."""
+    return getattr(obj, key, default)
+
+
+@contextmanager
+def supermemory_request_scope() -> Iterator[None]:
+    """
+    Share search_cached results for the duration of one request.
+    
+    Every search_cached call for the same query inside the scope makes at
+    most one Supermemory call (the widest limit requested so far wins).
+    """
+    token = _request_searches.set({})
+    try:
+        yield
+    finally:
+        _request_searches.reset(token)
+
+
 class SupermemoryClient:
     """
     Client for interacting with Supermemory API using official SDK.
@@ -16,16 +63,30 @@ class SupermemoryClient:
     Also supports User Profiles which combine static facts + dynamic context.
     """
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.Client] = None):
+        """
+        Args:
+            http_client: Optional httpx connection pool for the SDK to reuse
+                instead of opening its own; closed by close().
+        """
         settings = get_settings()
+        self.http_client = http_client
         self.api_key = settings.supermemory_api_key
         self.client = None
+        # The SDK is synchronous: its calls run here so they don't block the event loop
+        self._executor = ThreadPoolExecutor(max_workers=SDK_MAX_WORKERS, thread_name_prefix="supermemory")
+        # Recent search results by normalized inputs (failed searches are not
+        # cached; cleared by add_memory, since new memories change results)
+        self._search_cache = TTLCache(maxsize=1000, ttl=settings.supermemory_cache_ttl)
         
         # Only initialize if API key is configured
         if self.api_key and self.api_key != "your-supermemory-api-key":
             try:
                 from supermemory import Supermemory
-                self.client = Supermemory(api_key=self.api_key)
+                if http_client is not None:
+                    self.client = Supermemory(api_key=self.api_key, http_client=http_client)
+                else:
+                    self.client = Supermemory(api_key=self.api_key)
                 print("   ✓ Supermemory client initialized")
             except ImportError:
                 print("   ⚠️ Supermemory SDK not installed. Run: pip install supermemory")
@@ -34,6 +95,34 @@ class SupermemoryClient:
         else:
             print("   ⚠️ Supermemory API key not configured")
     
+    async def _call(self, fn, *args, **kwargs):
+        """Run a blocking SDK call on the client's thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+    
+    @staticmethod
+    def _search_key(kind: str, query: str, *params) -> tuple:
+        """Result cache key: case- and whitespace-insensitive query plus the call's options."""
+        return (kind, " ".join(query.lower().split()), *params)
+    
+    def _cached_search(self, key: tuple) -> Optional[list[Memory]]:
+        """Copies of cached results for key (so callers can't mutate the cache), or None."""
+        cached = self._search_cache.get(key)
+        if cached is None:
+            return None
+        return [memory.model_copy() for memory in cached]
+    
+    @staticmethod
+    def _field_getter(sample) -> Callable[[Any, str, Any], Any]:
+        """
+        Field accessor for SDK results shaped like sample.
+        
+        The shape (dict vs object) is the same across a list of results, so
+        loops pick the accessor once instead of probing per field with
+        _get_attr.
+        """
+        return _dict_field if isinstance(sample, dict) else _attr_field
+    
     def _get_attr(self, obj, key: str, default=None):
         """
         Helper to get attribute from object or dict.
@@ -59,7 +148,9 @@ class SupermemoryClient:
         limit: int = 5, 
         container_tag: str = None,
         threshold: float = 0.5,
-        include_related: bool = True
+        include_related: bool = True,
+        rerank: bool = True,
+        raise_on_error: bool = False
     ) -> list[Memory]:
         """
         Search memories using Supermemory's v4 memories search.
@@ -76,17 +167,27 @@ class SupermemoryClient:
             container_tag: Filter by container tag (user ID, project, etc.)
             threshold: Similarity threshold (0-1), lower = more results
             include_related: Whether to include parent/child memories
+            rerank: Have the server rerank the results; skip it for candidate
+                pools that are filtered or rescored locally, and for empty queries
+            raise_on_error: Raise SupermemoryUnavailable if the search fails,
+                instead of returning [] (lets callers avoid caching an outage
+                as "no memories")
         """
         if not self.client:
             return []
         
+        cache_key = self._search_key("memories", query, limit, container_tag, threshold, include_related, rerank)
+        cached = self._cached_search(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # Use memories search (v4) for conversational/contextual search
             params = {
                 "q": query,
                 "limit": limit,
                 "threshold": threshold,
-                "rerank": True
+                "rerank": rerank
             }
             
             if container_tag:
@@ -99,60 +200,108 @@ class SupermemoryClient:
                     "documents": True
                 }
             
-            response = self.client.search.memories(**params)
+            response = await self._call(self.client.search.memories, **params)
+            
+            results = self._get_results(response)
+            get = self._field_getter(results[0]) if results else None
             
             memories = []
-            for item in self._get_results(response):
+            for item in results:
                 memory = Memory(
-                    id=self._get_attr(item, "id", ""),
-                    content=self._get_attr(item, "memory", ""),
-                    similarity=self._get_attr(item, "similarity", 0.0),
-                    created_at=self._parse_date(self._get_attr(item, "updatedAt")),
+                    id=get(item, "id", ""),
+                    content=get(item, "memory", ""),
+                    similarity=get(item, "similarity", 0.0),
+                    created_at=self._parse_date(get(item, "updatedAt")),
                     last_accessed=None,
                     source_document_id=None,
                     relationships=[]
                 )
                 
                 # Extract related memories from context (parents = what this extends/derives from)
-                context = self._get_attr(item, "context", {})
+                context = get(item, "context", {})
                 if context:
-                    parents = self._get_attr(context, "parents", [])
+                    context_get = self._field_getter(context)
+                    parents = context_get(context, "parents", [])
                     if parents:
+                        rel_get = self._field_getter(parents[0])
                         for parent in parents:
                             memory.relationships.append({
-                                "type": self._get_attr(parent, "relation", "extends"),
-                                "content": self._get_attr(parent, "memory", ""),
-                                "version": self._get_attr(parent, "version")
+                                "type": rel_get(parent, "relation", "extends"),
+                                "content": rel_get(parent, "memory", ""),
+                                "version": rel_get(parent, "version")
                             })
                     
                     # Also track children (what derives from this)
-                    children = self._get_attr(context, "children", [])
+                    children = context_get(context, "children", [])
                     if children:
+                        rel_get = self._field_getter(children[0])
                         for child in children:
                             memory.relationships.append({
-                                "type": f"child_{self._get_attr(child, 'relation', 'derives')}",
-                                "content": self._get_attr(child, "memory", ""),
-                                "version": self._get_attr(child, "version")
+                                "type": f"child_{rel_get(child, 'relation', 'derives')}",
+                                "content": rel_get(child, "memory", ""),
+                                "version": rel_get(child, "version")
                             })
                 
                 # Link to source documents if available
-                docs = self._get_attr(item, "documents", [])
-                if docs and len(docs) > 0:
+                docs = get(item, "documents", [])
+                if docs:
                     memory.source_document_id = self._get_attr(docs[0], "id")
                 
                 memories.append(memory)
             
             print(f"   Supermemory: Found {len(memories)} memories")
+            self._search_cache.set(cache_key, tuple(memory.model_copy() for memory in memories))
             return memories
             
         except Exception as e:
             print(f"   Supermemory search error: {e}")
+            if raise_on_error:
+                raise SupermemoryUnavailable(str(e)) from e
             return []
     
+    async def search_cached(self, query: str, max_limit: int = 5) -> list[Memory]:
+        """
+        search() with default options, shared across one request.
+        
+        Inside supermemory_request_scope(), concurrent and repeated calls for
+        the same query reuse one in-flight search; callers slice the result
+        to their own limit. A cancelled caller doesn't cancel the shared
+        search, and a search that failed or was cancelled is dropped so the
+        next call retries. Outside a scope this is a plain search().
+        
+        Raises SupermemoryUnavailable if the search fails.
+        
+        Args:
+            query: The search query
+            max_limit: Number of results this caller needs
+        """
+        searches = _request_searches.get()
+        if searches is None:
+            return await self.search(query, limit=max_limit, raise_on_error=True)
+        
+        entry = searches.get(query)
+        if entry is None or entry[0] < max_limit:
+            task = asyncio.ensure_future(self.search(query, limit=max_limit, raise_on_error=True))
+            entry = (max_limit, task)
+            searches[query] = entry
+            task.add_done_callback(lambda done: self._forget_failed_search(searches, query, done))
+        
+        # Shielded: a cancelled caller must not cancel the search others are awaiting
+        return list((await asyncio.shield(entry[1]))[:max_limit])
+    
+    @staticmethod
+    def _forget_failed_search(searches: dict, query: str, task: asyncio.Future):
+        """Drop a cancelled or failed shared search so the next search_cached retries."""
+        if task.cancelled() or task.exception() is not None:
+            entry = searches.get(query)
+            if entry is not None and entry[1] is task:
+                del searches[query]
+    
     async def get_related(
         self, 
         anchor_id: str, 
-        relationship_types: list[str] = None
+        relationship_types: Optional[Iterable[str]] = None,
+        anchor_content: str = None
     ) -> list[Memory]:
         """
         Get memories related to an anchor memory via graph relationships.
@@ -168,44 +317,101 @@ class SupermemoryClient:
         Args:
             anchor_id: ID of the anchor memory
             relationship_types: Filter by relationship types (e.g., ["derives", "extends"])
+            anchor_content: The anchor's content, if the caller already has it
+                (skips fetching the anchor)
+        
+        Raises SupermemoryUnavailable if the related-memory search fails.
         """
         if not self.client:
             return []
         
-        if relationship_types is None:
-            relationship_types = ["derives", "extends", "updates"]
+        # Set membership per relationship (a frozenset passes through as is)
+        relationship_types = (
+            DEFAULT_RELATIONSHIP_TYPES if relationship_types is None else frozenset(relationship_types)
+        )
         
         try:
-            # Get the anchor memory with its context
-            anchor = await self.get_memory(anchor_id)
-            if not anchor:
-                return []
+            # Get the anchor memory with its context (unless we already have it)
+            if anchor_content is None:
+                anchor = await self.get_memory(anchor_id)
+                if not anchor:
+                    return []
+                anchor_content = anchor.content
             
             # Search for memories related to this anchor's content
             # Using the anchor content as query to find graph-connected memories
             related = await self.search(
-                query=anchor.content[:500],  # Use first 500 chars as query
+                query=anchor_content[:500],  # Use first 500 chars as query
                 limit=10,
                 include_related=True,
-                threshold=0.3  # Lower threshold to find more connections
+                threshold=0.3,  # Lower threshold to find more connections
+                rerank=False,  # Candidates are filtered by relationship, not rank
+                raise_on_error=True
             )
             
-            # Filter to only include memories with matching relationship types
-            result = []
-            for mem in related:
-                # Check if this memory has any of the requested relationships
-                for rel in mem.relationships:
-                    rel_type = rel.get("type", "").replace("child_", "")
-                    if rel_type in relationship_types:
-                        result.append(mem)
-                        break
-            
-            return result
+            # Filter to only include memories with any of the requested relationships
+            return [
+                mem for mem in related
+                if any(
+                    rel.get("type", "").removeprefix("child_") in relationship_types
+                    for rel in mem.relationships
+                )
+            ]
             
+        except SupermemoryUnavailable:
+            raise
         except Exception as e:
             print(f"   Supermemory get_related error: {e}")
             return []
     
+    async def get_related_batch(
+        self,
+        ids: list[str],
+        relationship_types: Optional[Iterable[str]] = None,
+        anchor_contents: dict[str, str] = None
+    ) -> dict[str, list[Memory]]:
+        """
+        Get related memories for several anchors in one call.
+        
+        Supermemory has no batch relationship endpoint, so lookups are
+        issued concurrently (about two round trips for any number of
+        anchors); duplicate IDs are fetched once.
+        
+        Args:
+            ids: Anchor memory IDs
+            relationship_types: Filter by relationship types (see get_related)
+            anchor_contents: Known anchor contents by ID; those anchors skip
+                the per-anchor fetch, leaving one request each
+        
+        Returns:
+            Mapping of anchor ID to its related memories; anchors whose
+            lookup failed are left out, so one outage doesn't discard the rest
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        if not self.client or not unique_ids:
+            return {anchor_id: [] for anchor_id in unique_ids}
+        
+        anchor_contents = anchor_contents or {}
+        if relationship_types is not None:
+            relationship_types = frozenset(relationship_types)
+        results = await asyncio.gather(*(
+            self.get_related(
+                anchor_id,
+                relationship_types=relationship_types,
+                anchor_content=anchor_contents.get(anchor_id)
+            )
+            for anchor_id in unique_ids
+        ), return_exceptions=True)
+        
+        related_by_anchor = {}
+        for anchor_id, result in zip(unique_ids, results):
+            if isinstance(result, SupermemoryUnavailable):
+                continue  # Already reported by search()
+            if isinstance(result, BaseException):
+                raise result
+            related_by_anchor[anchor_id] = result
+        return related_by_anchor
+    
     async def get_profile(
         self, 
         container_tag: str, 
@@ -235,7 +441,7 @@ class SupermemoryClient:
             if query:
                 params["q"] = query
             
-            response = self.client.profile(**params)
+            response = await self._call(self.client.profile, **params)
             
             # Extract profile data
             profile_data = self._get_attr(response, "profile", {})
@@ -246,13 +452,14 @@ class SupermemoryClient:
             search_data = self._get_attr(response, "search_results", {})
             results = self._get_attr(search_data, "results", [])
             
+            get = self._field_getter(results[0]) if results else None
             memories = []
             for item in results:
                 memories.append(Memory(
-                    id=self._get_attr(item, "id", ""),
-                    content=self._get_attr(item, "content", ""),
-                    similarity=self._get_attr(item, "similarity", 0.0),
-                    created_at=self._parse_date(self._get_attr(item, "updatedAt")),
+                    id=get(item, "id", ""),
+                    content=get(item, "content", ""),
+                    similarity=get(item, "similarity", 0.0),
+                    created_at=self._parse_date(get(item, "updatedAt")),
                     last_accessed=None,
                     source_document_id=None,
                     relationships=[]
@@ -297,6 +504,13 @@ class SupermemoryClient:
         if not self.client:
             return []
         
+        cache_key = self._search_key(
+            "documents", query, limit, tuple(container_tags) if container_tags else (), rewrite_query
+        )
+        cached = self._cached_search(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             params = {
                 "q": query,
@@ -311,33 +525,39 @@ class SupermemoryClient:
             if container_tags:
                 params["container_tags"] = container_tags
             
-            response = self.client.search.documents(**params)
+            response = await self._call(self.client.search.documents, **params)
+            
+            results = self._get_results(response)
+            get = self._field_getter(results[0]) if results else None
             
             memories = []
-            for doc in self._get_results(response):
+            for doc in results:
                 # Combine chunks into content
-                chunks = self._get_attr(doc, "chunks", [])
+                chunks = get(doc, "chunks", [])
                 content_parts = []
-                for c in chunks:
-                    if self._get_attr(c, "isRelevant", True):
-                        chunk_content = self._get_attr(c, "content", "")
-                        if chunk_content:
-                            content_parts.append(chunk_content)
+                if chunks:
+                    chunk_get = self._field_getter(chunks[0])
+                    for c in chunks:
+                        if chunk_get(c, "isRelevant", True):
+                            chunk_content = chunk_get(c, "content", "")
+                            if chunk_content:
+                                content_parts.append(chunk_content)
                 
                 content = "\n\n".join(content_parts)
                 
                 memory = Memory(
-                    id=self._get_attr(doc, "documentId", ""),
-                    content=content or self._get_attr(doc, "title", ""),
-                    similarity=self._get_attr(doc, "score", 0.0),
-                    created_at=self._parse_date(self._get_attr(doc, "createdAt")),
-                    last_accessed=self._parse_date(self._get_attr(doc, "updatedAt")),
-                    source_document_id=self._get_attr(doc, "documentId"),
+                    id=get(doc, "documentId", ""),
+                    content=content or get(doc, "title", ""),
+                    similarity=get(doc, "score", 0.0),
+                    created_at=self._parse_date(get(doc, "createdAt")),
+                    last_accessed=self._parse_date(get(doc, "updatedAt")),
+                    source_document_id=get(doc, "documentId"),
                     relationships=[]
                 )
                 memories.append(memory)
             
             print(f"   Supermemory: Found {len(memories)} documents")
+            self._search_cache.set(cache_key, tuple(memory.model_copy() for memory in memories))
             return memories
             
         except Exception as e:
@@ -383,12 +603,14 @@ class SupermemoryClient:
             if custom_id:
                 params["custom_id"] = custom_id
             
-            result = self.client.memories.add(**params)
+            result = await self._call(self.client.memories.add, **params)
             
             memory_id = self._get_attr(result, "id")
             status = self._get_attr(result, "status")
             
             print(f"   ✓ Added to Supermemory: {memory_id} (status: {status})")
+            # Searches may now return the new memory
+            self._search_cache.clear()
             return memory_id
             
         except Exception as e:
@@ -401,7 +623,7 @@ class SupermemoryClient:
             return None
         
         try:
-            result = self.client.memories.get(memory_id)
+            result = await self._call(self.client.memories.get, memory_id)
             
             return Memory(
                 id=self._get_attr(result, "id", ""),
@@ -446,20 +668,21 @@ class SupermemoryClient:
             if container_tags:
                 params["container_tags"] = container_tags
             
-            response = self.client.memories.list(**params)
+            response = await self._call(self.client.memories.list, **params)
             
             memories_data = self._get_attr(response, "memories", [])
             pagination = self._get_attr(response, "pagination", {})
             
+            get = self._field_getter(memories_data[0]) if memories_data else None
             memories = []
             for item in memories_data:
                 memories.append(Memory(
-                    id=self._get_attr(item, "id", ""),
-                    content=self._get_attr(item, "title", "") or self._get_attr(item, "summary", ""),
+                    id=get(item, "id", ""),
+                    content=get(item, "title", "") or get(item, "summary", ""),
                     similarity=1.0,
-                    created_at=self._parse_date(self._get_attr(item, "createdAt")),
-                    last_accessed=self._parse_date(self._get_attr(item, "updatedAt")),
-                    source_document_id=self._get_attr(item, "id"),
+                    created_at=self._parse_date(get(item, "createdAt")),
+                    last_accessed=self._parse_date(get(item, "updatedAt")),
+                    source_document_id=get(item, "id"),
                     relationships=[]
                 ))
             
@@ -484,5 +707,22 @@ class SupermemoryClient:
             return None
     
     async def close(self):
-        """Close the client (no-op for SDK, kept for compatibility)."""
-        pass
+        """Close the SDK thread pool and the shared connection pool, if any (safe to call twice)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self.http_client is not None:
+            self.http_client.close()
+
+
+@lru_cache
+def get_supermemory_client() -> SupermemoryClient:
+    """
+    Process-wide SupermemoryClient.
+    
+    Every caller shares one client and one keep-alive pool, so TLS setup
+    is paid once per process rather than once per client.
+    """
+    http_client = httpx.Client(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=32, keepalive_expiry=60),
+        timeout=httpx.Timeout(30.0)
+    )
+    return SupermemoryClient(http_client=http_client)
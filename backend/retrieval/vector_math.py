@@ -21,12 +21,89 @@ Key insight: These vectors have no direct text equivalent. We use them to
 RERANK broad search results, not to generate text queries directly.
 """
 
+import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+
 import numpy as np
 from typing import Union, Optional
 from dataclasses import dataclass
 
 from models import Memory, SearchResult
 from config import get_settings
+from retrieval.scoring_kernels import njit, prange
+
+try:
+    import faiss
+except ImportError:  # faiss is optional (noise_vocabulary_hnsw)
+    faiss = None
+
+
+# The kernels are explicit float32 loops: under numba, np.dot / @ need
+# scipy's BLAS bindings, which are not a dependency.
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _normalize(v: np.ndarray) -> np.ndarray:
+    """v scaled to unit length (zero vectors stay ~zero)."""
+    total = 0.0
+    for i in prange(len(v)):
+        total += v[i] * v[i]
+    scale = 1.0 / (np.sqrt(total) + 1e-10)
+    
+    out = np.empty_like(v)
+    for i in prange(len(v)):
+        out[i] = v[i] * scale
+    return out
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _pca_kernel(v_user: np.ndarray, components: np.ndarray, lambda_val: np.float32) -> np.ndarray:
+    """
+    Normalized V_user - λ * Σ proj_Vi(V_user) over the rows of components.
+
+    The rows are orthonormal (SVD output), so each projection is
+    (Vi · V_user) Vi.
+    """
+    num_components, d = components.shape
+    coefficients = np.zeros(num_components, dtype=np.float32)
+    for c in range(num_components):
+        total = 0.0
+        for j in prange(d):
+            total += components[c, j] * v_user[j]
+        coefficients[c] = lambda_val * total
+    
+    out = np.empty_like(v_user)
+    for j in prange(d):
+        projection = 0.0
+        for c in range(num_components):
+            projection += coefficients[c] * components[c, j]
+        out[j] = v_user[j] - projection
+    return _normalize(out)
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _steer_kernel(
+    v_taste: np.ndarray,
+    v_target: np.ndarray,
+    v_context: np.ndarray,
+    alpha: np.float32
+) -> np.ndarray:
+    """Normalized V_taste + α * (V_target - V_context)."""
+    out = np.empty_like(v_taste)
+    for j in prange(len(v_taste)):
+        out[j] = v_taste[j] + alpha * (v_target[j] - v_context[j])
+    return _normalize(out)
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _bridge_kernel(v_content: np.ndarray, v_bridge: np.ndarray) -> np.ndarray:
+    """Normalized V_content + V_bridge."""
+    out = np.empty_like(v_content)
+    for j in prange(len(v_content)):
+        out[j] = v_content[j] + v_bridge[j]
+    return _normalize(out)
 
 
 @dataclass
@@ -78,6 +155,41 @@ DOMAIN_ANCHORS = {
 }
 
 
+# Concepts a perturbed query embedding is mapped back to (noise injection):
+# moods, textures and scenes spanning the domains above
+NOISE_VOCABULARY = (
+    "hidden gem", "underground scene", "handmade craft", "slow living",
+    "analog nostalgia", "street food", "night market", "field recordings",
+    "ambient soundscape", "jazz improvisation", "folk tradition", "oral history",
+    "brutalist concrete", "mid-century modern", "japanese joinery", "vernacular architecture",
+    "abandoned places", "urban exploration", "coastal village", "mountain hut",
+    "desert road trip", "long-distance train", "pilgrimage route", "island ferry",
+    "fermentation", "natural wine", "tea ceremony", "farmers market",
+    "family-run trattoria", "omakase counter", "dive bar", "secondhand bookstore",
+    "independent cinema", "silent film", "documentary photography", "film grain",
+    "zine culture", "letterpress printing", "calligraphy", "typography",
+    "mechanical watches", "vintage synthesizers", "vinyl records", "cassette tapes",
+    "minimalism", "maximalism", "wabi-sabi", "bauhaus",
+    "cottagecore", "cyberpunk", "solarpunk", "retrofuturism",
+    "magical realism", "gothic fiction", "science fiction", "travel writing",
+    "memoir", "poetry", "mythology", "folklore",
+    "game design", "speedrunning", "tabletop games", "puzzle hunts",
+    "chess strategy", "martial arts", "long-distance running", "surf culture",
+    "skateboarding", "rock climbing", "wild swimming", "birdwatching",
+    "foraging", "permaculture", "beekeeping", "woodworking",
+    "ceramics", "textile weaving", "indigo dyeing", "bookbinding",
+    "open source", "hacker culture", "demoscene", "pixel art",
+    "generative art", "data visualization", "cartography", "urban planning",
+    "public transit", "tiny houses", "monastic life", "stoicism",
+    "zen buddhism", "existentialism", "behavioral economics", "systems thinking",
+    "complexity science", "evolutionary biology", "astronomy", "deep sea",
+    "mycology", "botanical gardens", "night sky", "rainy city",
+    "melancholy", "nostalgia", "solitude", "wonder",
+    "precision", "chaos", "intimacy", "defiance",
+    "craftsmanship", "improvisation", "ritual", "impermanence",
+)
+
+
 class OrthogonalVectorMath:
     """
     Core embedding arithmetic for serendipitous discovery.
@@ -94,6 +206,11 @@ class OrthogonalVectorMath:
         self.settings = get_settings()
         self._bridge_vectors: Optional[dict[tuple[str, str], np.ndarray]] = None
         self._domain_centroids: Optional[dict[str, np.ndarray]] = None
+        self._load_bridge_centroids()
+        # (terms, L2-normalized float32 embeddings), loaded on first noise request
+        self._noise_vocabulary: Optional[tuple[tuple[str, ...], np.ndarray]] = None
+        # faiss HNSW index over the noise vocabulary (noise_vocabulary_hnsw)
+        self._noise_index = None
     
     async def _get_memory_embeddings(self, memories: list[Memory]) -> np.ndarray:
         """Get embeddings for a list of memories."""
@@ -102,6 +219,30 @@ class OrthogonalVectorMath:
             return np.array([])
         return await self.synthesizer.get_embeddings_batch(texts)
     
+    async def prefetch_embeddings(
+        self,
+        memories: list[Memory] = None,
+        texts: list[str] = None,
+        bridges: bool = False
+    ):
+        """
+        Warm the embedding cache for inputs a search is about to use.
+        
+        Lets the embedding round-trips overlap other work (e.g. vibe
+        extraction) instead of running after it.
+        
+        Args:
+            memories: Memories whose embeddings will be needed
+            texts: Texts that will be embedded (exactly as the search truncates them)
+            bridges: Also precompute the cross-modal bridge vectors
+        """
+        tasks = [self.synthesizer.get_embedding(text) for text in texts or []]
+        if memories:
+            tasks.append(self._get_memory_embeddings(memories))
+        if bridges:
+            tasks.append(self.compute_bridge_vectors())
+        await asyncio.gather(*tasks)
+    
     # =========================================================================
     # TECHNIQUE 1: Principal Component Subtraction
     # =========================================================================
@@ -136,12 +277,14 @@ class OrthogonalVectorMath:
         
         if len(embeddings) < self.settings.pca_min_memories:
             # Fallback for sparse history - just use average
-            result = np.mean(embeddings, axis=0) if len(embeddings) > 0 else np.zeros(1536)
+            result = np.mean(embeddings, axis=0) if len(embeddings) > 0 else np.zeros(self.settings.openai_embedding_dimensions)
+            result = _normalize(np.asarray(result, dtype=np.float32))
             if return_subtracted:
-                return result / (np.linalg.norm(result) + 1e-10), []
-            return result / (np.linalg.norm(result) + 1e-10)
+                return result, []
+            return result
         
         # Compute user centroid
+        embeddings = np.asarray(embeddings, dtype=np.float32)
         v_user = np.mean(embeddings, axis=0)
         
         # Center the data for SVD
@@ -155,29 +298,16 @@ class OrthogonalVectorMath:
             noise = np.random.normal(0, 1e-9, centered.shape)
             U, S, Vt = np.linalg.svd(centered + noise, full_matrices=False)
         
-        # Subtract top k dominant components
-        q_serendipity = v_user.copy()
-        subtracted_tags = []
-        
+        # Subtract top k dominant components (and normalize)
         num_components = min(self.settings.pca_num_components, len(Vt))
-        
-        for i in range(num_components):
-            v_dominant = Vt[i]
-            projection = np.dot(v_user, v_dominant) * v_dominant
-            q_serendipity -= lambda_val * projection
-            
-            # "NAME THE GHOST": Find memory that most defines this axis
-            if return_subtracted:
-                scores = [np.dot(emb - v_user, v_dominant) for emb in embeddings]
-                top_idx = int(np.argmax(np.abs(scores)))
-                # Extract a snippet from the memory that defines this component
-                subtracted_tags.append(user_memories[top_idx].content[:80])
-        
-        # Normalize
-        norm = np.linalg.norm(q_serendipity)
-        q_norm = q_serendipity / (norm + 1e-10)
+        components = np.ascontiguousarray(Vt[:num_components], dtype=np.float32)
+        q_norm = _pca_kernel(v_user, components, np.float32(lambda_val))
         
         if return_subtracted:
+            # "NAME THE GHOST": Find the memory that most defines each axis and
+            # extract a snippet from it
+            top_indices = np.argmax(np.abs(centered @ components.T), axis=0)
+            subtracted_tags = [user_memories[int(i)].content[:80] for i in top_indices]
             return q_norm, subtracted_tags
         return q_norm
     
@@ -217,14 +347,14 @@ class OrthogonalVectorMath:
         # 1. V_LongTermTaste from Supermemory
         if user_memories and len(user_memories) > 0:
             memory_embeddings = await self._get_memory_embeddings(user_memories)
-            v_taste = np.mean(memory_embeddings, axis=0)
+            v_taste = np.mean(memory_embeddings, axis=0).astype(np.float32)
         else:
             # Fallback: neutral vector
-            v_taste = np.zeros(1536)
+            v_taste = np.zeros(self.settings.openai_embedding_dimensions, dtype=np.float32)
         
         # 2. V_CurrentContext from screen content
         v_context = await self.synthesizer.get_embedding(current_context[:4000])
-        v_context = np.array(v_context)
+        v_context = np.array(v_context, dtype=np.float32)
         
         # 3. V_TargetVibe - pick a target direction
         if target_vibe is None:
@@ -232,15 +362,10 @@ class OrthogonalVectorMath:
             target_vibe = random.choice(self.settings.antonym_target_vibes)
         
         v_target = await self.synthesizer.get_embedding(target_vibe)
-        v_target = np.array(v_target)
+        v_target = np.array(v_target, dtype=np.float32)
         
-        # 4. Directional steering: taste + α * (target - context)
-        direction = v_target - v_context
-        q_final = v_taste + alpha_val * direction
-        
-        # Normalize
-        norm = np.linalg.norm(q_final)
-        q_norm = q_final / (norm + 1e-10)
+        # 4. Directional steering: taste + α * (target - context), normalized
+        q_norm = _steer_kernel(v_taste, v_target, v_context, np.float32(alpha_val))
         
         return q_norm, target_vibe
     
@@ -263,24 +388,87 @@ class OrthogonalVectorMath:
         if self._bridge_vectors is not None:
             return self._bridge_vectors
         
-        # Compute domain centroids
-        self._domain_centroids = {}
-        for domain, anchors in DOMAIN_ANCHORS.items():
-            embeddings = await self.synthesizer.get_embeddings_batch(anchors)
-            self._domain_centroids[domain] = np.mean(embeddings, axis=0)
-        
-        # Compute all pairwise bridge vectors
-        self._bridge_vectors = {}
-        for d1 in self._domain_centroids:
-            for d2 in self._domain_centroids:
-                if d1 != d2:
-                    # Bridge from d2 to d1: add this to d2 content to get d1 equivalent
-                    self._bridge_vectors[(d1, d2)] = (
-                        self._domain_centroids[d1] - self._domain_centroids[d2]
-                    )
+        # Compute domain centroids, embedding every anchor in one batch
+        anchors = [anchor for domain_anchors in DOMAIN_ANCHORS.values() for anchor in domain_anchors]
+        embeddings = await self.synthesizer.get_embeddings_batch(anchors)
+        counts = np.array([len(domain_anchors) for domain_anchors in DOMAIN_ANCHORS.values()])
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        centroids = (np.add.reduceat(embeddings, starts, axis=0) / counts[:, None]).astype(np.float32)
+        
+        # Don't persist the zero vectors returned when embedding fails
+        if centroids.any():
+            self._save_matrix(self._bridge_centroids_file(), centroids)
         
+        self._set_bridge_centroids(centroids)
         return self._bridge_vectors
     
+    def _persisted_file(self, base_path: str, inputs) -> Path:
+        """
+        Where embeddings of inputs are persisted: base_path suffixed with a
+        digest of the embedding model, dimensions and inputs, so a change to
+        any of them never loads stale vectors.
+        """
+        identity = json.dumps([
+            self.settings.openai_embedding_model,
+            self.settings.openai_embedding_dimensions,
+            inputs
+        ])
+        digest = hashlib.blake2b(identity.encode(), digest_size=8).hexdigest()
+        path = Path(base_path)
+        return path.with_name(f"{path.stem}_{digest}{path.suffix}")
+    
+    @staticmethod
+    def _load_matrix(path: Path, rows: int) -> Optional[np.ndarray]:
+        """Persisted (rows, d) matrix, memory-mapped; None if absent or malformed."""
+        try:
+            matrix = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        
+        if matrix.ndim != 2 or len(matrix) != rows:
+            return None
+        return matrix
+    
+    @staticmethod
+    def _save_matrix(path: Path, matrix: np.ndarray):
+        """Persist a matrix atomically (best effort)."""
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.save(f, matrix)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"   Warning: could not persist {path.name}: {e}")
+    
+    def _bridge_centroids_file(self) -> Path:
+        """Where domain centroids are persisted (see _persisted_file)."""
+        return self._persisted_file(self.settings.bridge_centroids_path, DOMAIN_ANCHORS)
+    
+    def _load_bridge_centroids(self):
+        """Warm-start bridge vectors from persisted centroids (memory-mapped), if present."""
+        centroids = self._load_matrix(self._bridge_centroids_file(), len(DOMAIN_ANCHORS))
+        if centroids is not None:
+            self._set_bridge_centroids(centroids)
+    
+    def _set_bridge_centroids(self, centroids: np.ndarray):
+        """
+        Set domain centroids (one row per DOMAIN_ANCHORS domain, in order)
+        and every pairwise bridge vector.
+        """
+        domains = list(DOMAIN_ANCHORS)
+        self._domain_centroids = dict(zip(domains, centroids))
+        
+        # Bridge from d2 to d1 (add to d2 content to get the d1 equivalent) is
+        # centroid[d1] - centroid[d2]: all pairs in one broadcast subtraction
+        differences = centroids[:, None, :] - centroids[None, :, :]
+        self._bridge_vectors = {
+            (d1, d2): differences[i, j]
+            for i, d1 in enumerate(domains)
+            for j, d2 in enumerate(domains)
+            if i != j
+        }
+    
     async def bridge_vector_search(
         self,
         content: str,
@@ -308,21 +496,140 @@ class OrthogonalVectorMath:
         
         # Get content embedding
         v_content = await self.synthesizer.get_embedding(content[:4000])
-        v_content = np.array(v_content)
+        v_content = np.array(v_content, dtype=np.float32)
         
         # Apply bridge transformation
         bridge_key = (target_domain, source_domain)
         if bridge_key not in bridges:
             # Unknown domain pair - return content vector as-is
             print(f"   Warning: No bridge for {source_domain} -> {target_domain}")
-            return v_content / (np.linalg.norm(v_content) + 1e-10)
+            return _normalize(v_content)
         
-        v_bridge = bridges[bridge_key]
-        q = v_content + v_bridge
+        # Normalized V_content + V_bridge
+        return _bridge_kernel(v_content, bridges[bridge_key].astype(np.float32, copy=False))
+    
+    # =========================================================================
+    # NOISE INJECTION: Gaussian perturbation + nearest vocabulary terms
+    # =========================================================================
+    
+    def _noise_terms(self) -> tuple[str, ...]:
+        """Noise vocabulary: noise_vocabulary_path (one term per line) or the built-in list."""
+        path = self.settings.noise_vocabulary_path
+        if not path:
+            return NOISE_VOCABULARY
         
-        # Normalize
-        norm = np.linalg.norm(q)
-        return q / (norm + 1e-10)
+        try:
+            with open(path, encoding="utf-8") as f:
+                terms = tuple(dict.fromkeys(line.strip() for line in f if line.strip()))
+        except OSError as e:
+            print(f"   Warning: could not read noise vocabulary {path}: {e}")
+            return NOISE_VOCABULARY
+        return terms or NOISE_VOCABULARY
+    
+    async def noise_vocabulary(self) -> tuple[tuple[str, ...], Optional[np.ndarray]]:
+        """
+        Noise vocabulary terms and their L2-normalized float32 embeddings.
+        
+        Embedded once (persisted next to the bridge centroids for warm
+        starts); the matrix is None while embeddings are unavailable. With
+        noise_vocabulary_hnsw the vocabulary also gets an HNSW index.
+        """
+        if self._noise_vocabulary is not None:
+            return self._noise_vocabulary
+        
+        terms = self._noise_terms()
+        path = self._persisted_file(self.settings.noise_vocabulary_cache_path, terms)
+        matrix = self._load_matrix(path, len(terms))
+        
+        if matrix is None:
+            embeddings = await self.synthesizer.get_embeddings_batch(list(terms))
+            matrix = np.asarray(embeddings, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            if matrix.ndim != 2 or not norms.all():
+                # Embedding failed (zero vectors): retry on the next request
+                return terms, None
+            matrix /= norms
+            self._save_matrix(path, matrix)
+        
+        if self.settings.noise_vocabulary_hnsw:
+            if faiss is None:
+                print("   Warning: noise_vocabulary_hnsw is set but faiss is not installed; using exact lookup")
+            else:
+                self._noise_index = await asyncio.to_thread(self._build_noise_index, matrix)
+        self._noise_vocabulary = (terms, matrix)
+        return self._noise_vocabulary
+    
+    @staticmethod
+    def _build_noise_index(matrix: np.ndarray):
+        """HNSW inner-product index over L2-normalized rows (i.e. cosine)."""
+        index = faiss.IndexHNSWFlat(matrix.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+        index.add(np.ascontiguousarray(matrix, dtype=np.float32))
+        return index
+    
+    async def perturbed_terms(
+        self,
+        query: str,
+        noise_scale: float,
+        k: int = 3,
+        rng: Optional[np.random.Generator] = None,
+        antithetic: bool = False
+    ) -> list[list[str]]:
+        """
+        Vocabulary terms nearest to a Gaussian perturbation of the query.
+        
+        Math: q' = q + ε, ε ~ N(0, σ²I), with σ = noise_scale * ||q|| / √d so
+        that ||ε|| ≈ noise_scale * ||q|| (noise proportional to the query).
+        With antithetic=True the same draw is also applied as q - ε, covering
+        the opposite side of the neighborhood for no extra sampling.
+        
+        Args:
+            query: Query to perturb
+            noise_scale: Relative size of the perturbation
+            k: Number of terms per perturbation
+            rng: Random generator (default: a fresh one)
+            antithetic: Also return the terms for q - ε
+            
+        Returns:
+            Per perturbation (q + ε, then q - ε if antithetic), up to k terms
+            not already in the query, nearest first; empty when embeddings
+            are unavailable
+        """
+        (terms, vocabulary), q = await asyncio.gather(
+            self.noise_vocabulary(),
+            self.synthesizer.get_embedding(query)
+        )
+        q = np.asarray(q, dtype=np.float32)
+        q_norm = float(np.linalg.norm(q))
+        if vocabulary is None or q_norm == 0.0 or len(q) != vocabulary.shape[1]:
+            return []
+        
+        rng = rng or np.random.default_rng()
+        sigma = noise_scale * q_norm / np.sqrt(len(q))
+        eps = rng.standard_normal(len(q), dtype=np.float32) * np.float32(sigma)
+        perturbed = np.stack((q + eps, q - eps) if antithetic else (q + eps,))
+        perturbed /= np.linalg.norm(perturbed, axis=1, keepdims=True)
+        
+        # Nearest terms per perturbation, one matmul for both (a few spare in
+        # case some already appear in the query)
+        pool = min(len(terms), 3 * k)
+        if self._noise_index is not None:
+            # Approximate nearest terms, best first (-1 pads a short result)
+            _, nearest = self._noise_index.search(perturbed, pool)
+        else:
+            nearest = self._nearest_rows(perturbed @ vocabulary.T, pool)
+        
+        query_cf = query.casefold()
+        return [
+            [terms[i] for i in row if i >= 0 and terms[i].casefold() not in query_cf][:k]
+            for row in nearest.tolist()
+        ]
+    
+    @staticmethod
+    def _nearest_rows(scores: np.ndarray, pool: int) -> np.ndarray:
+        """Column indices of the pool highest scores per row, best first."""
+        nearest = np.argpartition(scores, -pool, axis=1)[:, -pool:]
+        order = np.argsort(np.take_along_axis(scores, nearest, axis=1), axis=1)[:, ::-1]
+        return np.take_along_axis(nearest, order, axis=1)
     
     # =========================================================================
     # RERANKING: Use math vectors to rerank broad search results
@@ -362,7 +669,10 @@ class OrthogonalVectorMath:
         # 2. BATCH EMBEDDING (single API call - crucial for performance)
         embeddings_matrix = await self.synthesizer.get_embeddings_batch(texts)
         
-        # 3. VECTORIZED cosine similarity (no loop)
+        # 3. VECTORIZED cosine similarity (no loop): one float32 matrix-vector product
+        embeddings_matrix = np.ascontiguousarray(embeddings_matrix, dtype=np.float32)
+        target_vector = np.asarray(target_vector, dtype=np.float32)
+        
         # Normalize embeddings
         norms = np.linalg.norm(embeddings_matrix, axis=1)
         # Avoid division by zero
@@ -372,14 +682,16 @@ class OrthogonalVectorMath:
         if target_norm == 0:
             target_norm = 1e-10
         
-        # Dot product of target vs all candidates at once
-        similarities = np.dot(embeddings_matrix, target_vector) / (norms * target_norm)
+        k = min(top_k, len(results))
+        
+        # Dot product of target vs all results at once
+        similarities = (embeddings_matrix @ target_vector) / (norms * target_norm)
         
-        # 4. Sort and return top-k
-        scored = list(zip(results, similarities))
-        scored.sort(key=lambda x: x[1], reverse=True)
+        # 4. Select top-k in O(N), then order just those
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
         
-        return [r for r, _ in scored[:top_k]]
+        return [results[i] for i in top]
     
     def cosine_similarity(self, v1: np.ndarray, v2: np.ndarray) -> float:
         """Compute cosine similarity between two vectors."""
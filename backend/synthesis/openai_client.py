@@ -1,12 +1,114 @@
+import asyncio
+from functools import lru_cache
 from openai import AsyncOpenAI
 from typing import Union
+import hashlib
 import json
+import logging
 import uuid
 import numpy as np
 
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional (truncate_tokens falls back to characters)
+    tiktoken = None
+
 from models import Memory, SearchResult, Suggestion, SuggestionSource, VibeProfile
+from cache import TTLCache
 from config import get_settings
 
+logger = logging.getLogger(__name__)
+
+
+# Vibe extraction instructions
+VIBE_SYSTEM_PROMPT = """You are a cultural anthropologist and taste curator. Your job is to extract the ESSENCE of content - not what it's about, but what TYPE OF PERSON appreciates it and WHY.
+
+This enables cross-domain discovery: someone reading about wabi-sabi pottery might love a restaurant with the same "vibe" - unpolished, authentic, humble.
+
+Given content, extract:
+
+1. EMOTIONAL SIGNATURES (3-5 abstract feelings):
+   - How does this content/thing FEEL?
+   - Examples: melancholy, chaotic, intimate, clinical, playful, precise, raw, luxurious, humble, defiant, nostalgic, futuristic, cozy, stark
+
+2. ARCHETYPE (1-2 sentences):
+   - What type of person is drawn to this?
+   - Don't describe the content - describe the PERSON who values it
+   - Example: "Someone who finds beauty in imperfection and distrusts anything too polished. They prefer experiences that feel discovered rather than marketed."
+
+3. CROSS-DOMAIN INTERESTS (3-4 unrelated domains/things):
+   - What COMPLETELY DIFFERENT things would this person love?
+   - Bridge to other categories: food, music, travel, architecture, fashion, books, films
+   - Be specific and unexpected
+   - Example: For wabi-sabi pottery → "hole-in-the-wall restaurants with mismatched chairs", "ambient music with tape hiss", "brutalist architecture", "handwritten letters"
+
+4. ANTI-PATTERNS (2-3 things this aesthetic REJECTS):
+   - What would feel wrong to this person?
+   - Examples: "SEO-optimized", "influencer-approved", "mass-produced", "algorithm-recommended"
+
+5. SOURCE DOMAIN (1-2 words):
+   - What domain is this content from?
+   - Examples: "pottery", "football tactics", "software architecture", "investing"
+
+Return JSON:
+{
+    "emotional_signatures": ["signature1", "signature2", "signature3"],
+    "archetype": "Description of the type of person who values this...",
+    "cross_domain_interests": ["specific thing in domain1", "specific thing in domain2", "specific thing in domain3"],
+    "anti_patterns": ["thing1 this aesthetic rejects", "thing2"],
+    "source_domain": "the domain"
+}
+
+EXAMPLES:
+
+Content about: Wabi-sabi pottery and Japanese aesthetics
+{
+    "emotional_signatures": ["imperfect", "quiet", "handcrafted", "humble", "timeless"],
+    "archetype": "Someone who distrusts anything too polished or marketed. They seek experiences that feel discovered, not advertised. Values process over product, impermanence over permanence.",
+    "cross_domain_interests": ["Georgian restaurants with no online presence and handwritten menus", "field recordings with ambient noise", "indie bookstores in basements", "hand-stitched leather goods from unknown makers"],
+    "anti_patterns": ["SEO-optimized content", "Michelin-starred restaurants", "minimalist tech aesthetics"],
+    "source_domain": "ceramics"
+}
+
+Content about: Pep Guardiola's tactical philosophy
+{
+    "emotional_signatures": ["precise", "obsessive", "systematic", "elegant", "demanding"],
+    "archetype": "Someone who sees beauty in systems and patterns. They appreciate when complexity is made to look effortless. Obsessive about details that others don't notice.",
+    "cross_domain_interests": ["omakase restaurants with 20-course menus", "architecture by Tadao Ando", "jazz musicians who studied classical", "watchmaking documentaries"],
+    "anti_patterns": ["improvisation without structure", "good enough mentality", "anti-intellectual populism"],
+    "source_domain": "football tactics"
+}"""
+
+
+@lru_cache(maxsize=1)
+def _token_encoding():
+    """Shared cl100k_base encoding, or None if tiktoken (or its BPE file) is unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning("Tokenizer unavailable, truncating by characters: %s", e)
+        return None
+
+
+def truncate_tokens(text: str, max_tokens: int = 512) -> str:
+    """
+    First max_tokens tokens of text (cl100k_base).
+    
+    Falls back to ~4 characters per token without tiktoken.
+    """
+    # Tokens average ~4 characters: don't encode text far past the budget
+    text = text[:max_tokens * 8]
+    encoding = _token_encoding()
+    if encoding is None:
+        return text[:max_tokens * 4]
+    
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
 
 class OpenAISynthesizer:
     """
@@ -21,7 +123,26 @@ class OpenAISynthesizer:
         self.client = AsyncOpenAI(api_key=settings.openai_api_key)
         self.model = settings.openai_model
         self.embedding_model = settings.openai_embedding_model
+        self.embedding_dimensions = settings.openai_embedding_dimensions
         self.vibe_temperature = settings.orthogonal_vibe_temperature
+        # Embeddings are deterministic per (model, text): reuse them across requests
+        self._embedding_cache = TTLCache(maxsize=4096, ttl=3600.0)
+        # Vibe profiles by _vibe_key: routing paths re-extract the vibe of the same screen
+        self._vibe_cache = TTLCache(maxsize=256, ttl=settings.vibe_cache_ttl)
+    
+    # Max inputs per embeddings request (API limit)
+    EMBEDDING_BATCH_SIZE = 2048
+    
+    def _embedding_key(self, text: str) -> bytes:
+        """Cache key for an embedding input (already truncated)."""
+        return hashlib.sha256(
+            f"{self.embedding_model}\0{self.embedding_dimensions}\0{text}".encode()
+        ).digest()
+    
+    @staticmethod
+    def _vibe_key(context: str, app_name: str) -> bytes:
+        """Cache key for the vibe of a context (as truncated for the prompt)."""
+        return hashlib.blake2b(f"{app_name}\0{context[:4000]}".encode(), digest_size=16).digest()
     
     async def extract_concepts(self, context: str, app_name: str) -> list[str]:
         """
@@ -110,9 +231,7 @@ Identify the main subject (DO NOT search for this) and 4-5 tangential concepts t
             return tangential if isinstance(tangential, list) else []
             
         except Exception as e:
-            print(f"Concept extraction error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Concept extraction error: %s", e)
             # Fallback: extract simple keywords
             return self._fallback_extraction(context)
     
@@ -168,67 +287,18 @@ Return ONLY the subject, nothing else."""
         This is the key to orthogonal search: instead of matching by topic,
         we match by the TYPE OF PERSON who would appreciate this content.
         
+        Vibes are reused for the same context within vibe_cache_ttl (failed
+        extractions are not cached).
+        
         Returns:
             VibeProfile with emotional signatures, archetype, cross-domain interests, and anti-patterns
         """
-        system_prompt = """You are a cultural anthropologist and taste curator. Your job is to extract the ESSENCE of content - not what it's about, but what TYPE OF PERSON appreciates it and WHY.
-
-This enables cross-domain discovery: someone reading about wabi-sabi pottery might love a restaurant with the same "vibe" - unpolished, authentic, humble.
-
-Given content, extract:
-
-1. EMOTIONAL SIGNATURES (3-5 abstract feelings):
-   - How does this content/thing FEEL?
-   - Examples: melancholy, chaotic, intimate, clinical, playful, precise, raw, luxurious, humble, defiant, nostalgic, futuristic, cozy, stark
-
-2. ARCHETYPE (1-2 sentences):
-   - What type of person is drawn to this?
-   - Don't describe the content - describe the PERSON who values it
-   - Example: "Someone who finds beauty in imperfection and distrusts anything too polished. They prefer experiences that feel discovered rather than marketed."
-
-3. CROSS-DOMAIN INTERESTS (3-4 unrelated domains/things):
-   - What COMPLETELY DIFFERENT things would this person love?
-   - Bridge to other categories: food, music, travel, architecture, fashion, books, films
-   - Be specific and unexpected
-   - Example: For wabi-sabi pottery → "hole-in-the-wall restaurants with mismatched chairs", "ambient music with tape hiss", "brutalist architecture", "handwritten letters"
-
-4. ANTI-PATTERNS (2-3 things this aesthetic REJECTS):
-   - What would feel wrong to this person?
-   - Examples: "SEO-optimized", "influencer-approved", "mass-produced", "algorithm-recommended"
-
-5. SOURCE DOMAIN (1-2 words):
-   - What domain is this content from?
-   - Examples: "pottery", "football tactics", "software architecture", "investing"
-
-Return JSON:
-{
-    "emotional_signatures": ["signature1", "signature2", "signature3"],
-    "archetype": "Description of the type of person who values this...",
-    "cross_domain_interests": ["specific thing in domain1", "specific thing in domain2", "specific thing in domain3"],
-    "anti_patterns": ["thing1 this aesthetic rejects", "thing2"],
-    "source_domain": "the domain"
-}
-
-EXAMPLES:
-
-Content about: Wabi-sabi pottery and Japanese aesthetics
-{
-    "emotional_signatures": ["imperfect", "quiet", "handcrafted", "humble", "timeless"],
-    "archetype": "Someone who distrusts anything too polished or marketed. They seek experiences that feel discovered, not advertised. Values process over product, impermanence over permanence.",
-    "cross_domain_interests": ["Georgian restaurants with no online presence and handwritten menus", "field recordings with ambient noise", "indie bookstores in basements", "hand-stitched leather goods from unknown makers"],
-    "anti_patterns": ["SEO-optimized content", "Michelin-starred restaurants", "minimalist tech aesthetics"],
-    "source_domain": "ceramics"
-}
-
-Content about: Pep Guardiola's tactical philosophy
-{
-    "emotional_signatures": ["precise", "obsessive", "systematic", "elegant", "demanding"],
-    "archetype": "Someone who sees beauty in systems and patterns. They appreciate when complexity is made to look effortless. Obsessive about details that others don't notice.",
-    "cross_domain_interests": ["omakase restaurants with 20-course menus", "architecture by Tadao Ando", "jazz musicians who studied classical", "watchmaking documentaries"],
-    "anti_patterns": ["improvisation without structure", "good enough mentality", "anti-intellectual populism"],
-    "source_domain": "football tactics"
-}"""
-
+        key = self._vibe_key(context, app_name)
+        cached = self._vibe_cache.get(key)
+        if cached is not None:
+            # Copy on read so callers can't mutate the cached profile
+            return cached.model_copy(deep=True)
+        
         user_prompt = f"""App: {app_name}
 
 Content to analyze:
@@ -240,59 +310,78 @@ Extract the vibe profile - focus on the TYPE OF PERSON who appreciates this, not
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": VIBE_SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=self.vibe_temperature,  # Higher temp for creative connections
-                max_tokens=500
+                max_tokens=500,
+                response_format={"type": "json_object"}
             )
             
-            result = response.choices[0].message.content.strip()
-            
-            # Handle potential markdown code blocks
-            if result.startswith("```"):
-                result = result.split("```")[1]
-                if result.startswith("json"):
-                    result = result[4:]
-            
-            data = json.loads(result)
-            
-            vibe = VibeProfile(
-                emotional_signatures=data.get("emotional_signatures", []),
-                archetype=data.get("archetype", ""),
-                cross_domain_interests=data.get("cross_domain_interests", []),
-                anti_patterns=data.get("anti_patterns", []),
-                source_domain=data.get("source_domain", "")
-            )
-            
-            print(f"   🎭 Vibe extracted:")
-            print(f"      Signatures: {vibe.emotional_signatures}")
-            print(f"      Archetype: {vibe.archetype[:80]}...")
-            print(f"      Cross-domain: {vibe.cross_domain_interests}")
-            
+            data = self._parse_json_content(response.choices[0].message.content)
+            vibe = self._vibe_from_data(data)
+            self._vibe_cache.set(key, vibe.model_copy(deep=True))
             return vibe
             
         except Exception as e:
-            print(f"Vibe extraction error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Vibe extraction error: %s", e)
             # Return empty vibe profile on error
             return VibeProfile()
     
+    @staticmethod
+    def _parse_json_content(content: str) -> dict:
+        """Parse a JSON completion, tolerating a markdown code fence."""
+        result = content.strip()
+        
+        # Handle potential markdown code blocks
+        if result.startswith("```"):
+            result = result.split("```")[1]
+            if result.startswith("json"):
+                result = result[4:]
+        
+        return json.loads(result)
+    
+    @staticmethod
+    def _vibe_from_data(data: dict) -> VibeProfile:
+        """Build (and log) a VibeProfile from the parsed vibe JSON."""
+        vibe = VibeProfile(
+            emotional_signatures=data.get("emotional_signatures", []),
+            archetype=data.get("archetype", ""),
+            cross_domain_interests=data.get("cross_domain_interests", []),
+            anti_patterns=data.get("anti_patterns", []),
+            source_domain=data.get("source_domain", "")
+        )
+        
+        print(f"   🎭 Vibe extracted:")
+        print(f"      Signatures: {vibe.emotional_signatures}")
+        print(f"      Archetype: {vibe.archetype[:80]}...")
+        print(f"      Cross-domain: {vibe.cross_domain_interests}")
+        
+        return vibe
+    
     async def get_embedding(self, text: str) -> list[float]:
         """
         Get OpenAI embedding for text.
         Used for noise injection in orthogonal search.
         """
+        text = text[:8000]  # Limit input size
+        key = self._embedding_key(text)
+        cached = self._embedding_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        
         try:
             response = await self.client.embeddings.create(
                 model=self.embedding_model,
-                input=text[:8000]  # Limit input size
+                input=text,
+                dimensions=self.embedding_dimensions
             )
-            return response.data[0].embedding
+            embedding = response.data[0].embedding
+            self._embedding_cache.set(key, tuple(embedding))
+            return embedding
         except Exception as e:
             print(f"Embedding error: {e}")
-            return [0.0] * 1536  # Return zero vector on error
+            return [0.0] * self.embedding_dimensions  # Return zero vector on error
     
     async def get_embeddings_batch(self, texts: list[str]) -> np.ndarray:
         """
@@ -310,19 +399,46 @@ Extract the vibe profile - focus on the TYPE OF PERSON who appreciates this, not
         if not texts:
             return np.array([])
         
+        # Truncate each text; only embed the ones not already cached, once each
+        # (rerank pools from different strategies often share documents)
+        truncated = [t[:8000] for t in texts]
+        keys = [self._embedding_key(t) for t in truncated]
+        embeddings = [self._embedding_cache.get(key) for key in keys]
+        missing: dict[bytes, str] = {}
+        for key, text, embedding in zip(keys, truncated, embeddings):
+            if embedding is None:
+                missing.setdefault(key, text)
+        
         try:
-            # Truncate each text and batch embed
-            truncated = [t[:8000] for t in texts]
-            response = await self.client.embeddings.create(
-                model=self.embedding_model,
-                input=truncated
-            )
+            if missing:
+                missing_keys = list(missing)
+                batches = [
+                    missing_keys[i:i + self.EMBEDDING_BATCH_SIZE]
+                    for i in range(0, len(missing_keys), self.EMBEDDING_BATCH_SIZE)
+                ]
+                responses = await asyncio.gather(*(
+                    self.client.embeddings.create(
+                        model=self.embedding_model,
+                        input=[missing[key] for key in batch],
+                        dimensions=self.embedding_dimensions
+                    )
+                    for batch in batches
+                ))
+                fetched = {}
+                for batch, response in zip(batches, responses):
+                    for key, item in zip(batch, response.data):
+                        fetched[key] = tuple(item.embedding)
+                        self._embedding_cache.set(key, fetched[key])
+                embeddings = [
+                    fetched[key] if embedding is None else embedding
+                    for key, embedding in zip(keys, embeddings)
+                ]
             # Return as numpy array for vectorized operations
-            return np.array([item.embedding for item in response.data])
+            return np.array(embeddings)
         except Exception as e:
             print(f"Batch embedding error: {e}")
             # Return zero vectors on error
-            return np.zeros((len(texts), 1536))
+            return np.zeros((len(texts), self.embedding_dimensions))
     
     async def describe_vector_vibe(
         self,
@@ -640,9 +756,7 @@ Extract the most specific insight from this source that ADDS something new to wh
             )
             
         except Exception as e:
-            print(f"Synthesis error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Synthesis error: %s", e)
             
             # Get source URL for web results
             source_url = None
@@ -16,12 +16,23 @@ with patch('config.get_settings') as mock_settings:
         exa_api_key="test-key",
         host="127.0.0.1",
         port=8000,
+        log_level="INFO",
         max_anchors=5,
         min_similarity_threshold=0.65,
         max_similarity_threshold=0.85,
         max_suggestions=3,
+        fusion_policy="rrf",
+        weighted_confidence_thresholds=[1.0, 1.5],
+        graph_cache_soft_ttl=60.0,
+        graph_cache_hard_ttl=600.0,
+        supermemory_cache_ttl=300.0,
+        exa_max_concurrency=8,
+        exa_cache_ttl=300.0,
+        exa_breaker_fail_max=5,
+        exa_breaker_reset_timeout=30.0,
         openai_model="gpt-4.1",
         openai_embedding_model="text-embedding-3-small",
+        openai_embedding_dimensions=512,
         # Context Judge settings
         context_judge_model="gpt-4o-2024-08-06",
         judge_log_path="training_data/router_decisions.jsonl",
@@ -31,6 +42,10 @@ with patch('config.get_settings') as mock_settings:
         orthogonal_archetype_enabled=True,
         orthogonal_target_domains=["restaurants", "music", "films"],
         orthogonal_vibe_temperature=0.8,
+        max_orthogonal_concurrency=6,
+        max_llm_concurrency=4,
+        deterministic_domains=True,
+        orthogonal_noisy_query_ttl=3600.0,
         # Vector Math settings
         pca_lambda_surprise=1.0,
         pca_min_memories=5,
@@ -40,7 +55,18 @@ with patch('config.get_settings') as mock_settings:
         bridge_domains=["restaurant", "movie", "music", "book"],
         # Reranking settings
         rerank_pool_size=50,
-        rerank_top_k=5
+        rerank_top_k=5,
+        pca_cache_ttl=600.0,
+        pca_cache_max_churn=0.1,
+        orthogonal_result_cache_ttl=300.0,
+        bridge_centroids_path="cache/bridge_centroids.npy",
+        bridge_content_max_tokens=512,
+        noise_query_model="gpt-4o-mini",
+        orthogonal_noise_terms=3,
+        noise_vocabulary_path="",
+        noise_vocabulary_cache_path="cache/noise_vocabulary.npy",
+        noise_vocabulary_hnsw=False,
+        vibe_cache_ttl=300.0
     )
     from main import app
 
@@ -390,6 +416,22 @@ class TestScoring:
         assert score > 0.75
         # Novelty should be in reasonable range
         assert 0.5 <= novelty <= 1.0
+    
+    def test_filter_and_rank_reuses_cached_scores(self):
+        """Test that scores are cached per (query, candidate)."""
+        from retrieval.scoring import RetrievalScorer
+        from models import Memory
+        
+        scorer = RetrievalScorer()
+        memory = Memory(id="3", content="Cached content", similarity=0.75)
+        
+        first = scorer.filter_and_rank([memory], query="entropy")
+        
+        with patch.object(scorer, "_score_arrays") as mock_score:
+            second = scorer.filter_and_rank([memory], query="entropy")
+            mock_score.assert_not_called()
+        
+        assert second == first
 
 
 class TestOrthogonalSearch:
@@ -444,6 +486,242 @@ class TestOrthogonalSearch:
         assert combined[1].title == "Arch 1"
         assert combined[2].title == "Noise 2"
         assert combined[3].title == "Arch 2"
+    
+    @pytest.mark.asyncio
+    async def test_failed_noisy_query_generation_is_not_memoized(self):
+        """Test that a failed noise generation is dropped so the next request retries."""
+        from retrieval.orthogonal_search import OrthogonalSearcher
+        
+        searcher = OrthogonalSearcher(exa_client=MagicMock(), synthesizer=MagicMock())
+        searcher.vector_math.perturbed_terms = AsyncMock(side_effect=[RuntimeError("down"), [["ocean"]]])
+        
+        with pytest.raises(RuntimeError):
+            await searcher._generate_noisy_queries("jazz", 0.15)
+        
+        assert await searcher._generate_noisy_queries("jazz", 0.15) == ("jazz ocean",)
+        assert await searcher._generate_noisy_queries("Jazz ", 0.15) == ("jazz ocean",)
+        assert searcher.vector_math.perturbed_terms.await_count == 2
+        await searcher.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_llm_noisy_query_fallback_is_not_memoized(self):
+        """Test that the original-query fallback after an LLM error isn't cached."""
+        from retrieval.orthogonal_search import OrthogonalSearcher
+        
+        synthesizer = MagicMock()
+        synthesizer.client.chat.completions.create = AsyncMock(side_effect=RuntimeError("rate limited"))
+        searcher = OrthogonalSearcher(exa_client=MagicMock(), synthesizer=synthesizer)
+        # Embeddings unavailable, so generation goes through the LLM
+        searcher.vector_math.perturbed_terms = AsyncMock(return_value=[])
+        
+        assert await searcher._generate_noisy_queries("jazz", 0.15) == ("jazz",)
+        
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = '"ocean jazz"'
+        synthesizer.client.chat.completions.create = AsyncMock(return_value=response)
+        
+        assert await searcher._generate_noisy_queries("jazz", 0.15) == ("ocean jazz",)
+        assert await searcher._generate_noisy_queries("jazz", 0.15) == ("ocean jazz",)
+        synthesizer.client.chat.completions.create.assert_awaited_once()
+        await searcher.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_search_with_noise_dedupes_and_caps(self):
+        """Test that noisy variants are interleaved, deduplicated by URL and capped."""
+        from retrieval.orthogonal_search import OrthogonalSearcher
+        from models import SearchResult
+        
+        def result(url, title=""):
+            return SearchResult(title=title or url, url=url, text="", score=0.8)
+        
+        by_variant = {
+            "q a": [result("u1"), result("u2", "From a"), result("u3"), result("u5")],
+            "q b": [result("u4"), result("u2", "From b")],
+        }
+        searcher = OrthogonalSearcher(exa_client=MagicMock(), synthesizer=MagicMock())
+        searcher._generate_noisy_queries = AsyncMock(return_value=("q a", "q b"))
+        searcher._search_exa = AsyncMock(side_effect=lambda query, **kwargs: by_variant[query])
+        
+        noisy = await searcher.search_with_noise("q", num_results=4)
+        
+        assert [item.url for item in noisy.items] == ["u1", "u4", "u2", "u3"]
+        assert noisy.items[2].title == "From a"
+        assert noisy.query_used == "q a | q b"
+        assert noisy.strategy == "noise_injection"
+        await searcher.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_shared_fanout_survives_cancelled_caller(self):
+        """Test that cancelling one caller of a shared fan-out doesn't cancel the others."""
+        import asyncio
+        from retrieval.orthogonal_search import OrthogonalSearcher, OrthogonalResult
+        
+        searcher = OrthogonalSearcher(exa_client=MagicMock(), synthesizer=MagicMock())
+        release = asyncio.Event()
+        runs = 0
+        
+        async def run():
+            nonlocal runs
+            runs += 1
+            await release.wait()
+            return [OrthogonalResult(items=[], strategy="noise_injection", query_used="q")]
+        
+        first = asyncio.create_task(searcher._shared_fanout(("q",), run))
+        second = asyncio.create_task(searcher._shared_fanout(("q",), run))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        
+        assert [r.query_used for r in await second] == ["q"]
+        # Completed run is cached for the next identical call
+        assert [r.query_used for r in await searcher._shared_fanout(("q",), run)] == ["q"]
+        assert runs == 1
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await searcher.aclose()
+
+
+class TestOrthogonalVectorMath:
+    """Tests for the vector math engine."""
+    
+    TERMS = ("jazz", "ocean", "forest", "neon")
+    
+    def test_kernels_match_numpy(self):
+        """Test that each vector math kernel runs and matches the numpy formula in float32."""
+        import numpy as np
+        from retrieval.vector_math import _normalize, _pca_kernel, _steer_kernel, _bridge_kernel
+        
+        def unit(v):
+            return v / np.linalg.norm(v)
+        
+        rng = np.random.default_rng(0)
+        v_user, v_target, v_context = rng.standard_normal((3, 16), dtype=np.float32)
+        components = np.ascontiguousarray(
+            np.linalg.qr(rng.standard_normal((16, 2)))[0].T, dtype=np.float32
+        )
+        
+        expected = {
+            "normalize": unit(v_user),
+            "pca": unit(v_user - 0.5 * (components @ v_user) @ components),
+            "steer": unit(v_user + 0.5 * (v_target - v_context)),
+            "bridge": unit(v_user + v_target),
+        }
+        actual = {
+            "normalize": _normalize(v_user),
+            "pca": _pca_kernel(v_user, components, np.float32(0.5)),
+            "steer": _steer_kernel(v_user, v_target, v_context, np.float32(0.5)),
+            "bridge": _bridge_kernel(v_user, v_target),
+        }
+        for name, vector in actual.items():
+            assert vector.dtype == np.float32, name
+            np.testing.assert_allclose(vector, expected[name], atol=1e-5, err_msg=name)
+    
+    @pytest.mark.asyncio
+    async def test_perturbed_terms_antithetic_skips_query_terms(self):
+        """Test that q + ε and q - ε rank the other terms in opposite order, skipping query terms."""
+        import numpy as np
+        from retrieval.vector_math import OrthogonalVectorMath
+        
+        synthesizer = MagicMock()
+        synthesizer.get_embedding = AsyncMock(return_value=[1.0, 0.0, 0.0, 0.0])
+        synthesizer.get_embeddings_batch = AsyncMock(return_value=np.eye(4).tolist())
+        with patch.object(OrthogonalVectorMath, '_noise_terms', return_value=self.TERMS), \
+                patch.object(OrthogonalVectorMath, '_load_matrix', return_value=None), \
+                patch.object(OrthogonalVectorMath, '_save_matrix'):
+            vector_math = OrthogonalVectorMath(synthesizer)
+            plus, minus = await vector_math.perturbed_terms(
+                "Jazz standards", 0.1, k=3, rng=np.random.default_rng(0), antithetic=True
+            )
+            (only,) = await vector_math.perturbed_terms("Jazz standards", 0.1, k=2, rng=np.random.default_rng(0))
+        
+        # "jazz" is nearest to the query but already in it
+        assert sorted(plus) == ["forest", "neon", "ocean"]
+        assert minus == plus[::-1]
+        assert only == plus[:2]
+        synthesizer.get_embeddings_batch.assert_awaited_once_with(list(self.TERMS))
+    
+    @pytest.mark.asyncio
+    async def test_perturbed_terms_without_embeddings(self):
+        """Test that zero embeddings yield no terms and a failed vocabulary is retried."""
+        import numpy as np
+        from retrieval.vector_math import OrthogonalVectorMath
+        
+        synthesizer = MagicMock()
+        synthesizer.get_embedding = AsyncMock(return_value=[0.0, 0.0, 0.0, 0.0])
+        synthesizer.get_embeddings_batch = AsyncMock(return_value=np.eye(4).tolist())
+        with patch.object(OrthogonalVectorMath, '_noise_terms', return_value=self.TERMS), \
+                patch.object(OrthogonalVectorMath, '_load_matrix', return_value=None), \
+                patch.object(OrthogonalVectorMath, '_save_matrix') as save_matrix:
+            vector_math = OrthogonalVectorMath(synthesizer)
+            assert await vector_math.perturbed_terms("jazz", 0.1, antithetic=True) == []
+            
+            synthesizer.get_embedding = AsyncMock(return_value=[1.0, 0.0, 0.0, 0.0])
+            synthesizer.get_embeddings_batch = AsyncMock(return_value=np.zeros((4, 4)).tolist())
+            vector_math = OrthogonalVectorMath(synthesizer)
+            assert await vector_math.perturbed_terms("jazz", 0.1) == []
+            assert await vector_math.perturbed_terms("jazz", 0.1) == []
+        
+        assert synthesizer.get_embeddings_batch.await_count == 2
+        save_matrix.assert_called_once()
+
+
+class TestSupermemoryClient:
+    """Tests for the Supermemory client."""
+    
+    @pytest.mark.asyncio
+    async def test_search_cache_normalizes_query_and_clears_on_add(self):
+        """Test that repeated searches are cached and add_memory invalidates them."""
+        from retrieval.supermemory import SupermemoryClient
+        
+        settings = MagicMock(supermemory_api_key="", supermemory_cache_ttl=300.0)
+        with patch('retrieval.supermemory.get_settings', return_value=settings):
+            supermemory = SupermemoryClient()
+        supermemory.client = MagicMock()
+        supermemory.client.search.memories.return_value = {
+            "results": [{"id": "m1", "memory": "Cached memory", "similarity": 0.8}]
+        }
+        supermemory.client.memories.add.return_value = {"id": "m2", "status": "queued"}
+        
+        first = await supermemory.search("Jazz  Harmony")
+        second = await supermemory.search("jazz harmony")
+        assert [m.id for m in second] == [m.id for m in first] == ["m1"]
+        assert supermemory.client.search.memories.call_count == 1
+        
+        await supermemory.add_memory("New memory")
+        await supermemory.search("jazz harmony")
+        assert supermemory.client.search.memories.call_count == 2
+        await supermemory.close()
+    
+    @pytest.mark.asyncio
+    async def test_search_cached_survives_cancelled_caller(self):
+        """Test that cancelling one search_cached caller doesn't cancel the shared search."""
+        import asyncio
+        from retrieval.supermemory import SupermemoryClient, supermemory_request_scope
+        from models import Memory
+        
+        settings = MagicMock(supermemory_api_key="", supermemory_cache_ttl=300.0)
+        with patch('retrieval.supermemory.get_settings', return_value=settings):
+            supermemory = SupermemoryClient()
+        release = asyncio.Event()
+        
+        async def slow_search(query, limit=5, **kwargs):
+            await release.wait()
+            return [Memory(id="m1", content="Shared", similarity=0.8)]
+        
+        supermemory.search = slow_search
+        with supermemory_request_scope():
+            first = asyncio.create_task(supermemory.search_cached("q"))
+            second = asyncio.create_task(supermemory.search_cached("q"))
+            await asyncio.sleep(0)
+            first.cancel()
+            release.set()
+            
+            assert [m.id for m in await second] == ["m1"]
+            assert [m.id for m in await supermemory.search_cached("q")] == ["m1"]
+            with pytest.raises(asyncio.CancelledError):
+                await first
+        await supermemory.close()
 
 
 class TestCascadeRouter:
@@ -471,6 +749,141 @@ class TestCascadeRouter:
         assert ConfidenceLevel.HIGH.value == "high"
         assert ConfidenceLevel.MEDIUM.value == "medium"
         assert ConfidenceLevel.LOW.value == "low"
+    
+    @pytest.mark.asyncio
+    async def test_vector_check_does_not_cache_outage(self):
+        """Test that a failed Supermemory search isn't memoized as "no memories"."""
+        from retrieval.cascade_router import CascadeRouter, ConfidenceLevel
+        from retrieval.supermemory import SupermemoryUnavailable
+        
+        supermemory = MagicMock()
+        supermemory.search_cached = AsyncMock(side_effect=SupermemoryUnavailable("down"))
+        router = CascadeRouter(synthesizer=MagicMock(), supermemory_client=supermemory, exa_client=MagicMock())
+        
+        assert await router._check_vector("jazz") == ([], ConfidenceLevel.LOW)
+        
+        supermemory.search_cached = AsyncMock(return_value=[])
+        await router._check_vector("jazz")
+        supermemory.search_cached.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_graph_check_keeps_partial_neighbors_uncached(self):
+        """Test that a failed neighbor lookup keeps the other anchors but skips the cache."""
+        from retrieval.cascade_router import CascadeRouter
+        from retrieval.supermemory import SupermemoryClient, SupermemoryUnavailable
+        from models import Memory
+        
+        settings = MagicMock(supermemory_api_key="", supermemory_cache_ttl=300.0)
+        with patch('retrieval.supermemory.get_settings', return_value=settings):
+            supermemory = SupermemoryClient()
+        supermemory.client = MagicMock()
+        neighbor = Memory(id="n1", content="Neighbor", similarity=0.7)
+        supermemory.get_related = AsyncMock(side_effect=[SupermemoryUnavailable("down"), [neighbor]])
+        supermemory.search_cached = AsyncMock(return_value=[
+            Memory(id="e1", content="Echo one", similarity=0.95),
+            Memory(id="e2", content="Echo two", similarity=0.9),
+            Memory(id="s1", content="Sweet", similarity=0.75),
+        ])
+        router = CascadeRouter(synthesizer=MagicMock(), supermemory_client=supermemory, exa_client=MagicMock())
+        
+        result = await router._check_graph("jazz")
+        
+        assert {m.id for m in result} == {"s1", "n1"}
+        await router._check_graph("jazz")
+        assert supermemory.search_cached.await_count == 2
+    
+    def test_rrf_ignores_raw_score_scale(self):
+        """Test that RRF ranks by list position, not raw backend scores."""
+        from retrieval.cascade_router import ScoredCandidate
+        from models import Memory, SearchResult, StrategyWeights
+        
+        weights = StrategyWeights(serendipity=0.5, relevance=0.5, source_web=0.5, source_local=0.5)
+        
+        web = ScoredCandidate(
+            item=SearchResult(title="Web", url="https://example.com", text="", score=30.0),
+            source="web", strategy="vector", raw_score=30.0, rank=2
+        ).apply_rrf(weights)
+        local = ScoredCandidate(
+            item=Memory(id="1", content="Local", similarity=0.7),
+            source="supermemory", strategy="vector", raw_score=0.7, rank=1
+        ).apply_rrf(weights)
+        
+        # Same weights, so the better-ranked item wins despite the smaller raw score
+        assert local.adjusted_score > web.adjusted_score
+        # Rank 1 scores exactly its weight
+        assert local.adjusted_score == pytest.approx(1.5 * 1.5)
+
+
+class TestCircuitBreaker:
+    """Tests for the circuit breaker."""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Test that the breaker fails fast after fail_max failures."""
+        from retrieval.circuit_breaker import CircuitBreaker, BreakerState
+        
+        breaker = CircuitBreaker(fail_max=2, reset_timeout=30.0)
+        breaker.record_failure()
+        assert breaker.allow()
+        
+        breaker.record_failure()
+        assert breaker.state == BreakerState.OPEN
+        assert not breaker.allow()
+    
+    def test_half_open_trial_closes_on_success(self):
+        """Test that a successful trial call closes the breaker."""
+        from retrieval.circuit_breaker import CircuitBreaker, BreakerState
+        
+        breaker = CircuitBreaker(fail_max=1, reset_timeout=0.0)
+        breaker.record_failure()
+        
+        assert breaker.allow()  # Trial call
+        assert breaker.state == BreakerState.HALF_OPEN
+        assert not breaker.allow()  # Only one trial at a time
+        
+        breaker.record_success()
+        assert breaker.state == BreakerState.CLOSED
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_half_open_trial_allows_next_trial(self):
+        """Test that cancelling the half-open trial call doesn't wedge the Exa breaker."""
+        import asyncio
+        from retrieval.circuit_breaker import BreakerState
+        from retrieval.exa_search import ExaSearchClient
+        
+        exa = ExaSearchClient()
+        exa.breaker.reset_timeout = 0.0
+        exa.breaker.record_failure()
+        exa.breaker.state = BreakerState.OPEN
+        exa.http_client = MagicMock()
+        exa.http_client.post = AsyncMock(side_effect=asyncio.CancelledError())
+        
+        with pytest.raises(asyncio.CancelledError):
+            await exa._call_exa("/search", {"query": "q"})
+        
+        assert exa.breaker.state == BreakerState.OPEN
+        assert exa.breaker.allow()  # The next call is the new trial
+    
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_open_breaker(self):
+        """Test that 4xx responses from Exa are not counted as breaker failures."""
+        import httpx
+        from retrieval.circuit_breaker import BreakerState
+        from retrieval.exa_search import ExaSearchClient
+        
+        exa = ExaSearchClient()
+        exa.breaker.fail_max = 1
+        request = httpx.Request("POST", "https://api.exa.ai/search")
+        exa.http_client = MagicMock()
+        exa.http_client.post = AsyncMock(return_value=httpx.Response(400, request=request))
+        
+        with pytest.raises(httpx.HTTPStatusError):
+            await exa._call_exa("/search", {"query": "q"})
+        assert exa.breaker.state == BreakerState.CLOSED
+        
+        exa.http_client.post = AsyncMock(return_value=httpx.Response(503, request=request))
+        with pytest.raises(httpx.HTTPStatusError):
+            await exa._call_exa("/search", {"query": "q"})
+        assert exa.breaker.state == BreakerState.OPEN
 
 
 class TestFeedbackEndpoint:
@@ -663,6 +1076,7 @@ class TestJudgeLogger:
                 context_len=1000,
                 retrieval_path="weighted"
             )
+            await logger.close()
             
             # Read back the entry
             with open(filepath, 'r') as f:
@@ -673,6 +1087,61 @@ class TestJudgeLogger:
             assert entry["app_name"] == "Safari"
             assert entry["weights"]["serendipity"] == 0.5
 
+    
+    @pytest.mark.asyncio
+    async def test_compact_round_trip(self):
+        """Test that entries survive compaction and entries logged afterwards are still read."""
+        pytest.importorskip("pyarrow")
+        import tempfile
+        import os
+        from retrieval.judge_logger import JudgeLogger
+        from models import StrategyWeights
+        
+        weights = StrategyWeights(
+            serendipity=0.5,
+            relevance=0.5,
+            source_web=0.5,
+            source_local=0.5,
+            reasoning="Test"
+        )
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "logs.jsonl")
+            logger = JudgeLogger(filepath=filepath)
+            
+            await logger.log_decision(
+                request_id="r1",
+                app_name="Safari",
+                window_title="First",
+                weights=weights,
+                insight_ids=["i1"]
+            )
+            await logger.log_feedback("r1", "i1", "click", metadata={"source": "web"})
+            
+            parquet_path = await logger.compact()
+            assert parquet_path is not None and os.path.exists(parquet_path)
+            assert not os.path.exists(filepath)
+            
+            await logger.log_decision(
+                request_id="r2",
+                app_name="Notes",
+                window_title="Second",
+                weights=weights,
+                insight_ids=["i2"]
+            )
+            await logger.close()
+            
+            entries = logger.read_training_data()
+            assert [(e["type"], e["request_id"]) for e in entries] == [
+                ("decision", "r1"), ("feedback", "r1"), ("decision", "r2")
+            ]
+            assert entries[1]["metadata"] == {"source": "web"}
+            
+            pairs = {d["request_id"]: f for d, f in logger.get_decision_feedback_pairs()}
+            assert [f["insight_id"] for f in pairs["r1"]] == ["i1"]
+            assert pairs["r2"] == []
+            assert await logger.compact() is not None
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])